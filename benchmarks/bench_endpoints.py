@@ -0,0 +1,251 @@
+# encoding=utf-8
+
+"""
+Measures the request overhead, JSON decode time and DataFrame conversion time of the tabular endpoints on the responses
+recorded in tests/cassettes.
+
+Usage: python benchmarks/bench_endpoints.py [--repeat 5] [--rows N] [--save FILE] [--compare FILE [--tolerance 0.25]]
+
+"""
+
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+import requests
+import yaml
+from requests.adapters import BaseAdapter
+
+from nasapy import jsonlib
+from nasapy.api import close_approach, exoplanets, fireballs, nhats, scout, sentry
+from nasapy.client import Client
+from nasapy.testing import MockServer
+
+
+_CASSETTES = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests', 'cassettes')
+
+# The endpoints benchmarked, and the URL a synthetic response is generated for when there is no cassette.
+_ENDPOINTS = {
+    'close_approach': (close_approach, 'https://ssd-api.jpl.nasa.gov/cad.api'),
+    'fireballs': (fireballs, 'https://ssd-api.jpl.nasa.gov/fireball.api'),
+    'nhats': (nhats, 'https://ssd-api.jpl.nasa.gov/nhats.api'),
+    'scout': (scout, 'https://ssd-api.jpl.nasa.gov/scout.api'),
+    'sentry': (sentry, 'https://ssd-api.jpl.nasa.gov/sentry.api'),
+    'exoplanets': (exoplanets, 'https://exoplanetarchive.ipac.caltech.edu/cgi-bin/nstedAPI/nph-nstedAPI')
+}
+
+_METRICS = ('call', 'decode', 'overhead', 'to_df')
+
+
+class FixedTransport(BaseAdapter):
+    r"""
+    Transport answering every request with the same response body, so a call's time is spent in nasapy rather than on
+    the network.
+
+    Parameters
+    ----------
+    body : bytes
+        The body of the responses.
+
+    """
+    def __init__(self, body):
+        super(FixedTransport, self).__init__()
+
+        self.body = body
+
+    def send(self, request, **kwargs):
+        r = requests.Response()
+        r.status_code = 200
+        r.reason = 'OK'
+        r.headers['Content-Type'] = 'application/json'
+        r._content = self.body
+        r._content_consumed = True
+        r.url = request.url
+        r.request = request
+
+        return r
+
+    def close(self):
+        pass
+
+
+def recorded_body(name):
+    r"""
+    Returns the largest tabular JSON response recorded in an endpoint's cassette.
+
+    Parameters
+    ----------
+    name : str
+        The name of the endpoint, which is also the name of its cassette.
+
+    Returns
+    -------
+    bytes or None
+        The response body, or None if the endpoint has no cassette or no tabular response was recorded.
+
+    """
+    path = os.path.join(_CASSETTES, name + '.yml')
+
+    if not os.path.exists(path):
+        return None
+
+    with open(path) as f:
+        cassette = yaml.safe_load(f)
+
+    bodies = []
+
+    for interaction in cassette['interactions']:
+        body = interaction['response']['body'].get('string')
+
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        try:
+            data = json.loads(body)
+        except (TypeError, ValueError):
+            continue
+
+        if isinstance(data, list) or isinstance(data, dict) and isinstance(data.get('data'), list):
+            bodies.append(body)
+
+    return max(bodies, key=len, default=None)
+
+
+def synthetic_body(url, rows):
+    r"""
+    Returns the synthetic response :class:`nasapy.testing.MockServer` sends to a request.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the request.
+    rows : int
+        The number of rows in the response.
+
+    Returns
+    -------
+    bytes
+        The response body.
+
+    """
+    _, _, body = MockServer(rows=rows).respond('GET', url)
+
+    return body
+
+
+def best(func, repeat):
+    r"""
+    Returns the fastest time of a function, in seconds per call, over :code:`repeat` runs of enough calls to take at
+    least 0.2 seconds.
+
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def benchmark(name, body, repeat=5):
+    r"""
+    Benchmarks an endpoint answered with a response body.
+
+    Parameters
+    ----------
+    name : str
+        The name of the endpoint.
+    body : bytes
+        The body of the responses.
+    repeat : int, default 5
+        The number of timed runs; the fastest is kept.
+
+    Returns
+    -------
+    dict
+        Seconds per call spent in the whole call returning the decoded response ('call'), in decoding the JSON
+        ('decode'), in the rest of the call ('overhead') and in converting the result to a DataFrame ('to_df').
+
+    """
+    func, _ = _ENDPOINTS[name]
+    client = Client(transport=FixedTransport(body), throttle=False)
+
+    call = best(lambda: func(client=client), repeat)
+    call_df = best(lambda: func(return_df=True, client=client), repeat)
+    decode = best(lambda: jsonlib.loads(body), repeat)
+
+    return {
+        'call': call,
+        'decode': decode,
+        'overhead': max(call - decode, 0.0),
+        'to_df': max(call_df - call, 0.0)
+    }
+
+
+def regressions(results, baseline, tolerance):
+    r"""
+    Compares results with a baseline saved with :code:`--save`.
+
+    Returns
+    -------
+    list
+        The (endpoint, metric, baseline, result) tuples of the metrics slower than the baseline by more than
+        :code:`tolerance`, a fraction of the baseline.
+
+    """
+    slower = []
+
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            before = baseline.get(name, {}).get(metric)
+
+            if before and metric != 'overhead' and value > before * (1 + tolerance):
+                slower.append((name, metric, before, value))
+
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--rows', type=int, default=None,
+                        help='use synthetic responses of this many rows instead of the cassettes')
+    parser.add_argument('--save', help='save the results to this JSON file')
+    parser.add_argument('--compare', help='fail if the results are slower than those saved in this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='fraction a metric may exceed its baseline by before failing')
+    args = parser.parse_args()
+
+    print('{0:<16}{1:>10}'.format('endpoint', 'KB') + ''.join('{0:>12}'.format(m + ' ms') for m in _METRICS))
+
+    results = {}
+
+    for name, (_, url) in _ENDPOINTS.items():
+        body = recorded_body(name) if args.rows is None else None
+
+        if body is None:
+            body = synthetic_body(url, args.rows or 1000)
+
+        results[name] = benchmark(name, body, repeat=args.repeat)
+
+        print('{0:<16}{1:>10.1f}'.format(name, len(body) / 1024) +
+              ''.join('{0:>12.3f}'.format(results[name][m] * 1000) for m in _METRICS))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            slower = regressions(results, json.load(f), args.tolerance)
+
+        for name, metric, before, value in slower:
+            print('regression: {0} {1} {2:.3f} ms -> {3:.3f} ms'.format(name, metric, before * 1000, value * 1000))
+
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# encoding=utf-8
+
+"""
+Measures the time taken by :code:`import nasapy` in a fresh interpreter.
+
+Usage: python benchmarks/bench_import.py [--runs 20] [--budget 0.5]
+
+"""
+
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+_HEAVY_MODULES = ('pandas', 'numpy', 'aiohttp', 'asyncio')
+
+_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import nasapy
+print(time.perf_counter() - start)
+print(','.join(m for m in {modules} if m in sys.modules))
+""".format(modules=_HEAVY_MODULES)
+
+
+def import_time(runs=20):
+    r"""
+    Imports nasapy in a new interpreter :code:`runs` times.
+
+    Returns
+    -------
+    tuple
+        The list of import times in seconds, and the heavy modules loaded by the import.
+
+    """
+    times = []
+    loaded = set()
+
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', _SCRIPT], check=True, capture_output=True, text=True).stdout
+        elapsed, modules = out.splitlines()
+
+        times.append(float(elapsed))
+        loaded.update(m for m in modules.split(',') if m)
+
+    return times, sorted(loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--budget', type=float, default=None,
+                        help='fail if the median import time exceeds this many seconds')
+    args = parser.parse_args()
+
+    times, loaded = import_time(args.runs)
+    median = statistics.median(times)
+
+    print('import nasapy: median {0:.1f} ms, min {1:.1f} ms, max {2:.1f} ms over {3} runs'
+          .format(median * 1000, min(times) * 1000, max(times) * 1000, args.runs))
+    print('heavy modules loaded: {0}'.format(', '.join(loaded) or 'none'))
+
+    if loaded or (args.budget is not None and median > args.budget):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# encoding=utf-8
+
+"""
+Compares the JSON decoders available to nasapy.jsonlib.set_json_decoder on the responses recorded in tests/cassettes.
+
+Usage: python benchmarks/bench_json.py [--repeat 20]
+
+"""
+
+
+import argparse
+import glob
+import json
+import os
+import timeit
+
+import yaml
+
+
+_CASSETTES = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tests', 'cassettes')
+
+
+def recorded_payloads():
+    r"""
+    Returns the JSON bodies of the responses recorded in the test cassettes.
+
+    Returns
+    -------
+    dict
+        Mapping of cassette names to the list of JSON bodies, as bytes, recorded in each.
+
+    """
+    payloads = {}
+
+    for path in sorted(glob.glob(os.path.join(_CASSETTES, '*.yml'))):
+        with open(path) as f:
+            cassette = yaml.safe_load(f)
+
+        bodies = []
+
+        for interaction in cassette['interactions']:
+            body = interaction['response']['body'].get('string')
+
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+
+            try:
+                json.loads(body)
+            except (TypeError, ValueError):
+                continue
+
+            bodies.append(body)
+
+        if bodies:
+            payloads[os.path.splitext(os.path.basename(path))[0]] = bodies
+
+    return payloads
+
+
+def decoders():
+    r"""
+    Returns the decoders that can be benchmarked in the current environment.
+
+    Returns
+    -------
+    dict
+        Mapping of decoder names to decoding functions.
+
+    """
+    available = {'json': json.loads}
+
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        available['orjson'] = orjson.loads
+
+    return available
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = recorded_payloads()
+    available = decoders()
+
+    print('{0:<28}{1:>10}'.format('cassette', 'KB') + ''.join('{0:>14}'.format(name + ' MB/s') for name in available))
+
+    totals = dict.fromkeys(available, 0.0)
+    size = 0
+
+    for name, bodies in payloads.items():
+        kb = sum(len(body) for body in bodies) / 1024
+        size += kb
+        row = '{0:<28}{1:>10.1f}'.format(name, kb)
+
+        for decoder_name, decoder in available.items():
+            elapsed = min(timeit.repeat(lambda: [decoder(body) for body in bodies], number=1, repeat=args.repeat))
+            totals[decoder_name] += elapsed
+            row += '{0:>14.1f}'.format(kb / 1024 / elapsed)
+
+        print(row)
+
+    print('{0:<28}{1:>10.1f}'.format('total', size) +
+          ''.join('{0:>14.1f}'.format(size / 1024 / totals[name]) for name in available))
+
+
+if __name__ == '__main__':
+    main()
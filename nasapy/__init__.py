@@ -5,4 +5,14 @@
 """
 
 from nasapy.api import tle, close_approach, fireballs, media_search, media_asset_captions, media_asset_metadata, \
-    media_asset_manifest, Nasa, mission_design, julian_date, nhats, scout, sentry, exoplanets
+    media_asset_manifest, Nasa, mission_design, julian_date, nhats, scout, sentry, exoplanets, batch
+from nasapy.aio import AsyncNasa
+from nasapy.cache import ResponseCache, SQLiteCache
+from nasapy.client import AsyncClient, Client, default_client, set_default_client
+from nasapy.deadline import DeadlineExceeded, deadline
+from nasapy.donki import DonkiGraph, DonkiSync
+from nasapy.jsonlib import set_json_decoder
+from nasapy.metrics import MetricsRegistry
+from nasapy.ratelimit import KeyPool, RateLimiter
+from nasapy.retry import RetryPolicy
+from nasapy.transport import RecordTransport, ReplayTransport
@@ -0,0 +1,169 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import functools
+
+from nasapy import api
+from nasapy.batch import resolve_jobs, run_batch_async
+from nasapy.client import AsyncClient, default_async_client
+
+
+class AsyncNasa(api.Nasa):
+    r"""
+    Asynchronous version of the :class:`~nasapy.api.Nasa` class. Every method of :class:`~nasapy.api.Nasa` is
+    available and returns an awaitable that resolves to the same result as its synchronous counterpart. Requires the
+    `aiohttp <https://docs.aiohttp.org/>`_ library.
+
+    Parameters
+    ----------
+    key : str, list, tuple, KeyPool, default None
+        The generated API key received from the NASA API. Registering for an API key can be done on the `NASA API
+        webpage <https://api.nasa.gov/>`_. If :code:`None`, a 'DEMO_KEY' with a much more restricted access limit
+        is used. Several keys can be given to spread the requests over them, as with :class:`~nasapy.api.Nasa`.
+    client : AsyncClient, default None
+        The :class:`~nasapy.client.AsyncClient` holding the pooled connections used to send requests. If None, a new
+        client with default pool settings is created and owned by the class.
+
+    Examples
+    --------
+    # Request the last thirty days of solar flares and geomagnetic storms concurrently.
+    >>> async with AsyncNasa(key=key) as n:
+    ...     flares, storms = await asyncio.gather(n.solar_flare(), n.geomagnetic_storm())
+
+    Notes
+    -----
+    Parameters are validated when a method is called, so invalid parameters raise a :code:`TypeError` or
+    :code:`ValueError` immediately rather than when the returned awaitable is awaited.
+
+    """
+    def __init__(self, key=None, client=None):
+
+        if client is None:
+            client = AsyncClient()
+
+        super(AsyncNasa, self).__init__(key=key, client=client)
+
+    def __enter__(self):
+        raise TypeError('AsyncNasa must be used with "async with".')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        r"""
+        Closes the client's pooled connections.
+
+        """
+        await self.client.close()
+
+    async def batch(self, jobs, max_concurrency=10, return_exceptions=True, deadline=None):
+        r"""
+        Runs a list of method or function calls concurrently on the running event loop. All calls share the class's
+        client and its connection pools.
+
+        Parameters
+        ----------
+        jobs : list
+            List of (endpoint, kwargs) tuples. The endpoint can be the name of a method of the class (such as
+            'get_asteroids'), the name of a module-level function (such as 'sentry'), or a coroutine function.
+            Module-level functions are sent through the class's client unless a :code:`client` is given in the kwargs.
+        max_concurrency : int, default 10
+            The maximum number of requests in flight at once.
+        return_exceptions : bool, default True
+            If True (default), an exception raised by a job is returned in place of its result. If False, the first
+            exception raised is re-raised.
+        deadline : int, float, default None
+            Number of seconds the batch must finish within. Jobs still awaiting when the deadline passes are
+            cancelled and reported with a :class:`~nasapy.deadline.DeadlineExceeded` exception.
+
+        Returns
+        -------
+        list
+            The result, or raised exception, of each job in the same order as :code:`jobs`.
+
+        Examples
+        --------
+        >>> async with AsyncNasa(key=key) as n:
+        ...     r = await n.batch([('get_asteroids', {'asteroid_id': i}) for i in asteroid_ids], max_concurrency=20)
+
+        """
+        calls = resolve_jobs(jobs, namespace=self._endpoints(), client=self.client)
+
+        return await run_batch_async(calls, max_concurrency=max_concurrency, return_exceptions=return_exceptions,
+                                     deadline=deadline)
+
+
+async def batch(jobs, max_concurrency=10, client=None, return_exceptions=True, deadline=None):
+    r"""
+    Runs a list of module-level function calls concurrently on the running event loop.
+
+    Parameters
+    ----------
+    jobs : list
+        List of (endpoint, kwargs) tuples. The endpoint can be the name of a module-level function, such as
+        'sentry' or 'mission_design', or a coroutine function.
+    max_concurrency : int, default 10
+        The maximum number of requests in flight at once.
+    client : AsyncClient, default None
+        The :class:`~nasapy.client.AsyncClient` used to send the requests of jobs that do not specify a
+        :code:`client` in their kwargs. If None, the shared client returned by
+        :func:`~nasapy.client.default_async_client` is used.
+    return_exceptions : bool, default True
+        If True (default), an exception raised by a job is returned in place of its result. If False, the first
+        exception raised is re-raised.
+    deadline : int, float, default None
+        Number of seconds the batch must finish within. Jobs still awaiting when the deadline passes are
+        cancelled and reported with a :class:`~nasapy.deadline.DeadlineExceeded` exception.
+
+    Returns
+    -------
+    list
+        The result, or raised exception, of each job in the same order as :code:`jobs`.
+
+    Examples
+    --------
+    # Get Sentry data for a watch list of objects.
+    >>> r = await batch([('sentry', {'des': des}) for des in ('99942', '101955', '29075')])
+
+    """
+    if client is None:
+        client = default_async_client()
+
+    namespace = {name: globals()[name] for name in api._module_endpoints()}
+
+    calls = resolve_jobs(jobs, namespace=namespace, client=client)
+
+    return await run_batch_async(calls, max_concurrency=max_concurrency, return_exceptions=return_exceptions,
+                                 deadline=deadline)
+
+
+def _coroutine(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if kwargs.get('client') is None:
+            kwargs['client'] = default_async_client()
+
+        return await func(*args, **kwargs)
+
+    return wrapper
+
+
+close_approach = _coroutine(api.close_approach)
+exoplanets = _coroutine(api.exoplanets)
+fireballs = _coroutine(api.fireballs)
+media_asset_captions = _coroutine(api.media_asset_captions)
+media_asset_manifest = _coroutine(api.media_asset_manifest)
+media_asset_metadata = _coroutine(api.media_asset_metadata)
+media_search = _coroutine(api.media_search)
+mission_design = _coroutine(api.mission_design)
+nhats = _coroutine(api.nhats)
+scout = _coroutine(api.scout)
+sentry = _coroutine(api.sentry)
+tle = _coroutine(api.tle)
@@ -5,12 +5,21 @@
 """
 
 
+import codecs
 import datetime
+import json
+import threading
 from urllib.parse import urljoin
-from pandas import DataFrame
 
 import requests
 
+from nasapy.batch import resolve_jobs, run_batch, run_batch_async
+from nasapy import jsonlib
+from nasapy.client import AsyncClient, Client, default_client, response_sequence
+from nasapy.instrument import phase
+from nasapy.ratelimit import KeyPool
+from nasapy.stream import batched, iter_json_array
+
 
 class Nasa(object):
     r"""
@@ -18,17 +27,26 @@ class Nasa(object):
 
     Parameters
     ----------
-    key : str, default None
+    key : str, list, tuple, KeyPool, default None
         The generated API key received from the NASA API. Registering for an API key can be done on the `NASA API
         webpage <https://api.nasa.gov/>`_. If :code:`None`, a 'DEMO_KEY' with a much more restricted access limit
-        is used.
+        is used. A list or tuple of keys, or a :class:`~nasapy.ratelimit.KeyPool`, spreads the requests over the keys:
+        each request is sent with the key that has the most requests remaining, and sent again with another key if
+        rejected with a 429 (Too Many Requests) status.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` holding the pooled connections used to send requests. If None, a new client
+        with default pool settings is created and owned by the class.
 
     Attributes
     ----------
-    key : str, None
-        The specified key when initializing the class.
+    key : str, KeyPool
+        The specified key when initializing the class, or the pool of keys if several keys were specified.
+    client : Client
+        The client used to send requests.
     limit_remaining : int
-        The number of API calls available.
+        The number of API calls available. 'n/a' if the last response did not report the number of calls remaining.
+        With several keys, the number of calls available for the key the last request was sent with; see
+        :meth:`~nasapy.ratelimit.KeyPool.remaining` for the other keys.
     mars_weather_limit_remaining : int
         The number of API calls available for the :code:`mars_weather` method.
 
@@ -87,15 +105,36 @@ class Nasa(object):
         Laboratory's (ANL) Metagenomics Rapid Annotations using Subsystems Technology (MG-RAST).
     techport
         Retrieves available NASA project data.
+    batch
+        Runs a list of method or function calls concurrently on a bounded thread pool.
+    close
+        Closes the client's pooled connections.
+
+    Notes
+    -----
+    A :code:`Nasa` object can be shared by several threads, such as the workers of a thread pool. Its methods only
+    read the object's settings, requests are sent through the client's thread-safe connection pools, and
+    :code:`limit_remaining` and :code:`mars_weather_limit_remaining` always hold the count of the most recent response
+    received from the server, whatever order the threads handle their responses in.
+
+    The DONKI methods accept a :code:`window` parameter for long date ranges. A range longer than :code:`window` days is
+    split into consecutive windows that are requested concurrently, and the events returned are merged in date order
+    with duplicates removed, which keeps multi-year backfills within the server's limits.
 
     """
-    def __init__(self, key=None):
+    def __init__(self, key=None, client=None):
 
         self.api_key = key
 
+        if client is None:
+            client = Client()
+
+        self.client = client
         self.host = 'https://api.nasa.gov'
         self.limit_remaining = None
         self.mars_weather_limit_remaining = None
+        self._quota_lock = threading.Lock()
+        self._quota_sequences = {}
 
     @property
     def api_key(self):
@@ -111,7 +150,9 @@ class Nasa(object):
 
     @api_key.setter
     def api_key(self, api_key):
-        if api_key is not None:
+        if isinstance(api_key, (list, tuple)):
+            self.__api_key = KeyPool(api_key)
+        elif api_key is not None:
             self.__api_key = api_key
         else:
             self.__api_key = 'DEMO_KEY'
@@ -124,6 +165,19 @@ class Nasa(object):
     def mars_weather_limit_remaining(self, remaining):
         self.__mars_weather_limit_remaining = remaining
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        r"""
+        Closes the client's pooled connections.
+
+        """
+        self.client.close()
+
     def picture_of_the_day(self, date=None, hd=False):
         r"""
         Returns the URL and other information for the NASA Astronomy Picture of the Day.
@@ -173,19 +227,15 @@ class Nasa(object):
 
         url = urljoin(self.host + '/planetary/', 'apod')
 
-        r = requests.get(url,
-                         params={
-                             'api_key': self.api_key,
-                             'date': date,
-                             'hd': hd
-                         })
+        r = self.client.get(url,
+                            params={
+                                'api_key': self.api_key,
+                                'date': date,
+                                'hd': hd
+                            },
+                            callback=self._json_result)
 
-        if r.status_code != 200:
-            raise requests.exceptions.HTTPError(r.reason)
-
-        else:
-            self.__limit_remaining = r.headers['X-RateLimit-Remaining']
-            return r.json()
+        return r
 
     def mars_weather(self):
         r"""
@@ -220,19 +270,15 @@ class Nasa(object):
         """
         url = self.host + '/insight_weather/'
 
-        r = requests.get(url,
-                         params={
-                             'api_key': self.__api_key,
-                             'ver': 1.0,
-                             'feedtype': 'json'
-                         })
-
-        if r.status_code != 200:
-            raise requests.exceptions.HTTPError(r.reason, r.url)
+        r = self.client.get(url,
+                            params={
+                                'api_key': self.__api_key,
+                                'ver': 1.0,
+                                'feedtype': 'json'
+                            },
+                            callback=self._mars_weather_result)
 
-        else:
-            self.__mars_weather_limit_remaining = r.headers['X-RateLimit-Remaining']
-            return r.json()
+        return r
 
     def asteroid_feed(self, start_date, end_date=None):
         r"""
@@ -277,19 +323,15 @@ class Nasa(object):
 
         start_date, end_date = _check_dates(start_date=start_date, end_date=end_date)
 
-        r = requests.get(url,
-                         params={
-                             'api_key': self.__api_key,
-                             'start_date': start_date,
-                             'end_date': end_date
-                         })
-
-        if r.status_code != 200:
-            raise requests.exceptions.HTTPError(r.reason, r.url)
+        r = self.client.get(url,
+                            params={
+                                'api_key': self.__api_key,
+                                'start_date': start_date,
+                                'end_date': end_date
+                            },
+                            callback=self._json_result)
 
-        else:
-            self.__limit_remaining = r.headers['X-RateLimit-Remaining']
-            return r.json()
+        return r
 
     def get_asteroids(self, asteroid_id=None):
         r"""
@@ -334,21 +376,17 @@ class Nasa(object):
         else:
             url = url + 'browse/'
 
-        r = requests.get(url,
-                         params={
-                             'api_key': self.__api_key
-                         })
-
-        if r.status_code != 200:
-            raise requests.exceptions.HTTPError(r.reason, r.url)
+        r = self.client.get(url,
+                            params={
+                                'api_key': self.__api_key
+                            },
+                            callback=self._json_result)
 
-        else:
-            self.__limit_remaining = r.headers['X-RateLimit-Remaining']
-            return r.json()
+        return r
 
     def coronal_mass_ejection(self, start_date=None, end_date=None,
                               accurate_only=True, speed=0, complete_entry=True, half_angle=0,
-                              catalog='ALL', keyword=None):
+                              catalog='ALL', keyword=None, window=None, return_df=False):
         r"""
         Returns data collected on coronal mass ejection events from the Space Weather Database of Notifications,
         Knowledge, Information (DONKI).
@@ -373,6 +411,12 @@ class Nasa(object):
             Specifies which catalog of data to return results. Defaults to 'ALL'.
         keyword : str, default None
             Filter results by a specific keyword.
+        window : int, default None
+            Number of days covered by each request, for splitting long date ranges (see Notes of :class:`Nasa`).
+        return_df : bool, default False
+            If True, the events are returned as a pandas DataFrame with one row per event, with :code:`time21_5` parsed
+            into UTC datetimes, :code:`speed`, :code:`halfAngle`, :code:`latitude` and :code:`longitude` as numbers, and
+            :code:`type` and :code:`catalog` as categoricals.
 
         Raises
         ------
@@ -388,11 +432,18 @@ class Nasa(object):
             Raised if parameter :code:`complete_entry` is not boolean (True or False).
         TypeError
             Raised if parameter :code:`accurate_only` is not boolean (True or False).
+        TypeError
+            Raised if parameter :code:`window` is not an integer.
+        ValueError
+            Raised if parameter :code:`window` is less than 1.
+        TypeError
+            Raised if parameter :code:`return_df` is not boolean (True or False).
 
         Returns
         -------
-        list
+        list or DataFrame
             List of results representing returned JSON data. If no data is returned, an empty dictionary is returned.
+            If :code:`return_df` is True, a DataFrame of the events.
 
         Examples
         --------
@@ -415,34 +466,26 @@ class Nasa(object):
         if not isinstance(accurate_only, bool):
             raise TypeError('accurate_only parameter must be boolean (True or False).')
 
-        url = self.host + '/DONKI/CMEAnalysis'
-
-        r = requests.get(url,
-                         params={
-                             'api_key': self.__api_key,
-                             'startDate': start_date,
-                             'endDate': end_date,
-                             'mostAccurateOnly': accurate_only,
-                             'completeEntryOnly': complete_entry,
-                             'speed': speed,
-                             'halfAngle': half_angle,
-                             'catalog': catalog,
-                             'keyword': keyword
-                         })
-
-        if r.status_code != 200:
-            raise requests.exceptions.HTTPError(r.reason, r.url)
-
-        self.__limit_remaining = r.headers['X-RateLimit-Remaining']
-
-        if r.text == '':
-            r = {}
-        else:
-            r = r.json()
+        r = _donki_request(url=self.host + '/DONKI/CMEAnalysis',
+                           key=self.__api_key,
+                           start_date=start_date,
+                           end_date=end_date,
+                           params={
+                               'mostAccurateOnly': accurate_only,
+                               'completeEntryOnly': complete_entry,
+                               'speed': speed,
+                               'halfAngle': half_angle,
+                               'catalog': catalog,
+                               'keyword': keyword
+                           },
+                           client=self.client,
+                           window=window,
+                           return_df=return_df,
+                           callback=self._donki_result)
 
         return r
 
-    def geomagnetic_storm(self, start_date=None, end_date=None):
+    def geomagnetic_storm(self, start_date=None, end_date=None, window=None, return_df=False):
         r"""
         Returns data collected on geomagnetic storm events from the Space Weather Database of Notifications, Knowledge,
         Information (DONKI).
@@ -455,6 +498,13 @@ class Nasa(object):
         end_date : str, datetime, default None
             String representing a date in YYYY-MM-DD format or a datetime object. If None, defaults to the current
             date in UTC time.
+        window : int, default None
+            Number of days covered by each request, for splitting long date ranges (see Notes of :class:`Nasa`).
+        return_df : bool, default False
+            If True, the events are returned as a pandas DataFrame with one row per Kp index observation of each storm,
+            in columns 'allKpIndex.observedTime', 'allKpIndex.kpIndex' and 'allKpIndex.source', with :code:`startTime`
+            and the observation times parsed into UTC datetimes and :code:`linkedEvents` reduced to lists of activity
+            IDs.
 
         Raises
         ------
@@ -464,11 +514,18 @@ class Nasa(object):
         TypeError
             Raised if parameter :code:`start_date` is not a string representing a date in YYYY-MM-DD format or
             a datetime object.
+        TypeError
+            Raised if parameter :code:`window` is not an integer.
+        ValueError
+            Raised if parameter :code:`window` is less than 1.
+        TypeError
+            Raised if parameter :code:`return_df` is not boolean (True or False).
 
         Returns
         -------
-        list
+        list or DataFrame
             List of results representing returned JSON data. If no data is returned, an empty dictionary is returned.
+            If :code:`return_df` is True, a DataFrame of the events.
 
         Examples
         --------
@@ -485,30 +542,19 @@ class Nasa(object):
           'linkedEvents': [{'activityID': '2019-08-30T12:17:00-HSS-001'}]}]
 
         """
-        start_date, end_date = _check_dates(start_date=start_date, end_date=end_date)
-
-        url = self.host + '/DONKI/GST'
-
-        r = requests.get(url,
-                         params={
-                             'api_key': self.__api_key,
-                             'startDate': start_date,
-                             'endDate': end_date
-                         })
-
-        if r.status_code != 200:
-            raise requests.exceptions.HTTPError(r.reason, r.url)
-
-        self.__limit_remaining = r.headers['X-RateLimit-Remaining']
-
-        if r.text == '':
-            r = {}
-        else:
-            r = r.json()
+        r = _donki_request(url=self.host + '/DONKI/GST',
+                           key=self.__api_key,
+                           start_date=start_date,
+                           end_date=end_date,
+                           client=self.client,
+                           window=window,
+                           return_df=return_df,
+                           callback=self._donki_result)
 
         return r
 
-    def interplantary_shock(self, start_date=None, end_date=None, location='ALL', catalog='ALL'):
+    def interplantary_shock(self, start_date=None, end_date=None, location='ALL', catalog='ALL', window=None,
+                            return_df=False):
         r"""
         Returns data collected on interplantary shock events from the Space Weather Database of Notifications,
         Knowledge, Information (DONKI).
@@ -525,6 +571,12 @@ class Nasa(object):
             Filters returned results to specified location of the interplantary shock event. Defaults to 'ALL'.
         catalog : str, {'ALL', 'SWRC_CATALOG', 'WINSLOW_MESSENGER_ICME_CATALOG'}
             Filters results to a specified catalog of collected data. Defaults to 'ALL'.
+        window : int, default None
+            Number of days covered by each request, for splitting long date ranges (see Notes of :class:`Nasa`).
+        return_df : bool, default False
+            If True, the events are returned as a pandas DataFrame with one row per event, with :code:`eventTime` parsed
+            into UTC datetimes, :code:`catalog` and :code:`location` as categoricals, :code:`instruments` joined into a
+            categorical of instrument names and :code:`linkedEvents` reduced to lists of activity IDs.
 
         Raises
         ------
@@ -542,11 +594,18 @@ class Nasa(object):
             Raised if :code:`location` parameter is not a string.
         TypeError
             Raised if :code:`catalog` parameter is not a string.
+        TypeError
+            Raised if parameter :code:`window` is not an integer.
+        ValueError
+            Raised if parameter :code:`window` is less than 1.
+        TypeError
+            Raised if parameter :code:`return_df` is not boolean (True or False).
 
         Returns
         -------
-        list
+        list or DataFrame
             List of results representing returned JSON data. If no data is returned, an empty list is returned.
+            If :code:`return_df` is True, a DataFrame of the events.
 
         Examples
         --------
@@ -568,30 +627,22 @@ class Nasa(object):
             raise ValueError(
                 "catalog parameter must be one of {'ALL' (default) 'SWRC_CATALOG', 'WINSLOW_MESSENGER_ICME_CATALOG'}")
 
-        url = self.host + '/DONKI/IPS'
-
-        r = requests.get(url,
-                         params={
-                             'api_key': self.__api_key,
-                             'startDate': start_date,
-                             'endDate': end_date,
-                             'location': location,
-                             'catalog': catalog
-                         })
-
-        if r.status_code != 200:
-            raise requests.exceptions.HTTPError(r.reason, r.url)
-
-        self.__limit_remaining = r.headers['X-RateLimit-Remaining']
-
-        if r.text == '':
-            r = {}
-        else:
-            r = r.json()
+        r = _donki_request(url=self.host + '/DONKI/IPS',
+                           key=self.__api_key,
+                           start_date=start_date,
+                           end_date=end_date,
+                           params={
+                               'location': location,
+                               'catalog': catalog
+                           },
+                           client=self.client,
+                           window=window,
+                           return_df=return_df,
+                           callback=self._donki_result)
 
         return r
 
-    def solar_flare(self, start_date=None, end_date=None):
+    def solar_flare(self, start_date=None, end_date=None, window=None, return_df=False):
         r"""
         Returns data on solar flare events from the Space Weather Database of Notifications, Knowledge, Information
         (DONKI).
@@ -604,6 +655,13 @@ class Nasa(object):
         end_date : str, datetime, default None
             String representing a date in YYYY-MM-DD format or a datetime object. If None, defaults to the current
             date in UTC time.
+        window : int, default None
+            Number of days covered by each request, for splitting long date ranges (see Notes of :class:`Nasa`).
+        return_df : bool, default False
+            If True, the events are returned as a pandas DataFrame with one row per event, with :code:`activeRegionNum`
+            as numbers, :code:`beginTime`, :code:`peakTime` and :code:`endTime` parsed into UTC datetimes,
+            :code:`instruments` joined into a categorical of instrument names and :code:`linkedEvents` reduced to lists
+            of activity IDs.
 
         Raises
         ------
@@ -613,12 +671,19 @@ class Nasa(object):
         TypeError
             Raised if parameter :code:`start_date` is not a string representing a date in YYYY-MM-DD format or
             a datetime object.
+        TypeError
+            Raised if parameter :code:`window` is not an integer.
+        ValueError
+            Raised if parameter :code:`window` is less than 1.
+        TypeError
+            Raised if parameter :code:`return_df` is not boolean (True or False).
 
         Returns
         -------
-        list
+        list or DataFrame
             If data is available in the specified date range, a list of dictionary objects representing the data from
-            the API is returned. If no data is available, an empty dictionary is returned.
+            the API is returned. If no data is available, an empty dictionary is returned. If :code:`return_df` is
+            True, a DataFrame of the events.
 
         Examples
         --------
@@ -637,14 +702,18 @@ class Nasa(object):
           'linkedEvents': None}]
 
         """
-        self.__limit_remaining, r = _donki_request(url=self.host + '/DONKI/FLR',
-                                                   key=self.__api_key,
-                                                   start_date=start_date,
-                                                   end_date=end_date)
+        r = _donki_request(url=self.host + '/DONKI/FLR',
+                           key=self.__api_key,
+                           start_date=start_date,
+                           end_date=end_date,
+                           client=self.client,
+                           window=window,
+                           return_df=return_df,
+                           callback=self._donki_result)
 
         return r
 
-    def solar_energetic_particle(self, start_date=None, end_date=None):
+    def solar_energetic_particle(self, start_date=None, end_date=None, window=None, return_df=False):
         r"""
         Returns data available from the Space Weather Database of Notifications, Knowledge, Information
         (DONKI) API related to solar energetic particle events.
@@ -657,6 +726,12 @@ class Nasa(object):
         end_date : str, datetime, default None
             String representing a date in YYYY-MM-DD format or a datetime object. If None, defaults to the current
             date in UTC time.
+        window : int, default None
+            Number of days covered by each request, for splitting long date ranges (see Notes of :class:`Nasa`).
+        return_df : bool, default False
+            If True, the events are returned as a pandas DataFrame with one row per event, with :code:`eventTime` parsed
+            into UTC datetimes, :code:`instruments` joined into a categorical of instrument names and
+            :code:`linkedEvents` reduced to lists of activity IDs.
 
         Raises
         ------
@@ -666,12 +741,19 @@ class Nasa(object):
         TypeError
             Raised if parameter :code:`start_date` is not a string representing a date in YYYY-MM-DD format or
             a datetime object.
+        TypeError
+            Raised if parameter :code:`window` is not an integer.
+        ValueError
+            Raised if parameter :code:`window` is less than 1.
+        TypeError
+            Raised if parameter :code:`return_df` is not boolean (True or False).
 
         Returns
         -------
-        list
+        list or DataFrame
             If data is available in the specified date range, a list of dictionary objects representing the data from
-            the API is returned. If no data is available, an empty dictionary is returned.
+            the API is returned. If no data is available, an empty dictionary is returned. If :code:`return_df` is
+            True, a DataFrame of the events.
 
         Examples
         --------
@@ -686,14 +768,18 @@ class Nasa(object):
            {'activityID': '2017-04-18T19:48:00-CME-001'}]}]
 
         """
-        self.__limit_remaining, r = _donki_request(url=self.host + '/DONKI/SEP',
-                                                   key=self.__api_key,
-                                                   start_date=start_date,
-                                                   end_date=end_date)
+        r = _donki_request(url=self.host + '/DONKI/SEP',
+                           key=self.__api_key,
+                           start_date=start_date,
+                           end_date=end_date,
+                           client=self.client,
+                           window=window,
+                           return_df=return_df,
+                           callback=self._donki_result)
 
         return r
 
-    def magnetopause_crossing(self, start_date=None, end_date=None):
+    def magnetopause_crossing(self, start_date=None, end_date=None, window=None, return_df=False):
         r"""
         Returns data available from the Space Weather Database of Notifications, Knowledge, Information
         (DONKI) API related to magnetopause crossing events.
@@ -706,6 +792,12 @@ class Nasa(object):
         end_date : str, datetime, default None
             String representing a date in YYYY-MM-DD format or a datetime object. If None, defaults to the current
             date in UTC time.
+        window : int, default None
+            Number of days covered by each request, for splitting long date ranges (see Notes of :class:`Nasa`).
+        return_df : bool, default False
+            If True, the events are returned as a pandas DataFrame with one row per event, with :code:`eventTime` parsed
+            into UTC datetimes, :code:`instruments` joined into a categorical of instrument names and
+            :code:`linkedEvents` reduced to lists of activity IDs.
 
         Raises
         ------
@@ -715,12 +807,19 @@ class Nasa(object):
         TypeError
             Raised if parameter :code:`start_date` is not a string representing a date in YYYY-MM-DD format or
             a datetime object.
+        TypeError
+            Raised if parameter :code:`window` is not an integer.
+        ValueError
+            Raised if parameter :code:`window` is less than 1.
+        TypeError
+            Raised if parameter :code:`return_df` is not boolean (True or False).
 
         Returns
         -------
-        list
+        list or DataFrame
             If data is available in the specified date range, a list of dictionary objects representing the data from
-            the API is returned. If no data is available, an empty dictionary is returned.
+            the API is returned. If no data is available, an empty dictionary is returned. If :code:`return_df` is
+            True, a DataFrame of the events.
 
         Examples
         --------
@@ -734,14 +833,18 @@ class Nasa(object):
           'linkedEvents': [{'activityID': '2018-05-05T09:27:00-HSS-001'}]}]
 
         """
-        self.__limit_remaining, r = _donki_request(url=self.host + '/DONKI/MPC',
-                                                   key=self.__api_key,
-                                                   start_date=start_date,
-                                                   end_date=end_date)
+        r = _donki_request(url=self.host + '/DONKI/MPC',
+                           key=self.__api_key,
+                           start_date=start_date,
+                           end_date=end_date,
+                           client=self.client,
+                           window=window,
+                           return_df=return_df,
+                           callback=self._donki_result)
 
         return r
 
-    def radiation_belt_enhancement(self, start_date=None, end_date=None):
+    def radiation_belt_enhancement(self, start_date=None, end_date=None, window=None, return_df=False):
         r"""
         Returns data available from the Space Weather Database of Notifications, Knowledge, Information
         (DONKI) API related to radiation belt enhancement events.
@@ -754,6 +857,12 @@ class Nasa(object):
         end_date : str, datetime, default None
             String representing a date in YYYY-MM-DD format or a datetime object. If None, defaults to the current
             date in UTC time.
+        window : int, default None
+            Number of days covered by each request, for splitting long date ranges (see Notes of :class:`Nasa`).
+        return_df : bool, default False
+            If True, the events are returned as a pandas DataFrame with one row per event, with :code:`eventTime` parsed
+            into UTC datetimes, :code:`instruments` joined into a categorical of instrument names and
+            :code:`linkedEvents` reduced to lists of activity IDs.
 
         Raises
         ------
@@ -763,12 +872,19 @@ class Nasa(object):
         TypeError
             Raised if parameter :code:`start_date` is not a string representing a date in YYYY-MM-DD format or
             a datetime object.
+        TypeError
+            Raised if parameter :code:`window` is not an integer.
+        ValueError
+            Raised if parameter :code:`window` is less than 1.
+        TypeError
+            Raised if parameter :code:`return_df` is not boolean (True or False).
 
         Returns
         -------
-        list
+        list or DataFrame
             If data is available in the specified date range, a list of dictionary objects representing the data from
-            the API is returned. If no data is available, an empty dictionary is returned.
+            the API is returned. If no data is available, an empty dictionary is returned. If :code:`return_df` is
+            True, a DataFrame of the events.
 
         Examples
         --------
@@ -782,14 +898,18 @@ class Nasa(object):
           'linkedEvents': [{'activityID': '2019-08-30T12:17:00-HSS-001'}]}]
 
         """
-        self.__limit_remaining, r = _donki_request(url=self.host + '/DONKI/RBE',
-                                                   key=self.__api_key,
-                                                   start_date=start_date,
-                                                   end_date=end_date)
+        r = _donki_request(url=self.host + '/DONKI/RBE',
+                           key=self.__api_key,
+                           start_date=start_date,
+                           end_date=end_date,
+                           client=self.client,
+                           window=window,
+                           return_df=return_df,
+                           callback=self._donki_result)
 
         return r
 
-    def hight_speed_stream(self, start_date=None, end_date=None):
+    def hight_speed_stream(self, start_date=None, end_date=None, window=None, return_df=False):
         r"""
         Returns data available from the Space Weather Database of Notifications, Knowledge, Information
         (DONKI) API related to hight speed stream events.
@@ -802,6 +922,12 @@ class Nasa(object):
         end_date : str, datetime, default None
             String representing a date in YYYY-MM-DD format or a datetime object. If None, defaults to the current
             date in UTC time.
+        window : int, default None
+            Number of days covered by each request, for splitting long date ranges (see Notes of :class:`Nasa`).
+        return_df : bool, default False
+            If True, the events are returned as a pandas DataFrame with one row per event, with :code:`eventTime` parsed
+            into UTC datetimes, :code:`instruments` joined into a categorical of instrument names and
+            :code:`linkedEvents` reduced to lists of activity IDs.
 
         Raises
         ------
@@ -811,12 +937,19 @@ class Nasa(object):
         TypeError
             Raised if parameter :code:`start_date` is not a string representing a date in YYYY-MM-DD format or
             a datetime object.
+        TypeError
+            Raised if parameter :code:`window` is not an integer.
+        ValueError
+            Raised if parameter :code:`window` is less than 1.
+        TypeError
+            Raised if parameter :code:`return_df` is not boolean (True or False).
 
         Returns
         -------
-        list
+        list or DataFrame
             If data is available in the specified date range, a list of dictionary objects representing the data from
-            the API is returned. If no data is available, an empty dictionary is returned.
+            the API is returned. If no data is available, an empty dictionary is returned. If :code:`return_df` is
+            True, a DataFrame of the events.
 
         Examples
         --------
@@ -840,14 +973,18 @@ class Nasa(object):
           'linkedEvents': None}]
 
         """
-        self.__limit_remaining, r = _donki_request(url=self.host + '/DONKI/HSS',
-                                                   key=self.__api_key,
-                                                   start_date=start_date,
-                                                   end_date=end_date)
+        r = _donki_request(url=self.host + '/DONKI/HSS',
+                           key=self.__api_key,
+                           start_date=start_date,
+                           end_date=end_date,
+                           client=self.client,
+                           window=window,
+                           return_df=return_df,
+                           callback=self._donki_result)
 
         return r
 
-    def wsa_enlil_simulation(self, start_date=None, end_date=None):
+    def wsa_enlil_simulation(self, start_date=None, end_date=None, window=None, return_df=False):
         r"""
         Returns data available from the Space Weather Database of Notifications, Knowledge, Information
         (DONKI) API.
@@ -860,6 +997,14 @@ class Nasa(object):
         end_date : str, datetime, default None
             String representing a date in YYYY-MM-DD format or a datetime object. If None, defaults to the current
             date in UTC time.
+        window : int, default None
+            Number of days covered by each request, for splitting long date ranges (see Notes of :class:`Nasa`).
+        return_df : bool, default False
+            If True, the simulations are returned as a pandas DataFrame with one row per CME input of each simulation,
+            in columns prefixed with 'cmeInputs.', such as 'cmeInputs.speed'. :code:`modelCompletionTime`,
+            :code:`estimatedShockArrivalTime` and the input times are parsed into UTC datetimes, :code:`au`,
+            :code:`estimatedDuration`, the Kp estimates and the input speeds and angles are numbers, and
+            :code:`impactList` is kept as a list of impacts per row.
 
         Raises
         ------
@@ -869,12 +1014,19 @@ class Nasa(object):
         TypeError
             Raised if parameter :code:`start_date` is not a string representing a date in YYYY-MM-DD format or
             a datetime object.
+        TypeError
+            Raised if parameter :code:`window` is not an integer.
+        ValueError
+            Raised if parameter :code:`window` is less than 1.
+        TypeError
+            Raised if parameter :code:`return_df` is not boolean (True or False).
 
         Returns
         -------
-        list
+        list or DataFrame
             If data is available in the specified date range, a list of dictionary objects representing the data from
-            the API is returned. If no data is available, an empty dictionary is returned.
+            the API is returned. If no data is available, an empty dictionary is returned. If :code:`return_df` is
+            True, a DataFrame of the events.
 
         Examples
         --------
@@ -907,13 +1059,118 @@ class Nasa(object):
          'impactList': None}
 
         """
-        self.__limit_remaining, r = _donki_request(url=self.host + '/DONKI/WSAEnlilSimulations',
-                                                   key=self.__api_key,
-                                                   start_date=start_date,
-                                                   end_date=end_date)
+        r = _donki_request(url=self.host + '/DONKI/WSAEnlilSimulations',
+                           key=self.__api_key,
+                           start_date=start_date,
+                           end_date=end_date,
+                           client=self.client,
+                           window=window,
+                           return_df=return_df,
+                           callback=self._donki_result)
 
         return r
 
+    def donki_timeline(self, start_date=None, end_date=None, event_types=None, return_df=False, window=None):
+        r"""
+        Returns the events of every DONKI event type in a date range as a single timeline, sorted by time. The types
+        are requested concurrently, so the call takes about as long as the slowest of the DONKI methods rather than
+        the sum of them all.
+
+        Parameters
+        ----------
+        start_date : str, datetime, default None
+            String representing a date in YYYY-MM-DD format or a datetime object. If None, defaults to 30 days prior
+            to the current date in UTC time.
+        end_date : str, datetime, default None
+            String representing a date in YYYY-MM-DD format or a datetime object. If None, defaults to the current
+            date in UTC time.
+        event_types : list, tuple, default None
+            Names of the DONKI methods whose events are included, such as 'solar_flare'. If None, every type in
+            :data:`DONKI_EVENT_TYPES` is included.
+        return_df : bool, default False
+            If True, the timeline is returned as a pandas DataFrame.
+        window : int, default None
+            Number of days covered by each request, passed on to each of the DONKI methods.
+
+        Raises
+        ------
+        TypeError
+            Raised if parameter :code:`start_date` is not a string representing a date in YYYY-MM-DD format or
+            a datetime object.
+        TypeError
+            Raised if parameter :code:`end_date` is not a string representing a date in YYYY-MM-DD format or
+            a datetime object.
+        TypeError
+            Raised if parameter :code:`event_types` is not a list or tuple.
+        ValueError
+            Raised if an event type is not one of the keys of :data:`DONKI_EVENT_TYPES`.
+        TypeError
+            Raised if parameter :code:`return_df` is not boolean (True or False).
+
+        Returns
+        -------
+        list, DataFrame or awaitable
+            One row per event with the columns 'time' (the time of the event as returned by DONKI, such as
+            '2019-05-06T05:04Z'), 'event_type' (the name of the method that returned it), 'id' (the event's identifier,
+            or None for coronal mass ejection analyses, which have none) and 'event' (the event as returned by its
+            method). Events of several types at the same time are ordered by type. If the client is an
+            :class:`~nasapy.client.AsyncClient`, as with :class:`~nasapy.aio.AsyncNasa`, an awaitable resolving to the
+            timeline is returned instead, and the types are requested concurrently on the event loop.
+
+        Examples
+        --------
+        # Initialize API connection with a Demo Key
+        >>> n = Nasa()
+        # Every space weather event of the last thirty days, oldest first.
+        >>> timeline = n.donki_timeline()
+        >>> timeline[0]
+        {'time': '2019-05-06T05:04Z',
+         'event_type': 'solar_flare',
+         'id': '2019-05-06T05:04:00-FLR-001',
+         'event': {'flrID': '2019-05-06T05:04:00-FLR-001', ...}}
+        # Only flares and coronal mass ejections, as a DataFrame.
+        >>> n.donki_timeline(event_types=['solar_flare', 'coronal_mass_ejection'], return_df=True)
+
+        """
+        start_date, end_date = _check_dates(start_date=start_date, end_date=end_date)
+
+        if event_types is None:
+            event_types = tuple(DONKI_EVENT_TYPES)
+        elif not isinstance(event_types, (list, tuple)):
+            raise TypeError('event_types parameter must be a list or tuple (if specified).')
+
+        for event_type in event_types:
+            if event_type not in DONKI_EVENT_TYPES:
+                raise ValueError('event type must be one of {types}.'.format(types=tuple(DONKI_EVENT_TYPES)))
+
+        if not isinstance(return_df, bool):
+            raise TypeError('return_df parameter must be boolean (True or False).')
+
+        calls = [(getattr(self, event_type), {'start_date': start_date, 'end_date': end_date, 'window': window})
+                 for event_type in event_types]
+
+        def _result(results):
+            timeline = _donki_timeline(zip(event_types, results))
+
+            if return_df:
+                timeline = _data_frame(timeline, columns=['time', 'event_type', 'id', 'event'])
+
+            return timeline
+
+        if isinstance(self.client, AsyncClient):
+            async def _gather():
+                if not calls:
+                    return _result([])
+
+                return _result(await run_batch_async(calls, max_concurrency=len(calls), return_exceptions=False))
+
+            return _gather()
+
+        if not calls:
+            return _result([])
+
+        return _result(run_batch(calls, max_workers=len(calls), return_exceptions=False))
+
     def epic(self, color='natural', date=None, available=False):
         r"""
         The EPIC API provides data on the imagery collected by the DSCOVR's Earth Polychromatic Imaging Camera
@@ -1019,14 +1276,9 @@ class Nasa(object):
         else:
             url = url + '{color}/all'.format(color=color)
 
-        r = requests.get(url,
-                         params={'api_key': self.__api_key})
-
-        if r.status_code != 200 or r.text == '':
-            r = {}
-        else:
-            self.__limit_remaining = r.headers['X-RateLimit-Remaining']
-            r = r.json()
+        r = self.client.get(url,
+                            params={'api_key': self.__api_key},
+                            callback=self._optional_json_result)
 
         return r
 
@@ -1109,21 +1361,16 @@ class Nasa(object):
             if isinstance(date, datetime.datetime):
                 date = date.strftime('%Y-%m-%d')
 
-        r = requests.get(url,
-                         params={
-                             'lon': lon,
-                             'lat': lat,
-                             'dim': dim,
-                             'date': date,
-                             'cloud_score': cloud_score,
-                             'api_key': self.__api_key
-                         })
-
-        if r.status_code != 200 or r.text == '':
-            r = {}
-        else:
-            self.__limit_remaining = r.headers['X-RateLimit-Remaining']
-            r = r.json()
+        r = self.client.get(url,
+                            params={
+                                'lon': lon,
+                                'lat': lat,
+                                'dim': dim,
+                                'date': date,
+                                'cloud_score': cloud_score,
+                                'api_key': self.__api_key
+                            },
+                            callback=self._optional_json_result)
 
         return r
 
@@ -1196,22 +1443,17 @@ class Nasa(object):
         if not -180 <= lon <= 180:
             raise ValueError('longitude values range from -180 to 180')
 
-        r = requests.get(url,
-                         params={
-                             'api_key': self.__api_key,
-                             'lat': lat,
-                             'lon': lon,
-                             'begin_date': begin_date,
-                             'end_date': end_date
-                         })
-
-        if r.status_code != 200:
-            raise requests.exceptions.HTTPError(r.reason, r.url)
-
-        else:
-            self.__limit_remaining = r.headers['X-RateLimit-Remaining']
+        r = self.client.get(url,
+                            params={
+                                'api_key': self.__api_key,
+                                'lat': lat,
+                                'lon': lon,
+                                'begin_date': begin_date,
+                                'end_date': end_date
+                            },
+                            callback=self._json_result)
 
-        return r.json()
+        return r
 
     def mars_rover(self, sol=None, earth_date=None, camera='all', rover='curiosity', page=1):
         r"""
@@ -1317,16 +1559,14 @@ class Nasa(object):
 
             params['earth_date'] = earth_date
 
-        r = requests.get(url,
-                         params=params)
-
-        if r.status_code != 200:
-            raise requests.exceptions.HTTPError(r.reason, r.url)
+        def _result(r):
+            return self._json_result(r)['photos']
 
-        else:
-            self.__limit_remaining = r.headers['X-RateLimit-Remaining']
+        r = self.client.get(url,
+                            params=params,
+                            callback=_result)
 
-        return r.json()['photos']
+        return r
 
     def genelab_search(self, term=None, database='cgene', page=0, size=25, sort=None, order='desc',
                        ffield=None, fvalue=None):
@@ -1417,7 +1657,7 @@ class Nasa(object):
             'api_key': self.__api_key
         }
 
-        r = _return_api_result(url=url, params=params)
+        r = _return_api_result(url=url, params=params, client=self.client)
 
         return r
 
@@ -1463,30 +1703,137 @@ class Nasa(object):
                 last_updated = last_updated.strftime('%Y-%m-%d')
 
         if project_id is None:
-            r = requests.get(url,
-                             params={'updatedSince': last_updated,
-                                     'api_key': self.__api_key})
+            params = {'updatedSince': last_updated,
+                      'api_key': self.__api_key}
         else:
             url = url + '/{project_id}'.format(project_id=project_id)
 
             if return_format == 'xml':
                 url = url + '.xml'
 
-            r = requests.get(url,
-                             params={'api_key': self.__api_key})
+            params = {'api_key': self.__api_key}
+
+        def _result(r):
+            if return_format == 'xml':
+                self._check_result(r)
+                return r.text
+
+            return self._json_result(r)
+
+        r = self.client.get(url,
+                            params=params,
+                            callback=_result)
+
+        return r
+
+    def batch(self, jobs, max_workers=10, return_exceptions=True, deadline=None):
+        r"""
+        Runs a list of method or function calls concurrently on a bounded thread pool. All calls share the class's
+        client and its connection pools.
+
+        Parameters
+        ----------
+        jobs : list
+            List of (endpoint, kwargs) tuples. The endpoint can be the name of a method of the class (such as
+            'get_asteroids'), the name of a module-level function (such as 'sentry'), or a callable. Module-level
+            functions are sent through the class's client unless a :code:`client` is given in the kwargs.
+        max_workers : int, default 10
+            The maximum number of requests in flight at once. Values larger than the client's :code:`pool_maxsize`
+            open connections that are not kept alive.
+        return_exceptions : bool, default True
+            If True (default), an exception raised by a job is returned in place of its result. If False, the first
+            exception raised (in input order) is re-raised once all jobs have finished.
+        deadline : int, float, default None
+            Number of seconds the batch must finish within. Jobs not started when the deadline passes are cancelled,
+            and jobs in flight give up; both are reported with a :class:`~nasapy.deadline.DeadlineExceeded`
+            exception.
+
+        Raises
+        ------
+        TypeError
+            Raised if a job is not an (endpoint, kwargs) tuple.
+        ValueError
+            Raised if an endpoint name is not a method of the class or a module-level function.
+        ValueError
+            Raised if :code:`max_workers` is less than 1.
+
+        Returns
+        -------
+        list
+            The result, or raised exception, of each job in the same order as :code:`jobs`.
+
+        Examples
+        --------
+        # Initialize API connection with a Demo Key
+        >>> n = Nasa()
+        # Get data on several asteroids and Sentry objects at once.
+        >>> r = n.batch([('get_asteroids', {'asteroid_id': 3542519}),
+        ...              ('get_asteroids', {'asteroid_id': 2000433}),
+        ...              ('sentry', {'des': '99942'})])
+        # Pace a long batch so the key's hourly limit is not exceeded.
+        >>> n = Nasa(key=key, client=Client(throttle=True))
+        >>> r = n.batch([('get_asteroids', {'asteroid_id': i}) for i in asteroid_ids])
+
+        """
+        calls = resolve_jobs(jobs, namespace=self._endpoints(), client=self.client)
+
+        return run_batch(calls, max_workers=max_workers, return_exceptions=return_exceptions, deadline=deadline)
+
+    def _endpoints(self):
+        endpoints = _module_endpoints()
+
+        for name in ('picture_of_the_day', 'mars_weather', 'asteroid_feed', 'get_asteroids', 'coronal_mass_ejection',
+                     'geomagnetic_storm', 'interplantary_shock', 'solar_flare', 'solar_energetic_particle',
+                     'magnetopause_crossing', 'radiation_belt_enhancement', 'hight_speed_stream',
+                     'wsa_enlil_simulation', 'donki_timeline', 'epic', 'earth_imagery', 'earth_assets', 'mars_rover',
+                     'genelab_search', 'techport'):
+            endpoints[name] = getattr(self, name)
+
+        return endpoints
 
+    def _check_result(self, r):
         if r.status_code != 200:
             raise requests.exceptions.HTTPError(r.reason, r.url)
 
-        self.__limit_remaining = r.headers['X-RateLimit-Remaining']
+        self._update_limit_remaining('limit_remaining', r)
 
-        if return_format == 'xml':
-            r = r.text
-        else:
-            r = r.json()
+    def _json_result(self, r):
+        self._check_result(r)
+
+        return _json(r)
+
+    def _mars_weather_result(self, r):
+        if r.status_code != 200:
+            raise requests.exceptions.HTTPError(r.reason, r.url)
+
+        self._update_limit_remaining('mars_weather_limit_remaining', r)
+
+        return _json(r)
+
+    def _optional_json_result(self, r):
+        if r.status_code != 200 or r.text == '':
+            return {}
+
+        self._update_limit_remaining('limit_remaining', r)
+
+        return _json(r)
+
+    def _donki_result(self, response, r):
+        self._update_limit_remaining('limit_remaining', response)
 
         return r
 
+    def _update_limit_remaining(self, name, r):
+        # Responses to calls made from several threads are handled in any order, so the remaining count is only
+        # replaced by a response received after the one it was read from. Cached responses only set it if no response
+        # has been received from the server yet.
+        sequence = response_sequence(r)
+
+        with self._quota_lock:
+            if sequence > self._quota_sequences.get(name, -1):
+                self._quota_sequences[name] = sequence
+                setattr(self, name, r.headers.get('X-RateLimit-Remaining', 'n/a'))
+
     # def mars_mission_manifest(self, rover):
     #     url = self.host + '/mars-photos/api/manifests/{rover}'.format(rover=rover)
     #
@@ -1521,7 +1868,7 @@ class Nasa(object):
 
 
 def exoplanets(table='exoplanets', select=None, count=None, colset=None, where=None, order=None, ra=None, dec=None,
-               aliastable=None, objname=None, return_df=False):
+               aliastable=None, objname=None, return_df=False, chunksize=None, client=None):
     r"""
     Provides access to NASA's Exoplanet Archive.
 
@@ -1553,6 +1900,14 @@ def exoplanets(table='exoplanets', select=None, count=None, colset=None, where=N
         When parameter `aliastable` is specified, `objname` must also be passed with the planet's name.
     return_df : bool, default False
         If `True`, returns the JSON data as a pandas DataFrame.
+    chunksize : int, default None
+        If given, the response is parsed incrementally as it is received and a generator is returned yielding the
+        returned records in lists of :code:`chunksize` rows, or pandas DataFrames of :code:`chunksize` rows if
+        :code:`return_df` is True. Memory use stays bounded however many rows are returned. Not supported by the
+        asynchronous client.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Returns
     -------
@@ -1572,28 +1927,42 @@ def exoplanets(table='exoplanets', select=None, count=None, colset=None, where=N
     """
     host = 'https://exoplanetarchive.ipac.caltech.edu/cgi-bin/nstedAPI/nph-nstedAPI?'
 
-    r = requests.get(host,
-                     params={
-                         'table': table,
-                         'select': select,
-                         'count': count,
-                         'colset': colset,
-                         'where': where,
-                         'order': order,
-                         'ra': ra,
-                         'dec': dec,
-                         'aliastable': aliastable,
-                         'objname': objname,
-                         'format': 'json'
-                     }).json()
-
-    if return_df:
-        r = DataFrame(r)
+    if client is None:
+        client = default_client()
+
+    params = {
+        'table': table,
+        'select': select,
+        'count': count,
+        'colset': colset,
+        'where': where,
+        'order': order,
+        'ra': ra,
+        'dec': dec,
+        'aliastable': aliastable,
+        'objname': objname,
+        'format': 'json'
+    }
+
+    if chunksize is not None:
+        return _stream_api_result(url=host, params=params, chunksize=chunksize, return_df=return_df, client=client)
+
+    def _result(r):
+        r = _json(r)
+
+        if return_df:
+            r = _data_frame(r)
+
+        return r
+
+    r = client.get(host,
+                   params=params,
+                   callback=_result)
 
     return r
 
 
-def tle(search_satellite=None, satellite_number=None):
+def tle(search_satellite=None, satellite_number=None, client=None):
     r"""
     Returns two-line element set records provided by CelesTrak. A two-line element set (TLE) is a data format
     encoding a list of orbital elements of an Earth-orbiting object for a given point in time.
@@ -1604,6 +1973,9 @@ def tle(search_satellite=None, satellite_number=None):
         Searches satellites by name designation.
     satellite_number : str, int, default None
         Specfic satellite ID number.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Returns
     -------
@@ -1626,27 +1998,33 @@ def tle(search_satellite=None, satellite_number=None):
     """
     url = 'https://data.ivanstanojevic.me/api/tle'
 
+    if client is None:
+        client = default_client()
+
+    params = None
+
     if search_satellite is not None:
-        r = requests.get(url,
-                         params={'search': search_satellite})
+        params = {'search': search_satellite}
 
     elif satellite_number is not None:
         url = url + '/{satellite_number}'.format(satellite_number=satellite_number)
 
-        r = requests.get(url)
+    def _result(r):
+        if r.status_code == 404:
+            raise requests.exceptions.HTTPError(_json(r)['response']['message'])
 
-    else:
-        r = requests.get(url)
+        return _json(r)
 
-    if r.status_code == 404:
-        raise requests.exceptions.HTTPError(r.json()['response']['message'])
+    r = client.get(url,
+                   params=params,
+                   callback=_result)
 
-    return r.json()
+    return r
 
 
 def media_search(query=None, center=None, description=None, keywords=None, location=None, media_type=None,
                  nasa_id=None, page=1, photographer=None, secondary_creator=None, title=None, year_start=None,
-                 year_end=None):
+                 year_end=None, client=None):
     r"""
     Performs a general search for media from the images.nasa.gov API based on parameters and criteria specified.
     At least one parameter must be provided.
@@ -1683,6 +2061,9 @@ def media_search(query=None, center=None, description=None, keywords=None, locat
     year_end : str, datetime, None (default)
         The end year for results. If provided, must be a string representing a year in YYYY format or a
         datetime object.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Raises
     ------
@@ -1765,12 +2146,15 @@ def media_search(query=None, center=None, description=None, keywords=None, locat
         'year_end': year_end
     }
 
-    r = _return_api_result(url=url, params=params)
+    def _result(r):
+        return r['collection']
 
-    return r['collection']
+    r = _return_api_result(url=url, params=params, client=client, callback=_result)
+
+    return r
 
 
-def media_asset_manifest(nasa_id):
+def media_asset_manifest(nasa_id, client=None):
     r"""
     Returns the media asset's manifest, which contains the available versions of the asset and it's metadata
     location.
@@ -1779,6 +2163,9 @@ def media_asset_manifest(nasa_id):
     ----------
     nasa_id : str
         The ID of the media asset.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Returns
     -------
@@ -1797,10 +2184,10 @@ def media_asset_manifest(nasa_id):
      {'href': 'http://images-assets.nasa.gov/image/as11-40-5874/metadata.json'}]
 
     """
-    return _media_assets(endpoint='asset', nasa_id=nasa_id)
+    return _media_assets(endpoint='asset', nasa_id=nasa_id, client=client)
 
 
-def media_asset_metadata(nasa_id):
+def media_asset_metadata(nasa_id, client=None):
     r"""
     Retrieves the specified media asset's metadata.
 
@@ -1808,6 +2195,9 @@ def media_asset_metadata(nasa_id):
     ----------
     nasa_id : str
         The ID of the media asset.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Returns
     -------
@@ -1815,10 +2205,10 @@ def media_asset_metadata(nasa_id):
         Dictionary containing the metadata of the provided media asset ID.
 
     """
-    return _media_assets(endpoint='metadata', nasa_id=nasa_id)
+    return _media_assets(endpoint='metadata', nasa_id=nasa_id, client=client)
 
 
-def media_asset_captions(nasa_id):
+def media_asset_captions(nasa_id, client=None):
     r"""
     Retrieves the captions and location of the captions .srt file for a media asset from the NASA image API.
 
@@ -1826,6 +2216,9 @@ def media_asset_captions(nasa_id):
     ----------
     nasa_id : str
         The ID of the media asset.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Returns
     -------
@@ -1836,13 +2229,14 @@ def media_asset_captions(nasa_id):
         such as srt for parsing media asset captions.
 
     """
-    return _media_assets(endpoint='captions', nasa_id=nasa_id)
+    return _media_assets(endpoint='captions', nasa_id=nasa_id, client=client)
 
 
 def close_approach(date_min='now', date_max='+60', dist_min=None, dist_max='0.05', h_min=None, h_max=None,
                    v_inf_min=None, v_inf_max=None, v_rel_min=None, v_rel_max=None, orbit_class=None, pha=False,
                    nea=False, comet=False, nea_comet=False, neo=False, kind=None, spk=None, des=None,
-                   body='Earth', sort='date', limit=None, fullname=False, return_df=False):
+                   body='Earth', sort='date', limit=None, fullname=False, return_df=False, chunksize=None,
+                   client=None):
     r"""
     Provides data for currently known close-approach data for all asteroids and comets in NASA's Jet Propulsion
     Laboratory's (JPL) Small-Body Database.
@@ -1910,6 +2304,14 @@ def close_approach(date_min='now', date_max='+60', dist_min=None, dist_max='0.05
     return_df : bool, default False
         If True, returns the 'data' field of the returned JSON data as a pandas DataFrame with column names extracted
         from the 'fields' key of the returned JSON.
+    chunksize : int, default None
+        If given, the response is parsed incrementally as it is received and a generator is returned yielding the
+        rows of the 'data' field in lists of :code:`chunksize` rows, or pandas DataFrames of :code:`chunksize` rows if
+        :code:`return_df` is True. Memory use stays bounded however many rows are returned. Not supported by the
+        asynchronous client.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Raises
     ------
@@ -2050,17 +2452,25 @@ def close_approach(date_min='now', date_max='+60', dist_min=None, dist_max='0.05
         'fullname': fullname
     }
 
-    r = _return_api_result(url=url, params=params)
+    if chunksize is not None:
+        return _stream_api_result(url=url, params=params, chunksize=chunksize, key='data', return_df=return_df,
+                                  client=client)
+
+    def _result(r):
+        if return_df:
+            r = _data_frame(r['data'], columns=r['fields'])
 
-    if return_df:
-        r = DataFrame(r['data'], columns=r['fields'])
+        return r
+
+    r = _return_api_result(url=url, params=params, client=client, callback=_result)
 
     return r
 
 
 def fireballs(date_min=None, date_max=None, energy_min=None, energy_max=None, impact_e_min=None, impact_e_max=None,
               vel_min=None, vel_max=None, alt_min=None, alt_max=None, req_loc=False, req_alt=False, req_vel=False,
-              req_vel_comp=False, vel_comp=False, sort='date', limit=None, return_df=False):
+              req_vel_comp=False, vel_comp=False, sort='date', limit=None, return_df=False, chunksize=None,
+              client=None):
     r"""
     Returns available data on fireballs (objects that burn up in the upper atmosphere of Earth).
 
@@ -2109,6 +2519,14 @@ def fireballs(date_min=None, date_max=None, energy_min=None, energy_max=None, im
     return_df : bool, default False
         If True, returns the 'data' field of the returned JSON data as a pandas DataFrame with column names extracted
         from the 'fields' key of the returned JSON.
+    chunksize : int, default None
+        If given, the response is parsed incrementally as it is received and a generator is returned yielding the
+        rows of the 'data' field in lists of :code:`chunksize` rows, or pandas DataFrames of :code:`chunksize` rows if
+        :code:`return_df` is True. Memory use stays bounded however many rows are returned. Not supported by the
+        asynchronous client.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Raises
     ------
@@ -2256,17 +2674,26 @@ def fireballs(date_min=None, date_max=None, energy_min=None, energy_max=None, im
         'limit': limit
     }
 
-    r = _return_api_result(url=url,
-                           params=params)
+    if chunksize is not None:
+        return _stream_api_result(url=url, params=params, chunksize=chunksize, key='data', return_df=return_df,
+                                  client=client)
 
-    if return_df:
-        r = DataFrame(r['data'], columns=r['fields'])
+    def _result(r):
+        if return_df:
+            r = _data_frame(r['data'], columns=r['fields'])
+
+        return r
+
+    r = _return_api_result(url=url,
+                           params=params,
+                           client=client,
+                           callback=_result)
 
     return r
 
 
 def mission_design(des=None, spk=None, sstr=None, orbit_class=False, mjd0=None, span=None, tof_min=None,
-                   tof_max=None, step=None):
+                   tof_max=None, step=None, client=None):
     r"""
     Provides access to the Jet Propulsion Laboratory/Solar System Dynamics small body mission design suite API.
 
@@ -2291,6 +2718,9 @@ def mission_design(des=None, spk=None, sstr=None, orbit_class=False, mjd0=None,
     step : int, default None, {1,2,5,10,15,20,30}
         Time step used to advance the launch date and the time of flight. Size of transfer map is limited to
         1,500,000 points.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Raises
     ------
@@ -2386,13 +2816,13 @@ def mission_design(des=None, spk=None, sstr=None, orbit_class=False, mjd0=None,
     elif sstr is not None:
         params['sstr'] = sstr
 
-    r = _return_api_result(url=url, params=params)
+    r = _return_api_result(url=url, params=params, client=client)
 
     return r
 
 
 def nhats(spk=None, des=None, delta_v=12, duration=450, stay=8, launch='2020-2045', magnitude=None,
-          orbit_condition_code=None, plot=False, return_df=False):
+          orbit_condition_code=None, plot=False, return_df=False, client=None):
     r"""
     Returns data available from the Near-Earth Object Human Space Flight Accessible Targets Study (NHATS) in the
     Small Bodies Database
@@ -2421,6 +2851,9 @@ def nhats(spk=None, des=None, delta_v=12, duration=450, stay=8, launch='2020-204
     return_df : bool, default False
         If True and parameters `spk` and `des` are None, returns the 'data' field of the returned JSON data as a
         pandas DataFrame with column names extracted from the 'fields' key of the returned JSON.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Raises
     ------
@@ -2513,16 +2946,20 @@ def nhats(spk=None, des=None, delta_v=12, duration=450, stay=8, launch='2020-204
         params['spk'] = spk
         return_df = False
 
-    r = _return_api_result(url=url, params=params)
+    def _result(r):
+        if return_df:
+            r = _data_frame(r['data'])
+
+        return r
 
-    if return_df:
-        r = DataFrame(r['data'])
+    r = _return_api_result(url=url, params=params, client=client, callback=_result)
 
     return r
 
 
 def scout(tdes=None, plot=None, data_files=None, orbits=None, n_orbits=None, eph_start=None, eph_stop=None,
-          eph_step=None, obs_code=None, fov_diam=None, fov_ra=None, fov_dec=None, fov_vmag=None, return_df=False):
+          eph_step=None, obs_code=None, fov_diam=None, fov_ra=None, fov_dec=None, fov_vmag=None, return_df=False,
+          client=None):
     r"""
     Provides access and data available from NASA's Center for Near-Earth Object Studies (CNEOS) Scout system.
 
@@ -2562,6 +2999,9 @@ def scout(tdes=None, plot=None, data_files=None, orbits=None, n_orbits=None, eph
     return_df : bool, default False
         If True and no parameters are specified (returns summary data of all available Scout records), returns the
         'data' field of the returned JSON data as a pandas DataFrame.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Raises
     ------
@@ -2665,19 +3105,22 @@ def scout(tdes=None, plot=None, data_files=None, orbits=None, n_orbits=None, eph
               'fov_dec': fov_dec,
               'fov-vmag': fov_vmag}
 
-    r = _return_api_result(url=url, params=params)
+    def _result(r):
+        if return_df:
+            if all(p is None for p in (tdes, plot, data_files, orbits, n_orbits, eph_start, eph_stop, eph_step,
+                                       obs_code, fov_diam, fov_ra, fov_dec, fov_vmag)):
+                if int(r['count']) > 0:
+                    r = _data_frame(r['data'])
 
-    if return_df:
-        if all(p is None for p in (tdes, plot, data_files, orbits, n_orbits, eph_start, eph_stop, eph_step, obs_code,
-                                   fov_diam, fov_ra, fov_dec, fov_vmag)):
-            if int(r['count']) > 0:
-                r = DataFrame(r['data'])
+        return r
+
+    r = _return_api_result(url=url, params=params, client=client, callback=_result)
 
     return r
 
 
 def sentry(spk=None, des=None, h_max=None, ps_min=None, ip_min=None, last_obs_days=None, complete_data=False,
-           removed=False, return_df=False):
+           removed=False, return_df=False, chunksize=None, client=None):
     r"""
     Provides data available from the Center for Near Earth Object Studies (CNEOS) Sentry system.
 
@@ -2706,6 +3149,15 @@ def sentry(spk=None, des=None, h_max=None, ps_min=None, ip_min=None, last_obs_da
         If True, returns the 'data' field of the returned JSON data as a pandas DataFrame. If a `des` or `spk`
         parameter is passed with `return_df=True`, a tuple containing the coerced data field as a pandas DataFrame and
         the `summary` object of the returned data will be returned.
+    chunksize : int, default None
+        If given, the response is parsed incrementally as it is received and a generator is returned yielding the
+        records of the 'data' field (the 'summary' object returned for a :code:`des` or :code:`spk` is
+        skipped) in lists of :code:`chunksize` rows, or pandas DataFrames of :code:`chunksize` rows if
+        :code:`return_df` is True. Memory use stays bounded however many rows are returned. Not supported by the
+        asynchronous client.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the request. If None, the shared client returned by
+        :func:`~nasapy.client.default_client` is used.
 
     Raises
     ------
@@ -2784,14 +3236,21 @@ def sentry(spk=None, des=None, h_max=None, ps_min=None, ip_min=None, last_obs_da
         if des is not None:
             params['des'] = des
 
-    r = _return_api_result(url=url, params=params)
+    if chunksize is not None:
+        return _stream_api_result(url=url, params=params, chunksize=chunksize, key='data', return_df=return_df,
+                                  client=client)
 
-    if return_df:
-        if 'summary' in r.keys():
-            r, r2 = DataFrame(r['data']), r['summary']
-            return r, r2
-        else:
-            r = DataFrame(r['data'])
+    def _result(r):
+        if return_df:
+            if 'summary' in r.keys():
+                r, r2 = _data_frame(r['data']), r['summary']
+                return r, r2
+            else:
+                r = _data_frame(r['data'])
+
+        return r
+
+    r = _return_api_result(url=url, params=params, client=client, callback=_result)
 
     return r
 
@@ -2865,62 +3324,394 @@ def julian_date(dt=None, year=None, month=1, day=1, hour=0, minute=0, second=0,
     return julian
 
 
-def _media_assets(endpoint, nasa_id):
+def batch(jobs, max_workers=10, client=None, return_exceptions=True, deadline=None):
+    r"""
+    Runs a list of module-level function calls concurrently on a bounded thread pool.
+
+    Parameters
+    ----------
+    jobs : list
+        List of (endpoint, kwargs) tuples. The endpoint can be the name of a module-level function, such as
+        'sentry' or 'mission_design', or a callable.
+    max_workers : int, default 10
+        The maximum number of requests in flight at once.
+    client : Client, default None
+        The :class:`~nasapy.client.Client` used to send the requests of jobs that do not specify a :code:`client`
+        in their kwargs. If None, the shared client returned by :func:`~nasapy.client.default_client` is used.
+    return_exceptions : bool, default True
+        If True (default), an exception raised by a job is returned in place of its result. If False, the first
+        exception raised (in input order) is re-raised once all jobs have finished.
+    deadline : int, float, default None
+        Number of seconds the batch must finish within. Jobs not started when the deadline passes are cancelled,
+        and jobs in flight give up; both are reported with a :class:`~nasapy.deadline.DeadlineExceeded`
+        exception.
+
+    Raises
+    ------
+    TypeError
+        Raised if a job is not an (endpoint, kwargs) tuple.
+    ValueError
+        Raised if an endpoint name is not a module-level function.
+    ValueError
+        Raised if :code:`max_workers` is less than 1.
+
+    Returns
+    -------
+    list
+        The result, or raised exception, of each job in the same order as :code:`jobs`.
+
+    Examples
+    --------
+    # Get Sentry data for a watch list of objects.
+    >>> r = batch([('sentry', {'des': des}) for des in ('99942', '101955', '29075')])
+    # Get mission design data for several targets, raising the first error encountered.
+    >>> r = batch([('mission_design', {'des': 1}), ('mission_design', {'spk': 2000433})], return_exceptions=False)
+
+    """
+    if client is None:
+        client = default_client()
+
+    calls = resolve_jobs(jobs, namespace=_module_endpoints(), client=client)
+
+    return run_batch(calls, max_workers=max_workers, return_exceptions=return_exceptions, deadline=deadline)
+
+
+def _media_assets(endpoint, nasa_id, client=None):
     url = 'https://images-api.nasa.gov/{endpoint}/{nasa_id}'
 
-    r = requests.get(url.format(endpoint=endpoint,
-                                nasa_id=nasa_id))
+    if client is None:
+        client = default_client()
 
-    if r.status_code != 200:
-        raise requests.exceptions.HTTPError(r.reason, r.url)
+    def _result(r):
+        if r.status_code != 200:
+            raise requests.exceptions.HTTPError(r.reason, r.url)
 
-    else:
         if endpoint == 'asset':
-            return r.json()['collection']['items']
+            return _json(r)['collection']['items']
 
-        elif endpoint == 'metadata':
-            location = r.json()['location']
-            r = requests.get(location).json()
-            r['location'] = location
+        location = _json(r)['location']
+
+        def _location_result(r):
+            if endpoint == 'metadata':
+                r = _json(r)
+                r['location'] = location
+
+            else:
+                r = {
+                    'location': location,
+                    'captions': r.text
+                }
 
             return r
 
-        elif endpoint == 'captions':
-            location = r.json()['location']
-            r = requests.get(location).text
+        # The metadata and captions are stored at a second location, so the request to retrieve them is returned to
+        # the client to send.
+        return client.get(location, callback=_location_result)
 
-            r = {
-                'location': location,
-                'captions': r
-            }
+    r = client.get(url.format(endpoint=endpoint,
+                              nasa_id=nasa_id),
+                   callback=_result)
 
     return r
 
 
-def _donki_request(key, url, start_date=None, end_date=None):
+# The DONKI methods of Nasa and the field holding the time of the events each returns.
+DONKI_EVENT_TYPES = {
+    'coronal_mass_ejection': 'time21_5',
+    'geomagnetic_storm': 'startTime',
+    'interplantary_shock': 'eventTime',
+    'solar_flare': 'beginTime',
+    'solar_energetic_particle': 'eventTime',
+    'magnetopause_crossing': 'eventTime',
+    'radiation_belt_enhancement': 'eventTime',
+    'hight_speed_stream': 'eventTime',
+    'wsa_enlil_simulation': 'modelCompletionTime'
+}
+
+# The field identifying the events returned by each DONKI endpoint, used to merge the events of several date windows.
+_DONKI_ID_FIELDS = ('activityID', 'flrID', 'gstID', 'sepID', 'mpcID', 'rbeID', 'hssID', 'simulationID')
+
+# The number of date windows of a DONKI request fetched at once.
+_DONKI_WINDOW_WORKERS = 4
+
+
+def _donki_request(key, url, start_date=None, end_date=None, params=None, client=None, callback=None, window=None,
+                   return_df=False):
     start_date, end_date = _check_dates(start_date=start_date, end_date=end_date)
 
-    r = requests.get(url,
-                     params={
-                         'api_key': key,
-                         'startDate': start_date,
-                         'endDate': end_date
-                     })
+    if window is not None:
+        if isinstance(window, bool) or not isinstance(window, int):
+            raise TypeError('window parameter must be an integer (if specified).')
 
-    if 'X-RateLimit-Remaining' not in r.headers:
-        limit_remaining = 'n/a'
-    else:
-        limit_remaining = r.headers['X-RateLimit-Remaining']
+        if window < 1:
+            raise ValueError('window parameter must be greater than 0.')
+
+    if not isinstance(return_df, bool):
+        raise TypeError('return_df parameter must be boolean (True or False).')
 
-    if r.status_code != 200:
-        raise requests.exceptions.HTTPError(r.reason, r.url)
+    if client is None:
+        client = default_client()
 
-    if r.text == '':
-        r = {}
-    else:
-        r = r.json()
+    donki_params = {
+        'api_key': key,
+        'startDate': start_date,
+        'endDate': end_date
+    }
+
+    if params is not None:
+        donki_params.update(params)
+
+    def _events(response):
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(response.reason, response.url)
+
+        if response.text == '':
+            r = {}
+        else:
+            r = _json(response)
+
+        if callback is not None:
+            r = callback(response, r)
+
+        return response, r
+
+    def _result(response):
+        response, r = _events(response)
+
+        if return_df:
+            r = _donki_data_frame(r)
+
+        if callback is not None:
+            return r
 
-    return limit_remaining, r
+        return response.headers.get('X-RateLimit-Remaining', 'n/a'), r
+
+    windows = _date_windows(start_date, end_date, window) if window is not None else []
+
+    if len(windows) > 1:
+        return _donki_windows(url, donki_params, windows, client, _events, callback, return_df)
+
+    r = client.get(url,
+                   params=donki_params,
+                   callback=_result)
+
+    return r
+
+
+def _date_windows(start_date, end_date, window):
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+
+    end = _parse_date(end_date, 'end_date') if end_date is not None else today
+    start = _parse_date(start_date, 'start_date') if start_date is not None else today - datetime.timedelta(days=30)
+
+    windows = []
+
+    while start <= end:
+        window_end = min(start + datetime.timedelta(days=window - 1), end)
+        windows.append((start.isoformat(), window_end.isoformat()))
+        start = window_end + datetime.timedelta(days=1)
+
+    return windows
+
+
+def _donki_windows(url, params, windows, client, events, callback, return_df=False):
+    calls = [(client.get, {'url': url, 'params': dict(params, startDate=start, endDate=end), 'callback': events})
+             for start, end in windows]
+
+    def _merge(results):
+        r = _merge_donki_events([r for _, r in results])
+
+        if return_df:
+            r = _donki_data_frame(r)
+
+        if callback is not None:
+            return r
+
+        # The windows are received in any order, so the rate limit is read from the last response received.
+        latest = max((response for response, _ in results), key=response_sequence)
+
+        return latest.headers.get('X-RateLimit-Remaining', 'n/a'), r
+
+    if isinstance(client, AsyncClient):
+        async def _gather():
+            return _merge(await run_batch_async(calls, max_concurrency=_DONKI_WINDOW_WORKERS, return_exceptions=False))
+
+        return _gather()
+
+    return _merge(run_batch(calls, max_workers=_DONKI_WINDOW_WORKERS, return_exceptions=False))
+
+
+def _merge_donki_events(results):
+    events, seen = [], set()
+
+    for r in results:
+        for event in r or ():
+            key = _donki_event_key(event)
+
+            if key not in seen:
+                seen.add(key)
+                events.append(event)
+
+    return events or {}
+
+
+def _donki_timeline(results):
+    timeline = []
+
+    for event_type, events in results:
+        for event in events or ():
+            timeline.append({'time': event.get(DONKI_EVENT_TYPES[event_type]), 'event_type': event_type,
+                             'id': _donki_event_id(event), 'event': event})
+
+    # DONKI times share one format, so they sort as strings. Events without a time are put last.
+    timeline.sort(key=lambda row: (row['time'] is None, row['time'] or '', row['event_type']))
+
+    return timeline
+
+
+def _donki_event_id(event):
+    return next((event[field] for field in _DONKI_ID_FIELDS if event.get(field)), None)
+
+
+def _donki_event_key(event):
+    key = _donki_event_id(event)
+
+    # CMEAnalysis records have no identifier of their own, so they are compared whole.
+    if key is None:
+        key = json.dumps(event, sort_keys=True)
+
+    return key
+
+
+def _parse_date(date, name):
+    try:
+        return datetime.datetime.strptime(date, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError('{name} parameter must be a date in YYYY-MM-DD format.'.format(name=name))
+
+
+def _json(r):
+    # Bodies in UTF-8, the encoding of nearly every response, are handed to the decoder as bytes, which orjson decodes
+    # fastest. Decode errors are raised as requests' JSONDecodeError, as r.json() does, so callers catching
+    # requests.RequestException keep catching them.
+    with phase('decode'):
+        content = r.content
+        encoding = _text_encoding(r)
+
+        try:
+            if encoding is not None:
+                content = str(content, encoding, errors='replace')
+
+            return jsonlib.loads(content)
+        except ValueError as e:
+            raise requests.exceptions.JSONDecodeError(getattr(e, 'msg', str(e)), getattr(e, 'doc', ''),
+                                                      getattr(e, 'pos', 0))
+
+
+def _text_encoding(r):
+    # The encoding the body must be decoded from before decoding the JSON, or None if it is UTF-8 or unknown. Like
+    # r.json(), the encoding is guessed from the body if the headers do not give one.
+    encoding = r.encoding or requests.utils.guess_json_utf(r.content)
+
+    if encoding is None:
+        return None
+
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return None
+
+    return None if name == 'utf-8' else name
+
+
+def _data_frame(data, columns=None):
+    # pandas takes longer to import than the rest of the package combined, so it is only imported when a result is
+    # returned as a DataFrame.
+    try:
+        from pandas import DataFrame
+    except ImportError:
+        raise ImportError('the pandas library is required to return results as a DataFrame (return_df=True). It can '
+                          'be installed with "pip install pandas".')
+
+    with phase('dataframe'):
+        return DataFrame(data, columns=columns)
+
+
+# Nested lists of records flattened into one row per record, the fields of DONKI events parsed as numbers and those
+# stored as categoricals. Fields whose name ends with 'Time', and time21_5, are parsed as times. Only one list of
+# records per event is spread over rows, since exploding several would pair every element of one list with every
+# element of the others; other lists, such as impactList, stay nested.
+_DONKI_RECORDS = ('allKpIndex', 'cmeInputs')
+
+_DONKI_NUMERIC = ('speed', 'halfAngle', 'latitude', 'longitude', 'kpIndex', 'au', 'activeRegionNum', 'levelOfData',
+                  'estimatedDuration', 'rmin_re', 'kp_18', 'kp_90', 'kp_135', 'kp_180')
+
+_DONKI_CATEGORICAL = ('catalog', 'type', 'source', 'location', 'instruments')
+
+
+def _donki_data_frame(events):
+    df = _data_frame(events or [])
+
+    import pandas
+
+    with phase('dataframe'):
+        for field in _DONKI_RECORDS:
+            if field in df.columns:
+                df = df.explode(field).reset_index(drop=True)
+
+                records = df[field].dropna()
+                flat = pandas.json_normalize(records.tolist())
+                flat.index = records.index
+                flat.columns = [field + '.' + column for column in flat.columns]
+
+                df = df.drop(columns=field).join(flat)
+                break
+
+        if 'instruments' in df.columns:
+            names = df['instruments'].explode().dropna().str.get('displayName').dropna()
+            df['instruments'] = names.groupby(level=0).agg(', '.join).reindex(df.index)
+
+        if 'linkedEvents' in df.columns:
+            ids = df['linkedEvents'].explode().dropna().str.get('activityID').dropna()
+            ids = ids.groupby(level=0).agg(list).reindex(df.index).astype(object)
+            df['linkedEvents'] = ids.where(ids.notna(), None)
+
+        for column in df.columns:
+            name = column.rsplit('.', 1)[-1]
+
+            if name.endswith('Time') or name == 'time21_5':
+                df[column] = _donki_times(pandas, column, df[column])
+            elif name in _DONKI_NUMERIC:
+                df[column] = pandas.to_numeric(df[column], errors='coerce')
+            elif name in _DONKI_CATEGORICAL:
+                df[column] = df[column].astype('category')
+
+    return df
+
+
+def _donki_times(pandas, column, values):
+    # Parsing with DONKI's usual format is vectorized; the few times in another format are parsed one by one, and a
+    # time that cannot be parsed at all is an error rather than a missing value.
+    times = pandas.to_datetime(values, format='%Y-%m-%dT%H:%MZ', utc=True, errors='coerce')
+    other = times.isna() & values.notna()
+
+    if other.any():
+        parsed = []
+
+        for value in values[other]:
+            try:
+                parsed.append(pandas.to_datetime(value, utc=True))
+            except (TypeError, ValueError):
+                raise ValueError('could not parse {0} value {1!r} as a time.'.format(column, value))
+
+        times[other] = parsed
+
+    return times
+
+
+def _module_endpoints():
+    return {f.__name__: f for f in (close_approach, exoplanets, fireballs, media_asset_captions, media_asset_manifest,
+                                    media_asset_metadata, media_search, mission_design, nhats, scout, sentry, tle)}
 
 
 def _check_dates(start_date=None, end_date=None):
@@ -2943,12 +3734,53 @@ def _check_dates(start_date=None, end_date=None):
     return start_date, end_date
 
 
-def _return_api_result(url, params):
-    r = requests.get(url,
-                     params=params)
+def _stream_api_result(url, params, chunksize, key=None, return_df=False, client=None):
+    if not isinstance(chunksize, int):
+        raise TypeError('chunksize parameter must be an integer (if specified).')
 
-    if r.status_code != 200:
-        raise requests.exceptions.HTTPError(r.reason, r.url)
+    if chunksize < 1:
+        raise ValueError('chunksize parameter must be greater than 0.')
 
-    else:
-        return r.json()
+    if client is None:
+        client = default_client()
+
+    if not isinstance(client, Client):
+        raise TypeError('chunksize parameter is only supported by the synchronous Client.')
+
+    def _batches():
+        with client.stream(url, params=params) as r:
+            if r.status_code != 200:
+                raise requests.exceptions.HTTPError(r.reason, r.url)
+
+            # JPL SSD responses list the column names in a 'fields' member preceding the 'data' rows.
+            header = {}
+
+            for rows in batched(iter_json_array(r.iter_content(65536), key=key, header=header), chunksize):
+                if return_df:
+                    rows = _data_frame(rows, columns=header.get('fields'))
+
+                yield rows
+
+    return _batches()
+
+
+def _return_api_result(url, params, client=None, callback=None):
+    if client is None:
+        client = default_client()
+
+    def _result(r):
+        if r.status_code != 200:
+            raise requests.exceptions.HTTPError(r.reason, r.url)
+
+        r = _json(r)
+
+        if callback is not None:
+            r = callback(r)
+
+        return r
+
+    r = client.get(url,
+                   params=params,
+                   callback=_result)
+
+    return r
@@ -0,0 +1,234 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from nasapy.deadline import DeadlineExceeded, _check_deadline, _expiry, _until
+
+
+def run_batch(calls, max_workers=10, return_exceptions=True, deadline=None):
+    r"""
+    Runs a list of calls on a bounded thread pool and returns their results in the order given.
+
+    Parameters
+    ----------
+    calls : list
+        List of (function, kwargs) tuples. Each function is called with its keyword arguments.
+    max_workers : int, default 10
+        The maximum number of calls running at once.
+    return_exceptions : bool, default True
+        If True (default), an exception raised by a call is returned in place of its result. If False, the first
+        exception raised (in input order) is re-raised once all calls have finished.
+    deadline : int, float, default None
+        Number of seconds the batch must finish within. Calls still waiting for a worker when the deadline passes are
+        cancelled, and calls in flight run under the deadline (see :func:`~nasapy.deadline.deadline`); both fail with
+        a :class:`~nasapy.deadline.DeadlineExceeded` exception. If None, the batch only runs under the deadline it is
+        called under, if any.
+
+    Raises
+    ------
+    ValueError
+        Raised if :code:`max_workers` is less than 1.
+    TypeError
+        Raised if :code:`return_exceptions` is not boolean (True or False).
+    TypeError
+        Raised if :code:`deadline` is not a number.
+    ValueError
+        Raised if :code:`deadline` is not positive.
+
+    Returns
+    -------
+    list
+        The result, or raised exception, of each call in the same order as :code:`calls`.
+
+    """
+    max_workers, return_exceptions = _check_batch_params(max_workers, return_exceptions, deadline)
+
+    if len(calls) == 0:
+        return []
+
+    expires = _expiry(deadline)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+        futures = [executor.submit(_call_until, expires, func, kwargs) for func, kwargs in calls]
+
+        if expires is not None:
+            _, pending = wait(futures, timeout=max(expires - time.monotonic(), 0))
+
+            # Calls that have not started are dropped; those in flight give up on their own once the deadline passes.
+            for future in pending:
+                future.cancel()
+
+    results = []
+
+    for future in futures:
+        if future.cancelled():
+            exception = DeadlineExceeded('the batch deadline passed before the call started.')
+        else:
+            exception = future.exception()
+
+        if exception is not None:
+            if not return_exceptions:
+                raise exception
+
+            results.append(exception)
+
+        else:
+            results.append(future.result())
+
+    return results
+
+
+async def run_batch_async(calls, max_concurrency=10, return_exceptions=True, deadline=None):
+    r"""
+    Runs a list of coroutine functions on the running event loop with bounded concurrency and returns their results in
+    the order given.
+
+    Parameters
+    ----------
+    calls : list
+        List of (function, kwargs) tuples. Each function is called with its keyword arguments and the returned
+        awaitable is awaited.
+    max_concurrency : int, default 10
+        The maximum number of calls awaiting at once.
+    return_exceptions : bool, default True
+        If True (default), an exception raised by a call is returned in place of its result. If False, the first
+        exception raised is re-raised.
+    deadline : int, float, default None
+        Number of seconds the batch must finish within. Calls still awaiting when the deadline passes are cancelled
+        and fail with a :class:`~nasapy.deadline.DeadlineExceeded` exception. If None, the batch only runs under the
+        deadline it is awaited under, if any.
+
+    Raises
+    ------
+    ValueError
+        Raised if :code:`max_concurrency` is less than 1.
+    TypeError
+        Raised if :code:`return_exceptions` is not boolean (True or False).
+    TypeError
+        Raised if :code:`deadline` is not a number.
+    ValueError
+        Raised if :code:`deadline` is not positive.
+
+    Returns
+    -------
+    list
+        The result, or raised exception, of each call in the same order as :code:`calls`.
+
+    """
+    import asyncio
+
+    max_concurrency, return_exceptions = _check_batch_params(max_concurrency, return_exceptions, deadline)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    expires = _expiry(deadline)
+
+    async def _call(func, kwargs):
+        async with semaphore:
+            r = func(**kwargs)
+
+            if inspect.isawaitable(r):
+                r = await r
+
+            return r
+
+    async def _call_until(func, kwargs):
+        if expires is None:
+            return await _call(func, kwargs)
+
+        with _until(expires):
+            try:
+                return await asyncio.wait_for(_call(func, kwargs), timeout=max(expires - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded('the batch deadline passed before the call finished.')
+
+    return await asyncio.gather(*[_call_until(func, kwargs) for func, kwargs in calls],
+                                return_exceptions=return_exceptions)
+
+
+def resolve_jobs(jobs, namespace, client=None):
+    r"""
+    Converts a list of (endpoint, kwargs) jobs into the (function, kwargs) calls run by :func:`run_batch` and
+    :func:`run_batch_async`.
+
+    Parameters
+    ----------
+    jobs : list
+        List of (endpoint, kwargs) tuples. The endpoint is either the name of a function in :code:`namespace` or a
+        callable.
+    namespace : dict
+        Mapping of endpoint names to the functions that can be referenced by name.
+    client : Client, AsyncClient, default None
+        If given, the client is passed to every function accepting a :code:`client` parameter that was not given
+        one in its kwargs.
+
+    Raises
+    ------
+    TypeError
+        Raised if a job is not an (endpoint, kwargs) tuple.
+    ValueError
+        Raised if an endpoint name is not found in :code:`namespace`.
+
+    Returns
+    -------
+    list
+        List of (function, kwargs) tuples.
+
+    """
+    calls = []
+
+    for job in jobs:
+        if not isinstance(job, (tuple, list)) or len(job) != 2:
+            raise TypeError('each job must be an (endpoint, kwargs) tuple.')
+
+        endpoint, kwargs = job
+        kwargs = dict(kwargs) if kwargs is not None else {}
+
+        if isinstance(endpoint, str):
+            if endpoint not in namespace:
+                raise ValueError('endpoint must be one of {endpoints}, not {endpoint}.'
+                                 .format(endpoints=sorted(namespace), endpoint=repr(endpoint)))
+
+            endpoint = namespace[endpoint]
+
+        elif not callable(endpoint):
+            raise TypeError('endpoint must be a string or a callable.')
+
+        if client is not None and 'client' not in kwargs and _accepts_client(endpoint):
+            kwargs['client'] = client
+
+        calls.append((endpoint, kwargs))
+
+    return calls
+
+
+def _call_until(expires, func, kwargs):
+    # Worker threads do not inherit the caller's context, so the batch deadline is set again in each of them.
+    with _until(expires):
+        return func(**kwargs)
+
+
+def _accepts_client(func):
+    try:
+        return 'client' in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _check_batch_params(max_workers, return_exceptions, deadline=None):
+    if max_workers < 1:
+        raise ValueError('the maximum number of workers must be at least 1.')
+
+    if not isinstance(return_exceptions, bool):
+        raise TypeError('return_exceptions parameter must be boolean (True or False).')
+
+    if deadline is not None:
+        _check_deadline(deadline)
+
+    return max_workers, return_exceptions
@@ -0,0 +1,532 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class ResponseCache(object):
+    r"""
+    In-memory cache of successful responses with per-endpoint expiry and least recently used (LRU) eviction.
+
+    Responses are keyed on the request URL and its query parameters. Parameters with a value of None and the
+    :code:`api_key` parameter are dropped, dates are written in YYYY-MM-DD format and the remaining parameters are
+    sorted, so calls asking for the same data share an entry regardless of the order the parameters were given in or
+    the key they were sent with. Only responses with a 200 status are cached.
+
+    Expired responses are kept until they are evicted. If an expired response has an :code:`ETag` or
+    :code:`Last-Modified` header, the client revalidates it by sending the request with an :code:`If-None-Match` or
+    :code:`If-Modified-Since` header; a 304 (Not Modified) reply renews the cached response instead of downloading it
+    again.
+
+    Parameters
+    ----------
+    maxsize : int, default 256
+        The maximum number of responses kept. Once full, the least recently used response is evicted.
+    ttl : int, float, default 300
+        Number of seconds a response is kept before it expires.
+    ttls : dict, default None
+        Mapping of URL paths to the number of seconds responses from that path are kept, overriding :code:`ttl`. A
+        path matches every URL starting with it (for example, '/DONKI/' matches every DONKI endpoint); the longest
+        matching path is used. A TTL of 0 disables caching for the path.
+
+    Raises
+    ------
+    ValueError
+        Raised if :code:`maxsize` is less than 1 or a TTL is negative.
+
+    Methods
+    -------
+    get
+        Returns the cached response for a request, or None if there is no unexpired response.
+    lookup
+        Returns the cached response for a request, expired or not, and whether it is unexpired.
+    set
+        Stores the response to a request.
+    revalidate
+        Renews an expired response after the server replied that it has not been modified.
+    ttl_for
+        Returns the number of seconds responses from a URL are kept.
+    clear
+        Removes every cached response.
+
+    Examples
+    --------
+    # Keep Sentry and close approach data for ten minutes and the picture of the day for an hour.
+    >>> cache = ResponseCache(ttl=600, ttls={'/planetary/apod': 3600})
+    >>> client = Client(cache=cache)
+    >>> sentry(client=client)
+    >>> Nasa(key=key, client=client).picture_of_the_day()
+
+    Notes
+    -----
+    The cache is thread-safe and can be shared by several clients.
+
+    """
+    def __init__(self, maxsize=256, ttl=300, ttls=None):
+
+        if maxsize < 1:
+            raise ValueError('maxsize parameter must be at least 1.')
+
+        ttls = dict(ttls) if ttls is not None else {}
+
+        if ttl < 0 or any(value < 0 for value in ttls.values()):
+            raise ValueError('ttl and ttls parameters must not be negative.')
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = ttls
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, url, params=None):
+        r"""
+        Returns the cached response for a request.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        params : dict, default None
+            The query string parameters of the request.
+
+        Returns
+        -------
+        requests.Response or None
+            A copy of the cached response, or None if no unexpired response is cached.
+
+        """
+        r, fresh = self.lookup(url, params)
+
+        if not fresh:
+            return None
+
+        return r
+
+    def lookup(self, url, params=None):
+        r"""
+        Returns the cached response for a request, including expired responses that have not been evicted yet.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        params : dict, default None
+            The query string parameters of the request.
+
+        Returns
+        -------
+        tuple
+            A copy of the cached response, or None if no response is cached, and True if the response has not
+            expired.
+
+        """
+        entry = self._load(cache_key(url, params))
+
+        if entry is None:
+            return None, False
+
+        expires, content = entry
+
+        return _build_response(**content), expires > time.time()
+
+    def set(self, url, params, response):
+        r"""
+        Stores the response to a request. Responses without a 200 status, and responses from URLs with a TTL of 0, are
+        not stored.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        params : dict
+            The query string parameters of the request.
+        response : requests.Response
+            The response to store.
+
+        """
+        ttl = self.ttl_for(url)
+
+        if response.status_code != 200 or ttl <= 0:
+            return
+
+        self._store(cache_key(url, params), time.time() + ttl, _response_content(response))
+
+    def revalidate(self, url, params, cached, response):
+        r"""
+        Renews an expired response after the server replied to a conditional request with a 304 (Not Modified)
+        status. The headers of the 304 response, such as a new :code:`ETag` or the rate limit headers, replace those
+        of the cached response.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request.
+        params : dict
+            The query string parameters of the request.
+        cached : requests.Response
+            The expired response returned by :meth:`lookup`.
+        response : requests.Response
+            The 304 response.
+
+        Returns
+        -------
+        requests.Response
+            The renewed response, with a 200 status and the cached body.
+
+        """
+        content = _response_content(cached)
+
+        headers = CaseInsensitiveDict(content['headers'])
+        headers.update((name, value) for name, value in response.headers.items()
+                       if name.lower() not in ('content-length', 'content-encoding', 'transfer-encoding'))
+
+        content['headers'] = dict(headers)
+
+        ttl = self.ttl_for(url)
+
+        if ttl > 0:
+            self._store(cache_key(url, params), time.time() + ttl, content)
+
+        return _build_response(**content)
+
+    def ttl_for(self, url):
+        r"""
+        Returns the number of seconds responses from a URL are kept.
+
+        Parameters
+        ----------
+        url : str
+            The URL.
+
+        Returns
+        -------
+        int or float
+            The TTL of the longest path in :code:`ttls` the URL's path starts with, or :code:`ttl` if none match.
+
+        """
+        path = urlsplit(url).path
+        matches = [prefix for prefix in self.ttls if path.startswith(prefix)]
+
+        if not matches:
+            return self.ttl
+
+        return self.ttls[max(matches, key=len)]
+
+    def clear(self):
+        r"""
+        Removes every cached response.
+
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def _store(self, key, expires, content):
+        with self._lock:
+            self._entries[key] = (expires, content)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class SQLiteCache(ResponseCache):
+    r"""
+    Response cache stored in an SQLite database on disk, so cached responses survive restarts and are shared by every
+    process on a machine using the same file.
+
+    Responses are keyed, expire and are evicted the same way as :class:`ResponseCache`. The database is opened in
+    write-ahead logging (WAL) mode, which lets any number of processes read the cache while another writes to it. The
+    :code:`api_key` parameter is removed from the URLs stored with the responses, so the database holds no API keys.
+
+    Parameters
+    ----------
+    path : str
+        Path of the database file. It is created, along with its tables, if it does not exist.
+    maxsize : int, default 10000
+        The maximum number of responses kept. Once full, the least recently used responses are evicted.
+    ttl : int, float, default 300
+        Number of seconds a response is kept before it expires.
+    ttls : dict, default None
+        Mapping of URL paths to the number of seconds responses from that path are kept, overriding :code:`ttl`. The
+        longest matching path is used. A TTL of 0 disables caching for the path.
+    timeout : int, float, default 30
+        Number of seconds to wait for another process writing to the database before giving up.
+    touch_interval : int, float, default 60
+        Number of seconds between two updates of the time a response was last used. Reading a response only writes to
+        the database if it was last marked as used longer ago than this, so readers do not queue behind each other for
+        the write lock; the least recently used order is only kept to within this interval. 0 updates it on every read.
+    max_stale : int, float, default 86400
+        Number of seconds an expired response is kept for revalidation. Responses that expired longer ago are deleted
+        when the cache is opened and whenever a response is stored, so a cache that never fills up does not keep them
+        forever.
+
+    Raises
+    ------
+    ValueError
+        Raised if :code:`maxsize` is less than 1 or a TTL, :code:`touch_interval` or :code:`max_stale` is negative.
+
+    Methods
+    -------
+    close
+        Closes the connections to the database opened by every thread.
+
+    Examples
+    --------
+    # Share a cache of DONKI and close approach data between worker processes.
+    >>> with SQLiteCache('/var/cache/nasapy.sqlite', ttls={'/DONKI/': 3600}) as cache:
+    ...     close_approach(client=Client(cache=cache))
+
+    Notes
+    -----
+    Each thread and process opens its own connection to the database, so a single :code:`SQLiteCache` can be shared by
+    several threads and used after forking. The connections are closed by :meth:`close`, or when the cache is used as
+    a context manager, and reopened if the cache is used again. The database should be kept on a local disk, as
+    SQLite's locking is not reliable on network file systems.
+
+    """
+    def __init__(self, path, maxsize=10000, ttl=300, ttls=None, timeout=30, touch_interval=60, max_stale=86400):
+        super(SQLiteCache, self).__init__(maxsize=maxsize, ttl=ttl, ttls=ttls)
+
+        if touch_interval < 0 or max_stale < 0:
+            raise ValueError('touch_interval and max_stale parameters must not be negative.')
+
+        self.path = path
+        self.timeout = timeout
+        self.touch_interval = touch_interval
+        self.max_stale = max_stale
+        self._db = _ThreadConnections(path, timeout, pragmas=('journal_mode=WAL', 'synchronous=NORMAL'))
+
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires REAL, accessed REAL, '
+                         'url TEXT, status_code INTEGER, reason TEXT, headers TEXT, content BLOB)')
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+            conn.execute('CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)')
+            conn.execute('DELETE FROM responses WHERE expires < ?', (time.time() - max_stale,))
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def clear(self):
+        r"""
+        Removes every cached response.
+
+        """
+        with self._connect() as conn:
+            conn.execute('DELETE FROM responses')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        r"""
+        Closes the connections to the database opened by every thread. The cache can still be used afterwards; each
+        thread then opens a new connection.
+
+        """
+        self._db.close()
+
+    def _connect(self):
+        return self._db.connect()
+
+    def _load(self, key):
+        key = json.dumps(key)
+        conn = self._connect()
+
+        row = conn.execute('SELECT expires, accessed, url, status_code, reason, headers, content FROM responses '
+                           'WHERE key = ?', (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        expires, accessed, url, status_code, reason, headers, content = row
+        now = time.time()
+
+        if now - accessed >= self.touch_interval:
+            with conn:
+                conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+
+        return expires, {
+            'url': url,
+            'status_code': status_code,
+            'reason': reason,
+            'headers': json.loads(headers),
+            'content': bytes(content)
+        }
+
+    def _store(self, key, expires, content):
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                         (json.dumps(key), expires, time.time(), content['url'], content['status_code'],
+                          content['reason'], json.dumps(content['headers']), sqlite3.Binary(content['content'])))
+            conn.execute('DELETE FROM responses WHERE expires < ?', (time.time() - self.max_stale,))
+            conn.execute('DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed DESC '
+                         'LIMIT -1 OFFSET ?)', (self.maxsize,))
+
+
+class _ThreadConnections(object):
+    # sqlite3 connections cannot be carried across a fork, so a connection is opened for each thread of each process.
+    # Each is only used by the thread that opened it, but may be closed by another through close().
+
+    def __init__(self, path, timeout, pragmas=('journal_mode=WAL',)):
+        self.path = path
+        self.timeout = timeout
+        self.pragmas = pragmas
+        self.connections = []
+        self._generation = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def connect(self):
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is None or self._local.pid != os.getpid() or self._local.generation != self._generation:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+
+            for pragma in self.pragmas:
+                conn.execute('PRAGMA ' + pragma)
+
+            with self._lock:
+                self.connections.append(conn)
+                self._local.generation = self._generation
+
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+
+        return conn
+
+    def close(self):
+        with self._lock:
+            connections, self.connections = self.connections, []
+            self._generation += 1
+
+        for conn in connections:
+            conn.close()
+
+
+def cache_key(url, params=None):
+    r"""
+    Returns the canonical key identifying a request in a :class:`ResponseCache`.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the request.
+    params : dict, default None
+        The query string parameters of the request.
+
+    Returns
+    -------
+    tuple
+        The URL followed by the sorted (name, value) pairs of the parameters, with parameters set to None and the
+        :code:`api_key` parameter removed and all values converted to strings.
+
+    """
+    if params is None:
+        return (url,)
+
+    items = []
+
+    for name, value in params.items():
+        if value is None or name == 'api_key':
+            continue
+
+        if isinstance(value, datetime.datetime):
+            value = value.strftime('%Y-%m-%d')
+        elif isinstance(value, datetime.date):
+            value = value.isoformat()
+
+        items.append((name, str(value)))
+
+    return (url,) + tuple(sorted(items))
+
+
+def conditional_headers(cached):
+    r"""
+    Returns the headers revalidating a cached response with a conditional request.
+
+    Parameters
+    ----------
+    cached : requests.Response or None
+        The cached response.
+
+    Returns
+    -------
+    dict or None
+        :code:`If-None-Match` and :code:`If-Modified-Since` headers built from the :code:`ETag` and
+        :code:`Last-Modified` headers of the response, or None if there is no response or it has neither header.
+
+    """
+    if cached is None:
+        return None
+
+    headers = {}
+
+    if 'ETag' in cached.headers:
+        headers['If-None-Match'] = cached.headers['ETag']
+
+    if 'Last-Modified' in cached.headers:
+        headers['If-Modified-Since'] = cached.headers['Last-Modified']
+
+    return headers or None
+
+
+def _response_content(r):
+    return {
+        'url': _drop_api_key(r.url),
+        'status_code': r.status_code,
+        'reason': r.reason,
+        'headers': dict(r.headers),
+        'content': r.content
+    }
+
+
+def _build_response(url, status_code, reason, headers, content):
+    r = requests.Response()
+
+    r.url = url
+    r.status_code = status_code
+    r.reason = reason
+    r.headers = CaseInsensitiveDict(headers)
+    r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+    r._content = content
+
+    return r
+
+
+def _drop_api_key(url):
+    # Responses are shared regardless of the key they were requested with, so the key is not kept with them. The
+    # other parameters are left exactly as sent.
+    scheme, netloc, path, query, fragment = urlsplit(url)
+    query = '&'.join(p for p in query.split('&') if p and p.split('=', 1)[0] != 'api_key')
+
+    return urlunsplit((scheme, netloc, path, query, fragment))
@@ -0,0 +1,972 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import functools
+import inspect
+import itertools
+import threading
+import time
+import weakref
+
+import requests
+
+from nasapy.cache import ResponseCache, _build_response, cache_key, conditional_headers
+from nasapy.deadline import _bound_timeout, _check_wait, time_remaining
+from nasapy.instrument import CallEvent, TimedHTTPAdapter, _aiohttp_trace_config, _emit, _mask_key, _recording
+from nasapy.ratelimit import KeyPool, RateLimiter, _header_int, default_rate_limiter
+from nasapy.retry import RetryPolicy
+from nasapy.singleflight import AsyncSingleFlight, SingleFlight
+
+
+DEFAULT_TIMEOUT = (10, 120)
+
+
+class Client(object):
+    r"""
+    HTTP client holding the pooled, keep-alive connections used to send requests to the NASA APIs.
+
+    Parameters
+    ----------
+    pool_connections : int, default 10
+        The number of per-host connection pools to keep. Each API host (api.nasa.gov, ssd-api.jpl.nasa.gov, etc.)
+        receives its own pool.
+    pool_maxsize : int, default 10
+        The maximum number of connections kept alive in each host's pool. Should be at least the number of threads
+        sending requests concurrently through the client.
+    keep_alive : bool, default True
+        If True (default), connections are kept open and reused between requests. If False, a
+        :code:`Connection: close` header is sent and a new connection is made for every request.
+    timeout : float, tuple, default DEFAULT_TIMEOUT
+        Number of seconds to wait for the server before giving up, or a tuple of (connect, read) timeouts. The default
+        waits 10 seconds to connect and 120 seconds for each read, so a hung connection cannot block a call forever.
+        If None, requests wait indefinitely. Calls made under a :func:`~nasapy.deadline.deadline` wait no longer than
+        the time left before the deadline.
+    session : requests.Session, default None
+        An existing session to send requests with. If None, a new session is created.
+    throttle : bool, RateLimiter, default False
+        If True, requests sent with an API key are paced by the process-wide :class:`~nasapy.ratelimit.RateLimiter`
+        returned by :func:`~nasapy.ratelimit.default_rate_limiter` so the key's hourly limit is not exceeded, which
+        suits long batches of calls. A :class:`~nasapy.ratelimit.RateLimiter` can be given to use a separate throttle.
+        If False (default), requests are not throttled. The time spent waiting for the throttle is reported in the
+        'throttle' phase of each call's :class:`~nasapy.instrument.CallEvent`.
+    retry : bool, RetryPolicy, default True
+        If True (default), requests failing with a connection error, a timeout, or a 429 or 5xx status are retried
+        with the default :class:`~nasapy.retry.RetryPolicy`. A :class:`~nasapy.retry.RetryPolicy` can be given to
+        change the number of attempts and the backoff between them. If False, failed requests are not retried.
+    cache : bool, ResponseCache, default False
+        If True, successful responses are kept in a new :class:`~nasapy.cache.ResponseCache` with default settings
+        and repeated requests are answered from it without contacting the server. A
+        :class:`~nasapy.cache.ResponseCache` can be given to set the expiry and size of the cache, or to share it
+        between clients, and a :class:`~nasapy.cache.SQLiteCache` to keep responses on disk and share them between
+        processes. If False (default), responses are not cached.
+    coalesce : bool, default True
+        If True (default), identical requests (the same URL, parameters and API key) sent at the same time share a
+        single request to the server, and every caller receives a copy of its response.
+    transport : requests.adapters.BaseAdapter, default None
+        The transport adapter sending the requests in place of the pooled HTTP connections, such as a
+        :class:`~nasapy.transport.RecordTransport` or :class:`~nasapy.transport.ReplayTransport`. If None, requests
+        are sent over the network.
+    hooks : list, default None
+        Functions called with a :class:`~nasapy.instrument.CallEvent` after every call made through the client,
+        reporting the endpoint, parameters, status, size, retries, cache use and the time spent in each phase of the
+        call. Hooks are called in the thread making the call, and should return quickly.
+
+    Raises
+    ------
+    TypeError
+        Raised if :code:`keep_alive` is not boolean (True or False).
+    TypeError
+        Raised if :code:`throttle` is not boolean (True or False) or a :class:`~nasapy.ratelimit.RateLimiter`.
+    TypeError
+        Raised if :code:`retry` is not boolean (True or False) or a :class:`~nasapy.retry.RetryPolicy`.
+    TypeError
+        Raised if :code:`cache` is not boolean (True or False) or a :class:`~nasapy.cache.ResponseCache`.
+    TypeError
+        Raised if :code:`coalesce` is not boolean (True or False).
+    TypeError
+        Raised if :code:`hooks` is not a list of callables.
+    ValueError
+        Raised if :code:`pool_connections` or :code:`pool_maxsize` is less than 1.
+
+    Attributes
+    ----------
+    session : requests.Session
+        The underlying session holding the connection pools.
+    transport : requests.adapters.BaseAdapter, None
+        The transport sending the requests, or None if requests are sent over the network.
+    timeout : float, tuple, None
+        The timeout applied to every request.
+    throttle : RateLimiter, None
+        The rate limiter pacing requests sent with an API key, or None if requests are not throttled.
+    retry : RetryPolicy, None
+        The policy used to retry failed requests, or None if requests are not retried.
+    cache : ResponseCache, None
+        The cache responses are kept in, or None if responses are not cached.
+    coalesce : bool
+        Whether identical requests sent at the same time share a single request to the server.
+    hooks : list
+        The functions called after every call. Hooks can be added to or removed from the list at any time.
+
+    Methods
+    -------
+    get
+        Sends a GET request and returns the response.
+    stream
+        Sends a GET request and returns the response without reading its body.
+    close
+        Closes the client's session and all pooled connections.
+
+    Examples
+    --------
+    # Share a single client (and its connection pools) between the Nasa class and the module-level functions.
+    >>> client = Client(pool_maxsize=20, timeout=(3.05, 30))
+    >>> n = Nasa(key=key, client=client)
+    >>> close_approach(des=433, client=client)
+    # Print where the time of each call goes.
+    >>> client = Client(hooks=[lambda event: print(event.endpoint, event.status_code, event.phases)])
+
+    Notes
+    -----
+    A client is thread-safe and meant to be shared: every thread sending requests through it draws connections from
+    the same pools and shares its throttle, cache and coalescing. Each thread holds a connection only while its request
+    is in flight, so :code:`pool_maxsize` bounds the connections kept alive rather than the number of threads; threads
+    over the limit open a connection that is closed once their response is read.
+
+    """
+    def __init__(self, pool_connections=10, pool_maxsize=10, keep_alive=True, timeout=DEFAULT_TIMEOUT, session=None,
+                 throttle=False, retry=True, cache=False, coalesce=True, transport=None, hooks=None):
+
+        if not isinstance(keep_alive, bool):
+            raise TypeError('keep_alive parameter must be boolean (True or False).')
+
+        if not isinstance(coalesce, bool):
+            raise TypeError('coalesce parameter must be boolean (True or False).')
+
+        if pool_connections < 1 or pool_maxsize < 1:
+            raise ValueError('pool_connections and pool_maxsize parameters must be at least 1.')
+
+        if session is None:
+            session = requests.Session()
+
+            adapter = TimedHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+
+        if transport is not None:
+            session.mount('https://', transport)
+            session.mount('http://', transport)
+
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+
+        self.session = session
+        self.transport = transport
+        self.timeout = timeout
+        self.throttle = _check_throttle(throttle)
+        self.retry = _check_retry(retry)
+        self.cache = _check_cache(cache)
+        self.coalesce = coalesce
+        self.hooks = _check_hooks(hooks)
+        self._flights = SingleFlight()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get(self, url, params=None, callback=None, timeout=None):
+        r"""
+        Sends a GET request using the client's pooled connections. If the request is sent with an API key
+        (an :code:`api_key` parameter) and the client is throttled, the call blocks until the key's rate limiter
+        allows the request to be sent. Requests failing with an error retried by the client's
+        :class:`~nasapy.retry.RetryPolicy` are sent again after the policy's backoff; the last response is returned
+        (or the last connection error raised) once the attempts run out. If the client has a cache holding an
+        unexpired response to the same request, the cached response is returned without sending a request. An expired
+        cached response with an :code:`ETag` or :code:`Last-Modified` header is revalidated with a conditional request
+        and reused if the server replies with a 304 (Not Modified) status. If the client coalesces requests and an
+        identical request is already in flight from another thread, its response is waited for instead of sending a
+        new request.
+
+        Parameters
+        ----------
+        url : str
+            The URL to request.
+        params : dict, default None
+            Query string parameters. Parameters with a value of None are not sent.
+        callback : callable, default None
+            Function called with the response. If given, the value returned by the callback is returned instead of
+            the response.
+        timeout : float, tuple, default None
+            The timeout of this call's requests, replacing the client's :code:`timeout`.
+
+        Returns
+        -------
+        requests.Response or object
+            The response returned by the server, or the value returned by :code:`callback` if specified.
+
+        """
+        if not self.hooks:
+            return self._get(url, params, callback, None, timeout)
+
+        event = CallEvent(url, params)
+        start = time.perf_counter()
+
+        try:
+            with _recording(event):
+                return self._get(url, params, callback, event, timeout)
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            _emit(self.hooks, event, start)
+
+    def stream(self, url, params=None, timeout=None):
+        r"""
+        Sends a GET request and returns the response as soon as its headers are received, leaving the body to be read
+        incrementally. Requests are throttled and retried the same way as :meth:`get`, but the response is neither
+        cached nor shared with identical requests.
+
+        Parameters
+        ----------
+        url : str
+            The URL to request.
+        params : dict, default None
+            Query string parameters. Parameters with a value of None are not sent.
+        timeout : float, tuple, default None
+            The timeout of this call's requests, replacing the client's :code:`timeout`.
+
+        Returns
+        -------
+        requests.Response
+            The response, with its body unread. The response should be closed once read, for example by using it in a
+            :code:`with` statement, to return its connection to the pool.
+
+        """
+        if not self.hooks:
+            return self._send(url, params, stream=True, timeout=timeout)
+
+        event = CallEvent(url, params)
+        start = time.perf_counter()
+
+        try:
+            with _recording(event):
+                r = self._send(url, params, stream=True, event=event, timeout=timeout)
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            _emit(self.hooks, event, start)
+
+        return r
+
+    def close(self):
+        r"""
+        Closes the client's session and all pooled connections.
+
+        """
+        self.session.close()
+
+    def _get(self, url, params, callback, event, timeout=None):
+        cached, fresh, shared = None, False, False
+
+        if self.cache is not None:
+            cached, fresh = self.cache.lookup(url, params)
+
+        if fresh:
+            r = cached
+        elif self.coalesce:
+            r, shared = self._flights.do(_flight_key(url, params),
+                                         lambda: self._fetch(url, params, cached, event, timeout))
+
+            if shared:
+                r = _copy_response(r)
+        else:
+            r = self._fetch(url, params, cached, event, timeout)
+
+        if event is not None:
+            _record_response(event, r, self.cache, fresh, shared)
+
+        if callback is not None:
+            r = callback(r)
+
+        return r
+
+    def _fetch(self, url, params, cached, event=None, timeout=None):
+        r = self._send(url, params, headers=conditional_headers(cached), event=event, timeout=timeout)
+
+        if self.cache is not None:
+            if r.status_code == 304 and cached is not None:
+                sequence = response_sequence(r)
+                r = self.cache.revalidate(url, params, cached, r)
+                r.nasapy_sequence = sequence
+
+                if event is not None:
+                    event.cache = 'revalidated'
+            else:
+                self.cache.set(url, params, r)
+
+        return r
+
+    def _send(self, url, params, headers=None, stream=False, event=None, timeout=None):
+        key = _api_key(params)
+        pool = key if isinstance(key, KeyPool) else None
+        attempt, rejected = 0, []
+
+        while True:
+            attempt += 1
+
+            if pool is not None:
+                key = pool.acquire(exclude=rejected)
+                params = dict(params, api_key=key)
+
+                if event is not None:
+                    event.key = _mask_key(key)
+
+            if key is not None and self.throttle is not None:
+                delay = self.throttle.reserve(key)
+
+                if delay > 0:
+                    _sleep(delay, event, 'throttle')
+
+            request_timeout = _bound_timeout(self.timeout if timeout is None else timeout)
+
+            if event is not None:
+                event.attempts = attempt
+                connect = event.phases['connect']
+                start = time.perf_counter()
+
+            try:
+                r = self.session.get(url, params=params, headers=headers, timeout=request_timeout, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                _release(self.throttle, pool, key)
+
+                if not _can_retry(self.retry, attempt - len(rejected)):
+                    raise
+
+                _sleep(self.retry.backoff(attempt), event, 'backoff')
+                continue
+            except BaseException:
+                _release(self.throttle, pool, key)
+                raise
+
+            _number_response(r)
+
+            if event is not None:
+                # requests measures the time from sending the request to parsing the response headers, which includes
+                # opening a connection; the body, unless streamed, is read afterwards.
+                headers_received = r.elapsed.total_seconds()
+
+                event.phases['ttfb'] += max(headers_received - (event.phases['connect'] - connect), 0.0)
+                event.phases['download'] += max(time.perf_counter() - start - headers_received, 0.0)
+                event.status_code = r.status_code
+
+            if key is not None and self.throttle is not None:
+                self.throttle.update(key, r.headers, r.status_code)
+
+            if pool is not None:
+                pool.update(key, r.headers, r.status_code)
+
+                if _fail_over(pool, key, r.status_code, rejected):
+                    r.close()
+                    continue
+
+            if not _can_retry(self.retry, attempt - len(rejected)) or \
+                    not self.retry.retry_status(r.status_code, r.headers):
+                break
+
+            r.close()
+            _sleep(self.retry.backoff(attempt, r.headers), event, 'backoff')
+
+        return r
+
+
+class AsyncClient(object):
+    r"""
+    Asynchronous HTTP client holding the pooled, keep-alive connections used by :class:`~nasapy.aio.AsyncNasa` and the
+    coroutines in :mod:`nasapy.aio`. Requires the `aiohttp <https://docs.aiohttp.org/>`_ library.
+
+    Parameters
+    ----------
+    pool_connections : int, default 10
+        The number of hosts the client can hold connections to at once. The total number of open connections is
+        limited to :code:`pool_connections * pool_maxsize`.
+    pool_maxsize : int, default 10
+        The maximum number of connections open to each host. This bounds the number of requests in flight to a
+        single host at once; requests over the limit wait for a free connection.
+    keep_alive : bool, default True
+        If True (default), connections are kept open and reused between requests.
+    timeout : float, tuple, default DEFAULT_TIMEOUT
+        Number of seconds to wait for the server before giving up, or a tuple of (connect, read) timeouts. The default
+        waits 10 seconds to connect and 120 seconds for each read, so a hung connection cannot block a call forever.
+        If None, requests wait indefinitely. Calls made under a :func:`~nasapy.deadline.deadline` wait no longer than
+        the time left before the deadline.
+    session : aiohttp.ClientSession, default None
+        An existing session to send requests with. If None, a new session is created on the first request.
+    throttle : bool, RateLimiter, default False
+        If True, requests sent with an API key are paced by the process-wide :class:`~nasapy.ratelimit.RateLimiter`
+        returned by :func:`~nasapy.ratelimit.default_rate_limiter`. A :class:`~nasapy.ratelimit.RateLimiter` can be
+        given to use a separate throttle. If False (default), requests are not throttled.
+    retry : bool, RetryPolicy, default True
+        If True (default), requests failing with a connection error, a timeout, or a 429 or 5xx status are retried
+        with the default :class:`~nasapy.retry.RetryPolicy`. A :class:`~nasapy.retry.RetryPolicy` can be given to
+        change the number of attempts and the backoff between them. If False, failed requests are not retried.
+    cache : bool, ResponseCache, default False
+        If True, successful responses are kept in a new :class:`~nasapy.cache.ResponseCache` with default settings
+        and repeated requests are answered from it without contacting the server. A
+        :class:`~nasapy.cache.ResponseCache` can be given to set the expiry and size of the cache, or to share it
+        between clients, and a :class:`~nasapy.cache.SQLiteCache` to keep responses on disk and share them between
+        processes. If False (default), responses are not cached.
+    coalesce : bool, default True
+        If True (default), identical requests (the same URL, parameters and API key) sent at the same time share a
+        single request to the server, and every caller receives a copy of its response.
+    transport : requests.adapters.BaseAdapter, default None
+        The transport adapter sending the requests in place of the pooled HTTP connections, such as a
+        :class:`~nasapy.transport.RecordTransport` or :class:`~nasapy.transport.ReplayTransport`. If None, requests
+        are sent over the network.
+    hooks : list, default None
+        Functions called with a :class:`~nasapy.instrument.CallEvent` after every call made through the client,
+        reporting the endpoint, parameters, status, size, retries, cache use and the time spent in each phase of the
+        call. Hooks are called in the thread making the call, and should return quickly.
+
+    Raises
+    ------
+    ImportError
+        Raised if the aiohttp library is not installed.
+    TypeError
+        Raised if :code:`keep_alive` is not boolean (True or False).
+    TypeError
+        Raised if :code:`throttle` is not boolean (True or False) or a :class:`~nasapy.ratelimit.RateLimiter`.
+    TypeError
+        Raised if :code:`retry` is not boolean (True or False) or a :class:`~nasapy.retry.RetryPolicy`.
+    TypeError
+        Raised if :code:`cache` is not boolean (True or False) or a :class:`~nasapy.cache.ResponseCache`.
+    TypeError
+        Raised if :code:`coalesce` is not boolean (True or False).
+    TypeError
+        Raised if :code:`hooks` is not a list of callables.
+    ValueError
+        Raised if :code:`pool_connections` or :code:`pool_maxsize` is less than 1.
+
+    Methods
+    -------
+    get
+        Sends a GET request and returns the response.
+    close
+        Closes the client's session and all pooled connections.
+
+    Notes
+    -----
+    The underlying aiohttp session is bound to the event loop it was created in, so an :code:`AsyncClient` should
+    only be used from a single event loop.
+
+    """
+    def __init__(self, pool_connections=10, pool_maxsize=10, keep_alive=True, timeout=DEFAULT_TIMEOUT, session=None,
+                 throttle=False, retry=True, cache=False, coalesce=True, transport=None, hooks=None):
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError('the aiohttp library is required to use the asynchronous client. It can be installed '
+                              'with "pip install aiohttp".')
+
+        if not isinstance(keep_alive, bool):
+            raise TypeError('keep_alive parameter must be boolean (True or False).')
+
+        if not isinstance(coalesce, bool):
+            raise TypeError('coalesce parameter must be boolean (True or False).')
+
+        if pool_connections < 1 or pool_maxsize < 1:
+            raise ValueError('pool_connections and pool_maxsize parameters must be at least 1.')
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.session = session
+        self.transport = transport
+        self.throttle = _check_throttle(throttle)
+        self.retry = _check_retry(retry)
+        self.cache = _check_cache(cache)
+        self.coalesce = coalesce
+        self.hooks = _check_hooks(hooks)
+        self._flights = AsyncSingleFlight()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def get(self, url, params=None, callback=None, timeout=None):
+        r"""
+        Sends a GET request using the client's pooled connections. If the request is sent with an API key
+        (an :code:`api_key` parameter) and the client is throttled, the coroutine waits, without blocking the event
+        loop, until the key's rate limiter allows the request to be sent. Failed requests are retried the same way as
+        :meth:`Client.get`, waiting for the backoff without blocking the event loop. Responses are cached and
+        revalidated, and identical requests coalesced, the same way as :meth:`Client.get`.
+
+        Parameters
+        ----------
+        url : str
+            The URL to request.
+        params : dict, default None
+            Query string parameters. Parameters with a value of None are not sent.
+        callback : callable, default None
+            Function called with the response. If given, the value returned by the callback is returned instead of
+            the response. If the callback returns an awaitable, such as another request made with the client, it is
+            awaited.
+        timeout : float, tuple, default None
+            The timeout of this call's requests, replacing the client's :code:`timeout`.
+
+        Returns
+        -------
+        requests.Response or object
+            The response returned by the server, or the value returned by :code:`callback` if specified. The
+            response is returned as a :code:`requests.Response` so results are processed the same way as the
+            synchronous :class:`Client`.
+
+        """
+        if not self.hooks:
+            return await self._get(url, params, callback, None, timeout)
+
+        event = CallEvent(url, params)
+        start = time.perf_counter()
+
+        try:
+            with _recording(event):
+                return await self._get(url, params, callback, event, timeout)
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            _emit(self.hooks, event, start)
+
+    async def close(self):
+        r"""
+        Closes the client's session and all pooled connections.
+
+        """
+        if self.session is not None:
+            await self.session.close()
+
+    async def _get(self, url, params, callback, event, timeout=None):
+        cached, fresh, shared = None, False, False
+
+        if self.cache is not None:
+            cached, fresh = self.cache.lookup(url, params)
+
+        if fresh:
+            r = cached
+        elif self.coalesce:
+            r, shared = await self._flights.do(_flight_key(url, params),
+                                               lambda: self._fetch(url, params, cached, event, timeout))
+
+            if shared:
+                r = _copy_response(r)
+        else:
+            r = await self._fetch(url, params, cached, event, timeout)
+
+        if event is not None:
+            _record_response(event, r, self.cache, fresh, shared)
+
+        if callback is not None:
+            r = callback(r)
+
+            if inspect.isawaitable(r):
+                r = await r
+
+        return r
+
+    async def _fetch(self, url, params, cached, event=None, timeout=None):
+        r = await self._send(url, params, headers=conditional_headers(cached), event=event, timeout=timeout)
+
+        if self.cache is not None:
+            if r.status_code == 304 and cached is not None:
+                sequence = response_sequence(r)
+                r = self.cache.revalidate(url, params, cached, r)
+                r.nasapy_sequence = sequence
+
+                if event is not None:
+                    event.cache = 'revalidated'
+            else:
+                self.cache.set(url, params, r)
+
+        return r
+
+    async def _send(self, url, params, headers=None, event=None, timeout=None):
+        import asyncio
+        import aiohttp
+        from yarl import URL
+
+        if self.session is None and self.transport is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_connections * self.pool_maxsize,
+                                               limit_per_host=self.pool_maxsize,
+                                               force_close=not self.keep_alive),
+                trace_configs=[_aiohttp_trace_config()])
+
+        key = _api_key(params)
+        pool = key if isinstance(key, KeyPool) else None
+
+        # Encode the query string the same way requests does (parameters set to None are dropped and booleans are
+        # sent as 'True' or 'False') so both clients send identical requests.
+        request_url = _prepare_url(url, params) if pool is None else None
+
+        attempt, rejected = 0, []
+
+        while True:
+            attempt += 1
+
+            if pool is not None:
+                key = pool.acquire(exclude=rejected)
+                request_url = _prepare_url(url, dict(params, api_key=key))
+
+                if event is not None:
+                    event.key = _mask_key(key)
+
+            if key is not None and self.throttle is not None:
+                delay = self.throttle.reserve(key)
+
+                if delay > 0:
+                    await _async_sleep(delay, event, 'throttle')
+
+            request_timeout = _bound_timeout(self.timeout if timeout is None else timeout)
+
+            if event is not None:
+                event.attempts = attempt
+                connect = event.phases['connect']
+                start = time.perf_counter()
+
+            try:
+                if self.transport is not None:
+                    r = await self._transport_send(request_url, headers, request_timeout)
+
+                    # Transports return complete responses, so the whole exchange is counted as waiting for the
+                    # response.
+                    if event is not None:
+                        headers_received = time.perf_counter() - start
+                else:
+                    async with self.session.get(URL(request_url, encoded=True), headers=headers,
+                                                timeout=_aiohttp_timeout(request_timeout)) as resp:
+                        if event is not None:
+                            headers_received = time.perf_counter() - start
+
+                        content = await resp.read()
+
+                        r = _build_response(url=str(resp.url),
+                                            status_code=resp.status,
+                                            reason=resp.reason,
+                                            headers=resp.headers,
+                                            content=content)
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError, requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout):
+                _release(self.throttle, pool, key)
+
+                if not _can_retry(self.retry, attempt - len(rejected)):
+                    raise
+
+                await _async_sleep(self.retry.backoff(attempt), event, 'backoff')
+                continue
+            except BaseException:
+                _release(self.throttle, pool, key)
+                raise
+
+            _number_response(r)
+
+            if event is not None:
+                event.phases['ttfb'] += max(headers_received - (event.phases['connect'] - connect), 0.0)
+                event.phases['download'] += max(time.perf_counter() - start - headers_received, 0.0)
+                event.status_code = r.status_code
+
+            if key is not None and self.throttle is not None:
+                self.throttle.update(key, r.headers, r.status_code)
+
+            if pool is not None:
+                pool.update(key, r.headers, r.status_code)
+
+                if _fail_over(pool, key, r.status_code, rejected):
+                    continue
+
+            if not _can_retry(self.retry, attempt - len(rejected)) or \
+                    not self.retry.retry_status(r.status_code, r.headers):
+                break
+
+            await _async_sleep(self.retry.backoff(attempt, r.headers), event, 'backoff')
+
+        return r
+
+    async def _transport_send(self, url, headers, timeout):
+        import asyncio
+
+        request = requests.Request('GET', url, headers=headers).prepare()
+
+        # Transports are synchronous, so requests are sent on the event loop's default executor to keep the loop
+        # running while a recording transport waits for the server.
+        send = functools.partial(self.transport.send, request, stream=False, timeout=timeout, verify=True,
+                                 cert=None, proxies={})
+
+        return await asyncio.get_running_loop().run_in_executor(None, send)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def default_client():
+    r"""
+    Returns the client shared by the module-level functions when no :code:`client` parameter is passed.
+
+    Returns
+    -------
+    Client
+        The shared client. It is created on first use.
+
+    """
+    global _default_client
+
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = Client()
+
+    return _default_client
+
+
+def set_default_client(client):
+    r"""
+    Replaces the client shared by the module-level functions when no :code:`client` parameter is passed, for example to
+    send every request through a :class:`~nasapy.transport.ReplayTransport`.
+
+    Parameters
+    ----------
+    client : Client, None
+        The client to share. If None, a new client with default settings is created on next use.
+
+    Raises
+    ------
+    TypeError
+        Raised if :code:`client` is not a :class:`Client` or None.
+
+    """
+    global _default_client
+
+    if client is not None and not isinstance(client, Client):
+        raise TypeError('client parameter must be a Client or None.')
+
+    with _default_client_lock:
+        _default_client = client
+
+
+_default_async_clients = weakref.WeakKeyDictionary()
+
+
+def default_async_client():
+    r"""
+    Returns the asynchronous client shared by the coroutines in :mod:`nasapy.aio` when no :code:`client` parameter is
+    passed. One client is kept for each running event loop.
+
+    Returns
+    -------
+    AsyncClient
+        The shared client for the running event loop. It is created on first use.
+
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+
+    if loop not in _default_async_clients:
+        _default_async_clients[loop] = AsyncClient()
+
+    return _default_async_clients[loop]
+
+
+def _check_throttle(throttle):
+    if isinstance(throttle, RateLimiter):
+        return throttle
+
+    if not isinstance(throttle, bool):
+        raise TypeError('throttle parameter must be boolean (True or False) or a RateLimiter.')
+
+    if throttle:
+        return default_rate_limiter()
+
+    return None
+
+
+def _check_retry(retry):
+    if isinstance(retry, RetryPolicy):
+        return retry
+
+    if not isinstance(retry, bool):
+        raise TypeError('retry parameter must be boolean (True or False) or a RetryPolicy.')
+
+    if retry:
+        return RetryPolicy()
+
+    return None
+
+
+def _check_cache(cache):
+    if isinstance(cache, ResponseCache):
+        return cache
+
+    if not isinstance(cache, bool):
+        raise TypeError('cache parameter must be boolean (True or False) or a ResponseCache.')
+
+    if cache:
+        return ResponseCache()
+
+    return None
+
+
+def _check_hooks(hooks):
+    if hooks is None:
+        return []
+
+    if not isinstance(hooks, (list, tuple)) or not all(callable(hook) for hook in hooks):
+        raise TypeError('hooks parameter must be a list of callables.')
+
+    return list(hooks)
+
+
+def _sleep(seconds, event, phase):
+    _check_wait(seconds)
+    time.sleep(seconds)
+
+    if event is not None:
+        event.phases[phase] += seconds
+
+
+async def _async_sleep(seconds, event, phase):
+    import asyncio
+
+    _check_wait(seconds)
+    await asyncio.sleep(seconds)
+
+    if event is not None:
+        event.phases[phase] += seconds
+
+
+def _record_response(event, r, cache, fresh, shared):
+    event.status_code = r.status_code
+    event.bytes = len(r.content)
+    event.coalesced = shared
+
+    if cache is not None:
+        if fresh:
+            event.cache = 'hit'
+        elif event.cache is None:
+            event.cache = 'miss'
+
+    # The rate limit headers of a cached response are out of date.
+    if not fresh:
+        event.rate_limit = _header_int(r.headers, 'X-RateLimit-Limit')
+        event.rate_limit_remaining = _header_int(r.headers, 'X-RateLimit-Remaining')
+
+
+def _can_retry(retry, attempt):
+    return retry is not None and attempt < retry.max_attempts
+
+
+def _release(throttle, pool, key):
+    # A request that failed without a response is no longer in flight, so the server's next count of the key's
+    # remaining requests is not reduced by it.
+    if key is not None and throttle is not None:
+        throttle.release(key)
+
+    if pool is not None:
+        pool.release(key)
+
+
+def _fail_over(pool, key, status_code, rejected):
+    # A key rejected with a 429 status is set aside and the request sent again at once with another key of the pool.
+    # Failovers are not counted as retries, and stop once every key has been rejected.
+    if status_code != 429 or len(rejected) >= len(pool) - 1:
+        return False
+
+    rejected.append(key)
+
+    return True
+
+
+def _flight_key(url, params):
+    # The cache key leaves out the API key, so it is added back to only coalesce requests sent with the same key.
+    return cache_key(url, params) + (_api_key(params),)
+
+
+def _copy_response(r):
+    copy = _build_response(url=r.url,
+                           status_code=r.status_code,
+                           reason=r.reason,
+                           headers=r.headers,
+                           content=r.content)
+    copy.nasapy_sequence = response_sequence(r)
+
+    return copy
+
+
+_sequence = itertools.count(1)
+
+
+def _number_response(r):
+    # Responses are numbered in the order they are received from the server, so results handled out of order by
+    # several threads can tell which is the most recent. next() on itertools.count is atomic.
+    r.nasapy_sequence = next(_sequence)
+
+
+def response_sequence(r):
+    r"""
+    Returns the order in which a response was received from the server, relative to every other response received by
+    the clients of the process.
+
+    Parameters
+    ----------
+    r : requests.Response
+        A response returned by :meth:`Client.get` or :meth:`AsyncClient.get`.
+
+    Returns
+    -------
+    int
+        The number of the response, increasing with every response received. 0 if the response was taken from the
+        cache.
+
+    """
+    return getattr(r, 'nasapy_sequence', 0)
+
+
+def _api_key(params):
+    if params is None:
+        return None
+
+    return params.get('api_key')
+
+
+def _prepare_url(url, params=None):
+    prepared = requests.models.PreparedRequest()
+    prepared.prepare_url(url, params)
+
+    return prepared.url
+
+
+def _aiohttp_timeout(timeout):
+    import aiohttp
+
+    # Unlike requests, aiohttp can bound the whole exchange, which keeps a slow body from outlasting a deadline.
+    total = time_remaining()
+
+    if timeout is None:
+        return aiohttp.ClientTimeout(total=total)
+
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect, read = timeout, timeout
+
+    return aiohttp.ClientTimeout(total=total, sock_connect=connect, sock_read=read)
@@ -0,0 +1,149 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import contextlib
+import contextvars
+import time
+
+import requests
+
+
+_expires = contextvars.ContextVar('nasapy_deadline', default=None)
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    r"""
+    Raised when a call cannot finish before the deadline it was made under, or when a batch job is cancelled because
+    its batch's deadline passed before the job could start. A subclass of :code:`requests.exceptions.Timeout`, so code
+    handling timeouts handles it as well.
+
+    """
+
+
+@contextlib.contextmanager
+def deadline(seconds):
+    r"""
+    Bounds the time taken by every call made through a :class:`~nasapy.client.Client` or
+    :class:`~nasapy.client.AsyncClient` in a :code:`with` block.
+
+    The timeout of each request is cut to the time left before the deadline, and a call raises
+    :class:`DeadlineExceeded` instead of sending a request, waiting for the throttle or backing off before a retry once
+    the deadline has passed or would pass during the wait. Deadlines can be nested; the earliest one applies.
+
+    Parameters
+    ----------
+    seconds : int, float
+        Number of seconds from now the calls must finish within.
+
+    Raises
+    ------
+    TypeError
+        Raised if :code:`seconds` is not a number.
+    ValueError
+        Raised if :code:`seconds` is not positive.
+
+    Examples
+    --------
+    # Give up on a DONKI request if it takes more than five seconds, retries included.
+    >>> n = Nasa(key=key)
+    >>> with deadline(5):
+    ...     flares = n.solar_flare()
+
+    Notes
+    -----
+    The deadline is held in a context variable, so it applies to the coroutines and tasks started in the block but not
+    to threads started in it; the batch functions pass it on to their worker threads.
+
+    """
+    _check_deadline(seconds)
+
+    with _until(time.monotonic() + seconds):
+        yield
+
+
+def time_remaining():
+    r"""
+    Returns the number of seconds left before the deadline of the calls currently being made.
+
+    Returns
+    -------
+    float or None
+        The seconds left, negative once the deadline has passed, or None if no deadline applies.
+
+    """
+    expires = _expires.get()
+
+    if expires is None:
+        return None
+
+    return expires - time.monotonic()
+
+
+@contextlib.contextmanager
+def _until(expires):
+    # Sets the absolute (time.monotonic) deadline of a block, keeping an earlier deadline already in force.
+    current = _expires.get()
+
+    if current is not None and expires is not None:
+        expires = min(current, expires)
+    elif expires is None:
+        expires = current
+
+    token = _expires.set(expires)
+
+    try:
+        yield
+    finally:
+        _expires.reset(token)
+
+
+def _expiry(seconds):
+    # The absolute deadline of a batch given its deadline parameter and the deadline the batch is run under.
+    current = _expires.get()
+
+    if seconds is None:
+        return current
+
+    expires = time.monotonic() + seconds
+
+    return expires if current is None else min(current, expires)
+
+
+def _bound_timeout(timeout):
+    # Cuts a requests timeout (None, a number or a (connect, read) tuple) to the time left before the deadline.
+    remaining = time_remaining()
+
+    if remaining is None:
+        return timeout
+
+    if remaining <= 0:
+        raise DeadlineExceeded('the deadline passed before the request could be sent.')
+
+    if timeout is None:
+        return remaining
+
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+
+    return min(timeout, remaining)
+
+
+def _check_wait(seconds):
+    # Waiting for the throttle or a backoff that outlasts the deadline would only delay the inevitable timeout.
+    remaining = time_remaining()
+
+    if remaining is not None and seconds >= remaining:
+        raise DeadlineExceeded('the deadline would pass while waiting {0:.2f} seconds to send the request.'
+                               .format(seconds))
+
+
+def _check_deadline(seconds):
+    if isinstance(seconds, bool) or not isinstance(seconds, (int, float)):
+        raise TypeError('deadline must be a number of seconds.')
+
+    if seconds <= 0:
+        raise ValueError('deadline must be greater than 0.')
@@ -0,0 +1,521 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import collections
+import datetime
+import hashlib
+import json
+import threading
+
+from nasapy.api import DONKI_EVENT_TYPES, _donki_event_id, _donki_event_key, _parse_date
+from nasapy.cache import _ThreadConnections
+from nasapy.client import AsyncClient
+
+
+# The time fields of the DONKI events with an identifier, in order of preference.
+_DONKI_TIME_FIELDS = ('beginTime', 'startTime', 'eventTime', 'modelCompletionTime')
+
+
+class DonkiSync(object):
+    r"""
+    Incremental synchronization of the DONKI events returned by the methods of a :class:`~nasapy.api.Nasa` object.
+
+    The time of the latest event received of each type (its high-water mark) is kept in an SQLite database. Each
+    :meth:`sync` only requests the events from a few days before the mark onwards, instead of the default last 30 days,
+    and returns the events that are new or have changed since they were last received. Events are told apart by their
+    identifier (:code:`flrID`, :code:`activityID`, ...), so an event revised by DONKI, for example when a link to a
+    later event is added, is returned again.
+
+    Parameters
+    ----------
+    nasa : Nasa
+        The object the DONKI methods are called on. Its client must be a :class:`~nasapy.client.Client`, as the
+        synchronization waits for each response.
+    path : str
+        Path of the database file holding the marks. It is created, along with its tables, if it does not exist.
+    overlap : int, default 2
+        Number of days before the day of the mark that are requested again, so events published late or revised are
+        picked up.
+    start_date : str, datetime, default None
+        String representing a date in YYYY-MM-DD format or a datetime object. The date events are requested from by
+        the first synchronization of a type. If None, the methods' default of 30 days prior to the current date is
+        used.
+    window : int, default None
+        Passed on to the DONKI methods to split long date ranges, such as the first synchronization of a multi-year
+        :code:`start_date`, into windows of this many days requested concurrently.
+    timeout : int, float, default 30
+        Number of seconds to wait for another process writing to the database before giving up.
+
+    Raises
+    ------
+    TypeError
+        Raised if :code:`nasa` is an :class:`~nasapy.aio.AsyncNasa` or uses an :class:`~nasapy.client.AsyncClient`.
+    TypeError
+        Raised if :code:`overlap` is not an integer.
+    ValueError
+        Raised if :code:`overlap` is negative.
+    TypeError
+        Raised if :code:`start_date` is not a string representing a date in YYYY-MM-DD format or a datetime object.
+
+    Methods
+    -------
+    sync
+        Requests the new events of one or more types and returns those not received before.
+    high_water_mark
+        Returns the time of the latest event received of a type.
+    reset
+        Forgets the marks and events received, so the next synchronization starts over.
+    close
+        Closes the connections to the database opened by every thread.
+
+    Examples
+    --------
+    # Poll the solar flares and geomagnetic storms, only downloading the last few days on each poll.
+    >>> events = DonkiSync(Nasa(key=key), '/var/lib/dashboard/donki.sqlite')
+    >>> changes = events.sync('solar_flare', 'geomagnetic_storm')
+    >>> changes['solar_flare']
+    [{'flrID': '2019-05-06T05:04:00-FLR-001', ...}]
+    >>> events.high_water_mark('solar_flare')
+    '2019-05-06T05:04Z'
+
+    Notes
+    -----
+    As with :class:`~nasapy.cache.SQLiteCache`, each thread and process opens its own connection to the database, so a
+    :code:`DonkiSync` can be shared by several threads and processes. The events received of a type and its new mark
+    are written in a single transaction, but the mark is read and the events requested before the transaction starts,
+    so two processes synchronizing the same type at the same time may both return the same changes. The connections
+    are closed by :meth:`close`, or when the object is used as a context manager.
+
+    """
+    def __init__(self, nasa, path, overlap=2, start_date=None, window=None, timeout=30):
+        if isinstance(nasa.client, AsyncClient):
+            raise TypeError('DonkiSync requires a Nasa object with a synchronous Client, not AsyncNasa or an '
+                            'AsyncClient.')
+
+        if isinstance(overlap, bool) or not isinstance(overlap, int):
+            raise TypeError('overlap parameter must be an integer.')
+
+        if overlap < 0:
+            raise ValueError('overlap parameter must be 0 or greater.')
+
+        if start_date is not None:
+            if isinstance(start_date, datetime.datetime):
+                start_date = start_date.strftime('%Y-%m-%d')
+            elif not isinstance(start_date, str):
+                raise TypeError('start_date parameter must be a string representing a date in YYYY-MM-DD format or '
+                                'a datetime object.')
+
+            _parse_date(start_date, 'start_date')
+
+        self.nasa = nasa
+        self.path = path
+        self.overlap = overlap
+        self.start_date = start_date
+        self.window = window
+        self.timeout = timeout
+        self._db = _ThreadConnections(path, timeout)
+
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS marks (event_type TEXT PRIMARY KEY, mark TEXT, synced TEXT)')
+            conn.execute('CREATE TABLE IF NOT EXISTS events (event_type TEXT, key TEXT, time TEXT, digest TEXT, '
+                         'PRIMARY KEY (event_type, key))')
+
+    def sync(self, *event_types):
+        r"""
+        Requests the events of one or more types from a few days before their high-water mark onwards, and advances
+        the marks.
+
+        Parameters
+        ----------
+        *event_types : str
+            Names of the DONKI methods of :class:`~nasapy.api.Nasa` to synchronize, such as 'solar_flare'. If none are
+            given, every type in :data:`~nasapy.api.DONKI_EVENT_TYPES` is synchronized.
+
+        Raises
+        ------
+        ValueError
+            Raised if a type is not one of the keys of :data:`~nasapy.api.DONKI_EVENT_TYPES`.
+
+        Returns
+        -------
+        dict
+            The events received for the first time or changed since they were last received, in the order returned by
+            the server, keyed by type.
+
+        """
+        event_types = event_types or tuple(DONKI_EVENT_TYPES)
+
+        for event_type in event_types:
+            _check_event_type(event_type)
+
+        return {event_type: self._sync(event_type) for event_type in event_types}
+
+    def _sync(self, event_type):
+        field = DONKI_EVENT_TYPES[event_type]
+        conn = self._connect()
+
+        row = conn.execute('SELECT mark, synced FROM marks WHERE event_type = ?', (event_type,)).fetchone()
+        mark, synced = row if row is not None else (None, None)
+
+        start_date = self._start_date(mark, synced)
+
+        events = getattr(self.nasa, event_type)(start_date=start_date, window=self.window) or []
+        today = _today().isoformat()
+        changes = []
+
+        with conn:
+            for event in events:
+                key = _donki_event_key(event)
+                digest = hashlib.sha1(json.dumps(event, sort_keys=True).encode('utf-8')).hexdigest()
+                time = event.get(field)
+
+                # Events without a time are remembered, and pruned, as of the day they were last received.
+                stored_time = time if time is not None else today
+
+                seen = conn.execute('SELECT digest FROM events WHERE event_type = ? AND key = ?',
+                                    (event_type, key)).fetchone()
+
+                if seen is None or seen[0] != digest:
+                    changes.append(event)
+                    conn.execute('INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?)',
+                                 (event_type, key, stored_time, digest))
+                elif time is None:
+                    conn.execute('UPDATE events SET time = ? WHERE event_type = ? AND key = ?',
+                                 (today, event_type, key))
+
+                if time is not None and (mark is None or time > mark):
+                    mark = time
+
+            conn.execute('INSERT OR REPLACE INTO marks VALUES (?, ?, ?)', (event_type, mark, today))
+
+            # Only the events the next synchronization requests again need to be remembered.
+            conn.execute('DELETE FROM events WHERE event_type = ? AND time < ?',
+                         (event_type, self._start_date(mark, today)))
+
+        return changes
+
+    def _start_date(self, mark, synced):
+        # The mark is the time of the latest event received; a type with no events yet is requested again from the
+        # day it was last synchronized.
+        since = mark[:10] if mark is not None else synced
+
+        if since is None:
+            return self.start_date
+
+        start = _parse_date(since, 'mark') - datetime.timedelta(days=self.overlap)
+
+        return start.isoformat()
+
+    def high_water_mark(self, event_type):
+        r"""
+        Returns the time of the latest event received of a type.
+
+        Parameters
+        ----------
+        event_type : str
+            Name of the DONKI method of :class:`~nasapy.api.Nasa`, such as 'solar_flare'.
+
+        Raises
+        ------
+        ValueError
+            Raised if :code:`event_type` is not one of the keys of :data:`~nasapy.api.DONKI_EVENT_TYPES`.
+
+        Returns
+        -------
+        str or None
+            The time, as returned by DONKI (for example, '2019-05-06T05:04Z'), or None if no event of the type has been
+            received.
+
+        """
+        _check_event_type(event_type)
+
+        row = self._connect().execute('SELECT mark FROM marks WHERE event_type = ?', (event_type,)).fetchone()
+
+        return row[0] if row is not None else None
+
+    def reset(self, event_type=None):
+        r"""
+        Forgets the high-water mark and the events received of a type, or of every type, so its next synchronization
+        requests events from :code:`start_date` again.
+
+        Parameters
+        ----------
+        event_type : str, default None
+            Name of the DONKI method of :class:`~nasapy.api.Nasa`. If None, every type is reset.
+
+        Raises
+        ------
+        ValueError
+            Raised if :code:`event_type` is not one of the keys of :data:`~nasapy.api.DONKI_EVENT_TYPES`.
+
+        """
+        with self._connect() as conn:
+            if event_type is None:
+                conn.execute('DELETE FROM marks')
+                conn.execute('DELETE FROM events')
+            else:
+                _check_event_type(event_type)
+
+                conn.execute('DELETE FROM marks WHERE event_type = ?', (event_type,))
+                conn.execute('DELETE FROM events WHERE event_type = ?', (event_type,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        r"""
+        Closes the connections to the database opened by every thread. Synchronizing again opens new connections.
+
+        """
+        self._db.close()
+
+    def _connect(self):
+        return self._db.connect()
+
+
+class DonkiGraph(object):
+    r"""
+    Index of DONKI events and the links between them, for following the chains of events caused by solar activity
+    (such as flare, coronal mass ejection, interplanetary shock, geomagnetic storm) without searching lists of events.
+
+    Events are keyed by their identifier (:code:`flrID`, :code:`activityID`, ...) and linked to the events in their
+    :code:`linkedEvents` lists. Links are followed both ways, whichever of the two events lists the other, and events
+    can be added in any order: a link to an event not added yet is kept, and the event is filled in when it arrives.
+    Looking up an event or its links takes constant time.
+
+    Parameters
+    ----------
+    events : list, default None
+        Events returned by the DONKI methods of :class:`~nasapy.api.Nasa` to add to the graph.
+
+    Methods
+    -------
+    add
+        Adds events to the graph, or updates those already in it.
+    get
+        Returns the event with an identifier.
+    linked
+        Returns the identifiers of the events linked to an event.
+    causes
+        Returns the identifiers of the earlier events an event can be traced back to.
+    effects
+        Returns the identifiers of the later events an event led to.
+    chain
+        Returns the identifiers of every event connected to an event.
+
+    Examples
+    --------
+    # Follow a flare of the last thirty days to the events it led to.
+    >>> n = Nasa(key=key)
+    >>> graph = DonkiGraph([row['event'] for row in n.donki_timeline()])
+    >>> graph.effects('2019-05-06T05:04:00-FLR-001')
+    ['2019-05-06T05:24:00-CME-001', '2019-05-08T11:35:00-IPS-001', '2019-05-10T15:00:00-GST-001']
+    # Keep the graph up to date with the events received by an incremental sync.
+    >>> for events in DonkiSync(n, 'donki.sqlite').sync().values():
+    ...     graph.add(events)
+
+    Notes
+    -----
+    Events are ordered by time, taken from the event's time field or, for an event not added yet, from its identifier,
+    which starts with the time of the event. Adding events and reading the graph are thread-safe.
+
+    """
+    def __init__(self, events=None):
+        self._events = {}
+        self._links = collections.defaultdict(set)
+        self._declared = {}
+        self._lock = threading.Lock()
+
+        if events is not None:
+            self.add(events)
+
+    def __len__(self):
+        return len(self._events)
+
+    def __contains__(self, event_id):
+        return event_id in self._events
+
+    def __repr__(self):
+        return '<DonkiGraph {events} events>'.format(events=len(self))
+
+    def add(self, events):
+        r"""
+        Adds events to the graph. An event already in the graph is replaced, and its links updated, by a newer version
+        of it.
+
+        Parameters
+        ----------
+        events : list
+            Events returned by the DONKI methods of :class:`~nasapy.api.Nasa`. Events without an identifier, such as
+            coronal mass ejection analyses, are skipped.
+
+        Returns
+        -------
+        int
+            The number of events added or replaced.
+
+        """
+        added = 0
+
+        with self._lock:
+            for event in events or ():
+                event_id = _donki_event_id(event)
+
+                if event_id is None:
+                    continue
+
+                declared = set(link['activityID'] for link in event.get('linkedEvents') or ()
+                               if link.get('activityID') and link['activityID'] != event_id)
+
+                # Links dropped from a revised event are removed unless the other event still lists it.
+                for other in self._declared.get(event_id, set()) - declared:
+                    if event_id not in self._declared.get(other, ()):
+                        self._links[event_id].discard(other)
+                        self._links[other].discard(event_id)
+
+                for other in declared:
+                    self._links[event_id].add(other)
+                    self._links[other].add(event_id)
+
+                self._declared[event_id] = declared
+                self._events[event_id] = event
+                added += 1
+
+        return added
+
+    def get(self, event_id):
+        r"""
+        Returns the event with an identifier.
+
+        Parameters
+        ----------
+        event_id : str
+            The identifier of the event, such as '2019-05-06T05:04:00-FLR-001'.
+
+        Returns
+        -------
+        dict or None
+            The event, or None if it has not been added to the graph.
+
+        """
+        return self._events.get(event_id)
+
+    def linked(self, event_id):
+        r"""
+        Returns the identifiers of the events linked to an event, including those not added to the graph yet.
+
+        Parameters
+        ----------
+        event_id : str
+            The identifier of the event.
+
+        Returns
+        -------
+        list
+            The identifiers, ordered by time.
+
+        """
+        with self._lock:
+            return self._sorted(self._links.get(event_id, ()))
+
+    def causes(self, event_id):
+        r"""
+        Returns the identifiers of the events an event can be traced back to by following its links to earlier events,
+        and their links to earlier events in turn.
+
+        Parameters
+        ----------
+        event_id : str
+            The identifier of the event.
+
+        Returns
+        -------
+        list
+            The identifiers, ordered by time.
+
+        """
+        return self._traverse(event_id, lambda other, current: self._time(other) < self._time(current))
+
+    def effects(self, event_id):
+        r"""
+        Returns the identifiers of the events an event led to, found by following its links to later events, and their
+        links to later events in turn.
+
+        Parameters
+        ----------
+        event_id : str
+            The identifier of the event.
+
+        Returns
+        -------
+        list
+            The identifiers, ordered by time.
+
+        """
+        return self._traverse(event_id, lambda other, current: self._time(other) > self._time(current))
+
+    def chain(self, event_id):
+        r"""
+        Returns the identifiers of every event connected to an event through any number of links, in either direction
+        of time.
+
+        Parameters
+        ----------
+        event_id : str
+            The identifier of the event.
+
+        Returns
+        -------
+        list
+            The identifiers, ordered by time, including :code:`event_id`.
+
+        """
+        return self._traverse(event_id, lambda other, current: True, include=True)
+
+    def _traverse(self, event_id, follow, include=False):
+        seen = {event_id}
+        queue = collections.deque([event_id])
+
+        with self._lock:
+            while queue:
+                current = queue.popleft()
+
+                for other in self._links.get(current, ()):
+                    if other not in seen and follow(other, current):
+                        seen.add(other)
+                        queue.append(other)
+
+            if not include:
+                seen.discard(event_id)
+
+            return self._sorted(seen)
+
+    def _sorted(self, event_ids):
+        return sorted(event_ids, key=lambda event_id: (self._time(event_id), event_id))
+
+    def _time(self, event_id):
+        # Event times ('2019-05-06T05:04Z') and the times identifiers start with ('2019-05-06T05:04:00') are compared
+        # to the minute.
+        event = self._events.get(event_id)
+        time = None
+
+        if event is not None:
+            time = next((event[field] for field in _DONKI_TIME_FIELDS if event.get(field)), None)
+
+        return (time or event_id)[:16]
+
+
+def _check_event_type(event_type):
+    if event_type not in DONKI_EVENT_TYPES:
+        raise ValueError('event type must be one of {types}.'.format(types=tuple(DONKI_EVENT_TYPES)))
+
+
+def _today():
+    return datetime.datetime.now(datetime.timezone.utc).date()
@@ -0,0 +1,319 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import contextlib
+import contextvars
+import functools
+import hashlib
+import re
+import time
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from nasapy.cache import cache_key
+
+
+PHASES = ('throttle', 'connect', 'ttfb', 'download', 'backoff', 'decode', 'dataframe')
+
+_current = contextvars.ContextVar('nasapy_call_event', default=None)
+
+
+class CallEvent(object):
+    r"""
+    Record of a single call made through a :class:`~nasapy.client.Client` or :class:`~nasapy.client.AsyncClient`,
+    passed to the client's hooks once the call returns or raises.
+
+    A call covers everything done for one request of a :class:`~nasapy.api.Nasa` method or module-level function:
+    waiting for the throttle, every attempt sent to the server, reading the responses and running the function's result
+    handling, such as decoding the JSON body and building a DataFrame.
+
+    Attributes
+    ----------
+    endpoint : str
+        The name of the nasapy function or method the URL belongs to, such as 'close_approach' or 'solar_flare', or
+        'other' if it is not one of the APIs wrapped by nasapy.
+    url : str
+        The URL requested, without its query string.
+    host : str
+        The host of the URL.
+    params : dict
+        The canonical query string parameters: parameters set to None and the :code:`api_key` parameter are removed,
+        and values are converted to strings, as in the cache key.
+    key : str, None
+        The API key the request was sent with, masked to its last four characters and a short hash of the whole key
+        (for example, '...a1b2-3c186ff3') so it can be logged or used as a metric label; keys ending with the same
+        characters keep distinct labels. 'DEMO_KEY' is not masked. None if no key was sent.
+    status_code : int, None
+        The status code of the response, or None if no response was received.
+    bytes : int, None
+        The size of the response body, or None if no response was received or the body was streamed.
+    rate_limit : int, None
+        The hourly request limit of the key, from the :code:`X-RateLimit-Limit` header of the response, or None if the
+        response has no such header or was taken from the cache.
+    rate_limit_remaining : int, None
+        The number of requests the key has left, from the :code:`X-RateLimit-Remaining` header of the response, or
+        None if the response has no such header or was taken from the cache.
+    attempts : int
+        The number of requests sent to the server. 0 if the response was taken from the cache or shared with an
+        identical request.
+    cache : str, None
+        'hit' if the response was taken from the cache, 'revalidated' if an expired cached response was renewed by a
+        304 (Not Modified) reply, 'miss' if the client has a cache that did not hold the response and None if the
+        client has no cache.
+    coalesced : bool
+        Whether the response was shared with an identical request already in flight.
+    error : Exception, None
+        The exception raised by the call, or None if it returned.
+    phases : dict
+        Number of seconds spent in each phase of the call: 'throttle' (waiting for the rate limiter), 'connect'
+        (resolving the host and opening connections, including the TLS handshake), 'ttfb' (from sending a request to
+        receiving the headers of its response), 'download' (reading response bodies), 'backoff' (waiting between
+        attempts), 'decode' (decoding JSON) and 'dataframe' (building pandas DataFrames). Phases of several attempts
+        are added together.
+    duration : float
+        Number of seconds the whole call took.
+
+    """
+    def __init__(self, url, params=None):
+        key = cache_key(url, params)
+        scheme, netloc, path, _, _ = urlsplit(url)
+
+        self.endpoint = endpoint_name(url)
+        self.url = '{scheme}://{netloc}{path}'.format(scheme=scheme, netloc=netloc, path=path)
+        self.host = netloc
+        self.params = dict(key[1:])
+        self.key = _mask_key(params.get('api_key') if params is not None else None)
+        self.status_code = None
+        self.bytes = None
+        self.rate_limit = None
+        self.rate_limit_remaining = None
+        self.attempts = 0
+        self.cache = None
+        self.coalesced = False
+        self.error = None
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.duration = 0.0
+
+    def __repr__(self):
+        return '<CallEvent {endpoint} {status} {duration:.1f} ms>'.format(endpoint=self.endpoint,
+                                                                       status=self.status_code,
+                                                                       duration=self.duration * 1000)
+
+    @property
+    def retries(self):
+        r"""
+        The number of requests sent again after a failed attempt.
+
+        """
+        return max(self.attempts - 1, 0)
+
+
+@contextlib.contextmanager
+def phase(name):
+    r"""
+    Adds the time spent in a :code:`with` block to a phase of the call currently being made, if the client making it
+    has hooks.
+
+    Parameters
+    ----------
+    name : str
+        The phase, one of the keys of :attr:`CallEvent.phases`.
+
+    Examples
+    --------
+    # Time the decoding of a response in a callback.
+    >>> def callback(r):
+    ...     with phase('decode'):
+    ...         return r.json()
+
+    """
+    event = _current.get()
+
+    if event is None:
+        yield
+        return
+
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        event.phases[name] += time.perf_counter() - start
+
+
+def current_event():
+    r"""
+    Returns the record of the call currently being made.
+
+    Returns
+    -------
+    CallEvent or None
+        The record, or None if no call is being made or the client making it has no hooks.
+
+    """
+    return _current.get()
+
+
+# Patterns of the URLs of every API wrapped by nasapy, matched against the host and path, and the name of the function
+# or method requesting them.
+_ENDPOINTS = [(re.compile(pattern), name) for pattern, name in (
+    (r'api\.nasa\.gov/planetary/apod', 'picture_of_the_day'),
+    (r'api\.nasa\.gov/insight_weather', 'mars_weather'),
+    (r'api\.nasa\.gov/neo/rest/v1/feed', 'asteroid_feed'),
+    (r'api\.nasa\.gov/neo/rest/v1/neo/', 'get_asteroids'),
+    (r'api\.nasa\.gov/DONKI/CMEAnalysis', 'coronal_mass_ejection'),
+    (r'api\.nasa\.gov/DONKI/GST', 'geomagnetic_storm'),
+    (r'api\.nasa\.gov/DONKI/IPS', 'interplantary_shock'),
+    (r'api\.nasa\.gov/DONKI/FLR', 'solar_flare'),
+    (r'api\.nasa\.gov/DONKI/SEP', 'solar_energetic_particle'),
+    (r'api\.nasa\.gov/DONKI/MPC', 'magnetopause_crossing'),
+    (r'api\.nasa\.gov/DONKI/RBE', 'radiation_belt_enhancement'),
+    (r'api\.nasa\.gov/DONKI/HSS', 'hight_speed_stream'),
+    (r'api\.nasa\.gov/DONKI/WSAEnlilSimulations', 'wsa_enlil_simulation'),
+    (r'api\.nasa\.gov/EPIC/', 'epic'),
+    (r'api\.nasa\.gov/planetary/earth/imagery', 'earth_imagery'),
+    (r'api\.nasa\.gov/planetary/earth/assets', 'earth_assets'),
+    (r'api\.nasa\.gov/mars-photos/', 'mars_rover'),
+    (r'api\.nasa\.gov/techport/', 'techport'),
+    (r'genelab-data\.ndc\.nasa\.gov/genelab/data/search', 'genelab_search'),
+    (r'exoplanetarchive\.ipac\.caltech\.edu/', 'exoplanets'),
+    (r'data\.ivanstanojevic\.me/api/tle', 'tle'),
+    (r'images-api\.nasa\.gov/search', 'media_search'),
+    (r'images-api\.nasa\.gov/asset/', 'media_asset_manifest'),
+    (r'images-api\.nasa\.gov/metadata/|images-assets\.nasa\.gov/.*\.json$', 'media_asset_metadata'),
+    (r'images-api\.nasa\.gov/captions/|images-assets\.nasa\.gov/.*\.(srt|vtt)$', 'media_asset_captions'),
+    (r'ssd-api\.jpl\.nasa\.gov/cad\.api', 'close_approach'),
+    (r'ssd-api\.jpl\.nasa\.gov/fireball\.api', 'fireballs'),
+    (r'ssd-api\.jpl\.nasa\.gov/mdesign\.api', 'mission_design'),
+    (r'ssd-api\.jpl\.nasa\.gov/nhats\.api', 'nhats'),
+    (r'ssd-api\.jpl\.nasa\.gov/scout\.api', 'scout'),
+    (r'ssd-api\.jpl\.nasa\.gov/sentry\.api', 'sentry')
+)]
+
+
+@functools.lru_cache(maxsize=1024)
+def endpoint_name(url):
+    r"""
+    Returns the name of the nasapy function or method requesting a URL.
+
+    Parameters
+    ----------
+    url : str
+        The URL.
+
+    Returns
+    -------
+    str
+        The name of the function or method, such as 'close_approach', or 'other' if the URL does not belong to an API
+        wrapped by nasapy. URLs of other APIs share a single name, so metrics labelled with it stay bounded however
+        many different URLs are requested; the host of the URL tells them apart.
+
+    """
+    _, netloc, path, _, _ = urlsplit(url)
+    location = netloc + path
+
+    for pattern, name in _ENDPOINTS:
+        if pattern.match(location):
+            return name
+
+    return 'other'
+
+
+def _mask_key(key):
+    # Keys taken from a KeyPool are only known once a request is sent, and are set on the event then.
+    if not isinstance(key, str):
+        return None
+
+    if key == 'DEMO_KEY':
+        return key
+
+    return '...{suffix}-{digest}'.format(suffix=key[-4:], digest=hashlib.sha256(key.encode('utf-8')).hexdigest()[:8])
+
+
+@contextlib.contextmanager
+def _recording(event):
+    # Makes the event the current call's record for the phase timers, including those in the client's connections.
+    token = _current.set(event)
+
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def _emit(hooks, event, start):
+    event.duration = time.perf_counter() - start
+
+    for hook in hooks:
+        hook(event)
+
+
+@functools.lru_cache(maxsize=None)
+def _timed_connection_class(cls):
+    # Subclasses the pool's connection class as it is when the connection is made, rather than replacing it, so
+    # libraries patching urllib3's connection classes (such as vcrpy) keep working.
+    class TimedConnection(cls):
+
+        def connect(self, *args, **kwargs):
+            event = _current.get()
+            start = time.perf_counter()
+
+            try:
+                return super(TimedConnection, self).connect(*args, **kwargs)
+            finally:
+                if event is not None:
+                    event.phases['connect'] += time.perf_counter() - start
+
+    return TimedConnection
+
+
+class _TimedConnectionPool(HTTPConnectionPool):
+
+    @property
+    def ConnectionCls(self):
+        return _timed_connection_class(HTTPConnectionPool.ConnectionCls)
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+
+    @property
+    def ConnectionCls(self):
+        return _timed_connection_class(HTTPSConnectionPool.ConnectionCls)
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    r"""
+    :code:`requests.adapters.HTTPAdapter` timing the connections it opens, so the time spent resolving hosts and
+    connecting is reported in the 'connect' phase of :class:`CallEvent`. Used by :class:`~nasapy.client.Client` for its
+    connection pools.
+
+    """
+    def init_poolmanager(self, *args, **kwargs):
+        super(TimedHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {'http': _TimedConnectionPool, 'https': _TimedHTTPSConnectionPool}
+
+
+def _aiohttp_trace_config():
+    import aiohttp
+
+    async def on_connection_create_start(session, context, params):
+        context.connect_start = time.perf_counter()
+
+    async def on_connection_create_end(session, context, params):
+        event = _current.get()
+
+        if event is not None:
+            event.phases['connect'] += time.perf_counter() - context.connect_start
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+
+    return trace_config
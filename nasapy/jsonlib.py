@@ -0,0 +1,102 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import json
+
+
+_decoder = json.loads
+
+
+def set_json_decoder(decoder='auto'):
+    r"""
+    Sets the function used to decode every JSON response returned by the :class:`~nasapy.api.Nasa` methods, the
+    module-level functions and their asynchronous versions.
+
+    Parameters
+    ----------
+    decoder : str, callable, default 'auto'
+        One of 'json' (the standard library's decoder, used by default), 'orjson' (the faster
+        `orjson <https://github.com/ijl/orjson>`_ library) or 'auto' (orjson if it is installed, otherwise the
+        standard library). A function taking the body of a response, as bytes (or as a string for bodies not encoded
+        in UTF-8), and returning the decoded object can also be given. Decode errors are raised to callers as
+        :code:`requests.exceptions.JSONDecodeError`.
+
+    Raises
+    ------
+    ImportError
+        Raised if :code:`decoder` is 'orjson' and the orjson library is not installed.
+    ValueError
+        Raised if :code:`decoder` is not 'json', 'orjson', 'auto' or a callable.
+
+    Examples
+    --------
+    # Decode responses with orjson when it is installed.
+    >>> set_json_decoder('auto')
+    # Go back to the standard library's decoder.
+    >>> set_json_decoder('json')
+
+    """
+    global _decoder
+
+    if callable(decoder):
+        _decoder = decoder
+        return
+
+    if decoder not in ('json', 'orjson', 'auto'):
+        raise ValueError("decoder parameter must be one of 'json', 'orjson', 'auto' or a callable.")
+
+    if decoder == 'json':
+        _decoder = json.loads
+        return
+
+    try:
+        import orjson
+    except ImportError:
+        if decoder == 'orjson':
+            raise ImportError('the orjson library is required to use the orjson decoder. It can be installed with '
+                              '"pip install orjson".')
+
+        _decoder = json.loads
+    else:
+        _decoder = orjson.loads
+
+
+def get_json_decoder():
+    r"""
+    Returns the function used to decode JSON responses.
+
+    Returns
+    -------
+    callable
+        The decoder set by :func:`set_json_decoder`; :code:`json.loads` by default.
+
+    """
+    return _decoder
+
+
+def loads(content):
+    r"""
+    Decodes a JSON document with the decoder set by :func:`set_json_decoder`.
+
+    Parameters
+    ----------
+    content : bytes, str
+        The JSON document.
+
+    Raises
+    ------
+    ValueError
+        Raised if :code:`content` is not valid JSON. Both the standard library's and orjson's decode errors are
+        subclasses of :code:`json.JSONDecodeError`.
+
+    Returns
+    -------
+    object
+        The decoded document.
+
+    """
+    return _decoder(content)
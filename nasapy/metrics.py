@@ -0,0 +1,292 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import bisect
+import threading
+
+from nasapy.instrument import PHASES
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# The type and help text of every metric, in the order they are written by MetricsRegistry.exposition.
+_METRICS = (
+    ('nasapy_calls_total', 'counter',
+     'Calls made, by endpoint, host and response status code ("error" if no response was received).'),
+    ('nasapy_call_errors_total', 'counter', 'Calls that raised an exception, by endpoint, host and exception type.'),
+    ('nasapy_retries_total', 'counter', 'Requests sent again after a failed attempt, by endpoint and host.'),
+    ('nasapy_response_bytes_total', 'counter', 'Size of the response bodies received, by endpoint and host.'),
+    ('nasapy_cache_total', 'counter', 'Cache lookups, by endpoint and result (hit, revalidated or miss).'),
+    ('nasapy_coalesced_total', 'counter', 'Calls sharing the response of an identical request, by endpoint.'),
+    ('nasapy_phase_seconds_total', 'counter', 'Seconds spent in each phase of the calls, by endpoint and phase.'),
+    ('nasapy_call_duration_seconds', 'histogram', 'Duration of the calls in seconds, by endpoint and host.'),
+    ('nasapy_cache_hit_ratio', 'gauge', 'Fraction of cache lookups answered without a full response from the server.'),
+    ('nasapy_rate_limit_limit', 'gauge', 'Hourly request limit of each API key, as last reported by the server.'),
+    ('nasapy_rate_limit_remaining', 'gauge', 'Requests each API key has left, as last reported by the server.')
+)
+
+
+class MetricsRegistry(object):
+    r"""
+    In-process metrics collected from the calls made through one or more clients: call, error, retry and cache
+    counters, call duration histograms for each endpoint and host, the cache hit ratio and the rate limit remaining for
+    each API key.
+
+    A registry is a hook: it is passed in the :code:`hooks` parameter of :class:`~nasapy.client.Client` or
+    :class:`~nasapy.client.AsyncClient` and updated with the :class:`~nasapy.instrument.CallEvent` of every call. The
+    metrics can be read with :meth:`value`, :meth:`cache_hit_ratio` and :meth:`limit_remaining`, or written in the
+    Prometheus text exposition format with :meth:`exposition`.
+
+    Parameters
+    ----------
+    buckets : list or tuple, default DEFAULT_BUCKETS
+        The upper bounds in seconds of the call duration histogram buckets, in increasing order. A :code:`+Inf` bucket
+        is always added.
+
+    Raises
+    ------
+    ValueError
+        Raised if :code:`buckets` is empty or not in increasing order.
+
+    Methods
+    -------
+    exposition
+        Returns the metrics in the Prometheus text exposition format.
+    value
+        Returns the value of a counter or gauge.
+    cache_hit_ratio
+        Returns the fraction of cache lookups answered without a full response from the server.
+    limit_remaining
+        Returns the number of requests each API key has left.
+    reset
+        Clears every metric.
+
+    Examples
+    --------
+    # Collect metrics from every call of a Nasa object and serve them to Prometheus.
+    >>> registry = MetricsRegistry()
+    >>> n = Nasa(key=key, client=Client(cache=True, hooks=[registry]))
+    >>> n.picture_of_the_day()
+    >>> registry.limit_remaining()
+    {'...a1b2-3c186ff3': 999}
+    >>> print(registry.exposition())
+
+    Notes
+    -----
+    API keys are labelled by their last four characters and a short hash of the whole key, as in
+    :attr:`~nasapy.instrument.CallEvent.key`, so the exposition can be published without leaking them and keys of a
+    :class:`~nasapy.ratelimit.KeyPool` sharing their last characters are kept apart. Updating and reading the metrics
+    is thread-safe, so a single registry can be shared by every client and thread in a process.
+
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        buckets = tuple(float(b) for b in buckets)
+
+        if not buckets or any(a >= b for a, b in zip(buckets, buckets[1:])):
+            raise ValueError('buckets parameter must be a non-empty sequence of increasing numbers.')
+
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __call__(self, event):
+        labels = (('endpoint', event.endpoint), ('host', event.host))
+        status = 'error' if event.status_code is None else str(event.status_code)
+
+        with self._lock:
+            self._add('nasapy_calls_total', labels + (('status', status),))
+
+            if event.error is not None:
+                self._add('nasapy_call_errors_total', labels + (('error', type(event.error).__name__),))
+
+            if event.retries:
+                self._add('nasapy_retries_total', labels, event.retries)
+
+            if event.bytes:
+                self._add('nasapy_response_bytes_total', labels, event.bytes)
+
+            if event.cache is not None:
+                self._add('nasapy_cache_total', (('endpoint', event.endpoint), ('result', event.cache)))
+
+            if event.coalesced:
+                self._add('nasapy_coalesced_total', (('endpoint', event.endpoint),))
+
+            for name in PHASES:
+                if event.phases[name]:
+                    self._add('nasapy_phase_seconds_total', (('endpoint', event.endpoint), ('phase', name)),
+                              event.phases[name])
+
+            histogram = self._histograms.get(labels)
+
+            if histogram is None:
+                histogram = self._histograms[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+
+            histogram[0][bisect.bisect_left(self.buckets, event.duration)] += 1
+            histogram[1] += event.duration
+
+            if event.key is not None:
+                if event.rate_limit is not None:
+                    self._gauges['nasapy_rate_limit_limit', (('key', event.key),)] = event.rate_limit
+                if event.rate_limit_remaining is not None:
+                    self._gauges['nasapy_rate_limit_remaining', (('key', event.key),)] = event.rate_limit_remaining
+
+    def _add(self, name, labels, amount=1):
+        self._counters[name, labels] = self._counters.get((name, labels), 0) + amount
+
+    def value(self, name, **labels):
+        r"""
+        Returns the value of a counter or gauge, summed over the label values not given.
+
+        Parameters
+        ----------
+        name : str
+            The name of the metric, such as 'nasapy_calls_total'.
+        **labels
+            Label values the series must have, such as :code:`endpoint='close_approach'`.
+
+        Returns
+        -------
+        int or float
+            The value. 0 if no series matches.
+
+        Examples
+        --------
+        # Number of calls to close_approach answered with a 200 status.
+        >>> registry.value('nasapy_calls_total', endpoint='close_approach', status='200')
+        3
+
+        """
+        labels = set((label, str(v)) for label, v in labels.items())
+
+        with self._lock:
+            series = list(self._counters.items()) + list(self._gauges.items())
+
+        return sum(v for (metric, series_labels), v in series if metric == name and labels <= set(series_labels))
+
+    def cache_hit_ratio(self):
+        r"""
+        Returns the fraction of cache lookups answered without a full response from the server, that is, taken from
+        the cache or revalidated with a 304 (Not Modified) reply.
+
+        Returns
+        -------
+        float or None
+            The ratio, or None if no call was made through a client with a cache.
+
+        """
+        with self._lock:
+            return self._cache_hit_ratio()
+
+    def _cache_hit_ratio(self):
+        lookups = {}
+
+        for (name, labels), v in self._counters.items():
+            if name == 'nasapy_cache_total':
+                result = dict(labels)['result']
+                lookups[result] = lookups.get(result, 0) + v
+
+        total = sum(lookups.values())
+
+        if total == 0:
+            return None
+
+        return (lookups.get('hit', 0) + lookups.get('revalidated', 0)) / total
+
+    def limit_remaining(self):
+        r"""
+        Returns the number of requests each API key has left, as reported in the :code:`X-RateLimit-Remaining` header
+        of the last response received for it.
+
+        Returns
+        -------
+        dict
+            The requests left, keyed by the masked API key.
+
+        """
+        with self._lock:
+            return {dict(labels)['key']: v for (name, labels), v in self._gauges.items()
+                    if name == 'nasapy_rate_limit_remaining'}
+
+    def reset(self):
+        r"""
+        Clears every metric.
+
+        """
+        with self._lock:
+            self._counters = {}
+            self._gauges = {}
+            self._histograms = {}
+
+    def exposition(self):
+        r"""
+        Returns the metrics in the Prometheus text exposition format, to be served from a :code:`/metrics` endpoint or
+        written to a file read by the node exporter's textfile collector.
+
+        Returns
+        -------
+        str
+            The metrics, with a :code:`# HELP` and :code:`# TYPE` line for each metric.
+
+        """
+        with self._lock:
+            series = {}
+
+            for (name, labels), v in sorted(self._counters.items()):
+                series.setdefault(name, []).append(_sample(name, labels, v))
+
+            for labels, (counts, total) in sorted(self._histograms.items()):
+                samples = series.setdefault('nasapy_call_duration_seconds', [])
+                cumulative = 0
+
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    samples.append(_sample('nasapy_call_duration_seconds_bucket',
+                                           labels + (('le', _format(bound)),), cumulative))
+
+                samples.append(_sample('nasapy_call_duration_seconds_sum', labels, total))
+                samples.append(_sample('nasapy_call_duration_seconds_count', labels, cumulative))
+
+            ratio = self._cache_hit_ratio()
+
+            if ratio is not None:
+                series['nasapy_cache_hit_ratio'] = [_sample('nasapy_cache_hit_ratio', (), ratio)]
+
+            for (name, labels), v in sorted(self._gauges.items()):
+                series.setdefault(name, []).append(_sample(name, labels, v))
+
+        lines = []
+
+        for name, kind, description in _METRICS:
+            if name in series:
+                lines.append('# HELP {0} {1}'.format(name, description))
+                lines.append('# TYPE {0} {1}'.format(name, kind))
+                lines.extend(series[name])
+
+        return ''.join(line + '\n' for line in lines)
+
+
+def _sample(name, labels, value):
+    if not labels:
+        return '{0} {1}'.format(name, _format(value))
+
+    labels = ','.join('{0}="{1}"'.format(label, _escape(v)) for label, v in labels)
+
+    return '{0}{{{1}}} {2}'.format(name, labels, _format(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format(value):
+    if value == float('inf'):
+        return '+Inf'
+
+    if isinstance(value, float):
+        return repr(value)
+
+    return str(value)
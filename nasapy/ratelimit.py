@@ -0,0 +1,421 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import threading
+import time
+
+
+class RateLimiter(object):
+    r"""
+    Token bucket throttle pacing the requests sent with each API key so the hourly limit of the key is not exceeded.
+
+    The NASA API reports the hourly limit and the number of requests remaining for a key in the
+    :code:`X-RateLimit-Limit` and :code:`X-RateLimit-Remaining` headers of every response. A bucket is kept for each
+    key holding the requests that can be sent right away, filled from the headers and refilled at the key's hourly
+    limit spread over the hour. Requests are sent immediately while the bucket holds tokens; once it is empty, each
+    request waits for the next token instead of being rejected by the server with a 429 (Too Many Requests) status.
+
+    Parameters
+    ----------
+    period : int, float, default 3600
+        Length in seconds of the window the :code:`X-RateLimit-Limit` applies to.
+    default_limit : int, default 1000
+        The limit assumed for keys whose responses have an :code:`X-RateLimit-Remaining` header but no
+        :code:`X-RateLimit-Limit` header.
+
+    Raises
+    ------
+    ValueError
+        Raised if :code:`period` or :code:`default_limit` is not positive.
+
+    Methods
+    -------
+    reserve
+        Takes a token from a key's bucket and returns the number of seconds to wait before sending the request.
+    update
+        Updates a key's bucket from the rate limit headers of a response.
+    release
+        Marks a request that failed without a response as no longer in flight.
+    remaining
+        Returns the estimated number of requests that can be sent right away with a key.
+
+    Examples
+    --------
+    # Share one throttle between two clients sending requests with the same key.
+    >>> limiter = RateLimiter()
+    >>> n1 = Nasa(key=key, client=Client(throttle=limiter))
+    >>> n2 = Nasa(key=key, client=Client(throttle=limiter))
+
+    Notes
+    -----
+    Keys are not throttled until a response with rate limit headers has been received for them. Reserving a token
+    is thread-safe, so a single limiter can be shared by every client and thread in a process.
+
+    """
+    def __init__(self, period=3600, default_limit=1000):
+
+        if period <= 0 or default_limit <= 0:
+            raise ValueError('period and default_limit parameters must be greater than 0.')
+
+        self.period = period
+        self.default_limit = default_limit
+        self._buckets = _BucketTable(period, default_limit)
+        self._lock = self._buckets.lock
+
+    def reserve(self, key):
+        r"""
+        Takes a token from the bucket of a key.
+
+        Parameters
+        ----------
+        key : str
+            The API key the request is sent with.
+
+        Returns
+        -------
+        float
+            The number of seconds to wait before sending the request. 0 if a token was available.
+
+        """
+        with self._lock:
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                return 0.0
+
+            return bucket.take(time.monotonic())
+
+    def update(self, key, headers, status_code=200):
+        r"""
+        Updates the bucket of a key from the rate limit headers of a response.
+
+        Parameters
+        ----------
+        key : str
+            The API key the request was sent with.
+        headers : dict
+            The headers of the response.
+        status_code : int, default 200
+            The status code of the response. A 429 (Too Many Requests) response empties the bucket.
+
+        """
+        self._buckets.update(key, headers, status_code)
+
+    def release(self, key):
+        r"""
+        Marks a request sent with a key as finished without a response, such as after a connection error, so it is no
+        longer counted as in flight when the key's bucket is next updated.
+
+        Parameters
+        ----------
+        key : str
+            The API key the request was sent with.
+
+        """
+        self._buckets.release(key)
+
+    def remaining(self, key):
+        r"""
+        Returns the estimated number of requests that can be sent right away with a key.
+
+        Parameters
+        ----------
+        key : str
+            The API key.
+
+        Returns
+        -------
+        int or None
+            The estimated number of requests remaining, or None if no rate limit headers have been received for the
+            key.
+
+        """
+        with self._lock:
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                return None
+
+            bucket.refill(time.monotonic())
+
+            return max(int(bucket.tokens), 0)
+
+
+class KeyPool(object):
+    r"""
+    Pool of API keys a :class:`~nasapy.api.Nasa` object spreads its requests over, so its throughput grows with the
+    number of keys held.
+
+    The hourly limit and the number of requests remaining for each key are tracked from the :code:`X-RateLimit-Limit`
+    and :code:`X-RateLimit-Remaining` headers of its responses, with the same token buckets as
+    :class:`RateLimiter`. Each request is sent with the key that has the most requests remaining; a request rejected
+    with a 429 (Too Many Requests) status is sent again right away with the next best key, until every key in the pool
+    has been tried.
+
+    Parameters
+    ----------
+    keys : list or tuple
+        The API keys, as strings. Keys never used are assumed to have their full :code:`default_limit` remaining and
+        are tried in the order given.
+    period : int, float, default 3600
+        Length in seconds of the window the :code:`X-RateLimit-Limit` applies to.
+    default_limit : int, default 1000
+        The limit assumed for keys whose responses have no :code:`X-RateLimit-Limit` header.
+
+    Raises
+    ------
+    TypeError
+        Raised if :code:`keys` is not a list or tuple of strings.
+    ValueError
+        Raised if :code:`keys` is empty or holds the same key twice, or if :code:`period` or :code:`default_limit` is
+        not positive.
+
+    Methods
+    -------
+    acquire
+        Returns the key to send a request with and counts the request against it.
+    update
+        Updates a key's remaining requests from the rate limit headers of a response.
+    release
+        Marks a request that failed without a response as no longer in flight.
+    remaining
+        Returns the estimated number of requests that can be sent right away with a key.
+
+    Examples
+    --------
+    # Spread requests over three keys.
+    >>> n = Nasa(key=[key1, key2, key3])
+    >>> n.api_key.remaining(key2)
+    998
+
+    Notes
+    -----
+    Acquiring and updating keys is thread-safe, so a single pool can be shared by several :class:`~nasapy.api.Nasa`
+    objects and threads.
+
+    """
+    def __init__(self, keys, period=3600, default_limit=1000):
+
+        if not isinstance(keys, (list, tuple)) or not all(isinstance(key, str) for key in keys):
+            raise TypeError('keys parameter must be a list or tuple of strings.')
+
+        if not keys or len(set(keys)) != len(keys):
+            raise ValueError('keys parameter must hold at least one key and no key more than once.')
+
+        if period <= 0 or default_limit <= 0:
+            raise ValueError('period and default_limit parameters must be greater than 0.')
+
+        self.keys = tuple(keys)
+        self.period = period
+        self.default_limit = default_limit
+        self._buckets = _BucketTable(period, default_limit)
+        self._lock = self._buckets.lock
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __repr__(self):
+        return '<KeyPool of {0} keys>'.format(len(self.keys))
+
+    def acquire(self, exclude=()):
+        r"""
+        Returns the key with the most requests remaining and counts a request against it.
+
+        Parameters
+        ----------
+        exclude : list or tuple, default ()
+            Keys not to return, such as keys that were just rejected with a 429 status. Ignored if every key in the
+            pool is excluded.
+
+        Returns
+        -------
+        str
+            The API key to send the request with.
+
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            keys = [key for key in self.keys if key not in exclude] or self.keys
+            key = max(keys, key=lambda k: self._tokens(k, now))
+
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                bucket = self._buckets[key] = _TokenBucket(self.default_limit, self.period, self.default_limit, now)
+
+            bucket.take(now)
+
+            return key
+
+    def _tokens(self, key, now):
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            return self.default_limit
+
+        bucket.refill(now)
+
+        return bucket.tokens
+
+    def update(self, key, headers, status_code=200):
+        r"""
+        Updates the remaining requests of a key from the rate limit headers of a response.
+
+        Parameters
+        ----------
+        key : str
+            The API key the request was sent with.
+        headers : dict
+            The headers of the response.
+        status_code : int, default 200
+            The status code of the response. A 429 (Too Many Requests) response leaves the key with no requests
+            remaining.
+
+        """
+        self._buckets.update(key, headers, status_code)
+
+    def release(self, key):
+        r"""
+        Marks a request sent with a key as finished without a response, such as after a connection error, so it is no
+        longer counted as in flight when the key's bucket is next updated.
+
+        Parameters
+        ----------
+        key : str
+            The API key the request was sent with.
+
+        """
+        self._buckets.release(key)
+
+    def remaining(self, key):
+        r"""
+        Returns the estimated number of requests that can be sent right away with a key.
+
+        Parameters
+        ----------
+        key : str
+            The API key.
+
+        Returns
+        -------
+        int or None
+            The estimated number of requests remaining, or None if the key has not been used yet.
+
+        """
+        with self._lock:
+            if key not in self._buckets:
+                return None
+
+            return max(int(self._tokens(key, time.monotonic())), 0)
+
+
+class _BucketTable(dict):
+
+    def __init__(self, period, default_limit):
+        super(_BucketTable, self).__init__()
+
+        self.period = period
+        self.default_limit = default_limit
+        self.lock = threading.Lock()
+
+    def update(self, key, headers, status_code):
+        limit = _header_int(headers, 'X-RateLimit-Limit')
+        remaining = _header_int(headers, 'X-RateLimit-Remaining')
+
+        if status_code == 429:
+            remaining = 0
+
+        now = time.monotonic()
+
+        with self.lock:
+            bucket = self.get(key)
+
+            if remaining is None:
+                if bucket is not None:
+                    bucket.release()
+            elif bucket is None:
+                self[key] = _TokenBucket(limit or self.default_limit, self.period, remaining, now)
+            else:
+                bucket.sync(limit, remaining, now)
+
+    def release(self, key):
+        with self.lock:
+            bucket = self.get(key)
+
+            if bucket is not None:
+                bucket.release()
+
+
+class _TokenBucket(object):
+
+    def __init__(self, capacity, period, tokens, now):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.period = period
+        self.tokens = min(tokens, capacity)
+        self.in_flight = 0
+        self.updated = now
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now):
+        self.refill(now)
+        self.tokens -= 1
+        self.in_flight += 1
+
+        if self.tokens >= 0:
+            return 0.0
+
+        return -self.tokens / self.rate
+
+    def release(self):
+        self.in_flight = max(self.in_flight - 1, 0)
+
+    def sync(self, limit, remaining, now):
+        if limit is not None and limit != self.capacity:
+            self.capacity = limit
+            self.rate = limit / self.period
+
+        self.refill(now)
+        self.release()
+
+        # The server's count does not include the requests still in flight, which have already been taken from the
+        # bucket. Less those, it replaces the local estimate whether higher, as after the server's window resets, or
+        # lower, as when the key is also used elsewhere.
+        self.tokens = min(remaining - self.in_flight, self.capacity)
+
+
+_default_rate_limiter = RateLimiter()
+
+
+def default_rate_limiter():
+    r"""
+    Returns the throttle shared by every client created with :code:`throttle=True`, so requests sent with the same key
+    from different clients draw from the same bucket.
+
+    Returns
+    -------
+    RateLimiter
+        The shared rate limiter.
+
+    """
+    return _default_rate_limiter
+
+
+def _header_int(headers, name):
+    value = headers.get(name)
+
+    if value is None:
+        return None
+
+    try:
+        return int(value)
+    except ValueError:
+        return None
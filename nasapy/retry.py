@@ -0,0 +1,169 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import datetime
+import random
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy(object):
+    r"""
+    Policy deciding when a failed request is sent again and how long to wait before each new attempt.
+
+    Requests failing with a connection error, a timeout, or one of the :code:`status_codes` (by default 429 (Too Many
+    Requests) and the 5xx statuses returned by overloaded or restarting servers) are retried with an exponentially
+    increasing backoff. The wait before attempt :math:`n + 1` is :math:`backoff\_factor \cdot 2^{n - 1}` seconds,
+    capped at :code:`max_backoff`. With jitter, a random wait between 0 and the backoff is used instead so clients
+    failing at the same time do not retry at the same time. A response whose :code:`Retry-After` header asks for a
+    longer wait than :code:`max_backoff` is not retried, so a rate limited call fails at once instead of blocking its
+    thread until the quota refills.
+
+    Parameters
+    ----------
+    max_attempts : int, default 3
+        The maximum number of times a request is sent, including the first attempt. 1 disables retries.
+    backoff_factor : int, float, default 0.5
+        Number of seconds to wait before the first retry. The wait doubles after each attempt.
+    max_backoff : int, float, default 60
+        The maximum number of seconds to wait between two attempts, including waits requested by a
+        :code:`Retry-After` header.
+    jitter : bool, default True
+        If True (default), the wait before each attempt is drawn uniformly between 0 and the backoff.
+    status_codes : tuple, default (429, 500, 502, 503, 504)
+        The response status codes that are retried.
+    respect_retry_after : bool, default True
+        If True (default), a retried request waits at least the number of seconds given in the :code:`Retry-After`
+        header of the failed response, and a response asking for a wait longer than :code:`max_backoff` is not
+        retried.
+
+    Raises
+    ------
+    ValueError
+        Raised if :code:`max_attempts` is less than 1, or :code:`backoff_factor` or :code:`max_backoff` is negative.
+    TypeError
+        Raised if :code:`jitter` or :code:`respect_retry_after` is not boolean (True or False).
+
+    Methods
+    -------
+    retry_status
+        Returns True if a response with the given status code should be retried.
+    backoff
+        Returns the number of seconds to wait before sending a request again.
+
+    Examples
+    --------
+    # Retry up to five times, waiting at most 30 seconds between attempts.
+    >>> client = Client(retry=RetryPolicy(max_attempts=5, max_backoff=30))
+    >>> n = Nasa(key=key, client=client)
+
+    """
+    def __init__(self, max_attempts=3, backoff_factor=0.5, max_backoff=60, jitter=True,
+                 status_codes=(429, 500, 502, 503, 504), respect_retry_after=True):
+
+        if max_attempts < 1:
+            raise ValueError('max_attempts parameter must be at least 1.')
+
+        if backoff_factor < 0 or max_backoff < 0:
+            raise ValueError('backoff_factor and max_backoff parameters must not be negative.')
+
+        if not isinstance(jitter, bool):
+            raise TypeError('jitter parameter must be boolean (True or False).')
+
+        if not isinstance(respect_retry_after, bool):
+            raise TypeError('respect_retry_after parameter must be boolean (True or False).')
+
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_codes = frozenset(status_codes)
+        self.respect_retry_after = respect_retry_after
+
+    def retry_status(self, status_code, headers=None):
+        r"""
+        Returns True if a response with the given status code should be retried.
+
+        Parameters
+        ----------
+        status_code : int
+            The status code of the response.
+        headers : dict, default None
+            The headers of the response. A response whose :code:`Retry-After` header asks for a wait longer than
+            :code:`max_backoff`, or a 429 (Too Many Requests) response without a :code:`Retry-After` header for a key
+            with no requests left (:code:`X-RateLimit-Remaining: 0`), is not retried.
+
+        Returns
+        -------
+        bool
+
+        """
+        if status_code not in self.status_codes:
+            return False
+
+        if headers is not None:
+            retry_after = _retry_after(headers) if self.respect_retry_after else None
+
+            if retry_after is not None and retry_after > self.max_backoff:
+                return False
+
+            # api.nasa.gov quotas are hourly: a 429 for a key with no requests left cannot succeed within a backoff.
+            if status_code == 429 and retry_after is None and headers.get('X-RateLimit-Remaining') == '0':
+                return False
+
+        return True
+
+    def backoff(self, attempt, headers=None):
+        r"""
+        Returns the number of seconds to wait before sending a request again.
+
+        Parameters
+        ----------
+        attempt : int
+            The number of times the request has been sent so far.
+        headers : dict, default None
+            The headers of the failed response, if one was received.
+
+        Returns
+        -------
+        float
+            The number of seconds to wait.
+
+        """
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        if self.respect_retry_after and headers is not None:
+            retry_after = _retry_after(headers)
+
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_backoff))
+
+        return delay
+
+
+def _retry_after(headers):
+    value = headers.get('Retry-After')
+
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+
+    return max((date - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,150 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import threading
+
+
+class SingleFlight(object):
+    r"""
+    Coalesces identical calls made at the same time from several threads, so only one of them runs and every caller
+    receives its result.
+
+    Methods
+    -------
+    do
+        Runs a function, or waits for the result of the identical call already running.
+
+    Notes
+    -----
+    Only calls running at the same time are coalesced; results are not kept once the call finishes.
+
+    """
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        r"""
+        Runs a function, unless a call with the same key is already running, in which case the call's result is
+        waited for and returned instead.
+
+        Parameters
+        ----------
+        key : hashable
+            The key identifying the call.
+        func : callable
+            Function called without arguments.
+
+        Returns
+        -------
+        tuple
+            The value returned by the function and True if it was returned by a call started by another caller.
+            Exceptions raised by the function are raised in every caller.
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            call.done.wait()
+
+            if call.exception is not None:
+                raise call.exception
+
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+        return call.result, False
+
+
+class AsyncSingleFlight(object):
+    r"""
+    Coalesces identical coroutine calls awaited at the same time on an event loop, so only one of them runs and every
+    caller receives its result.
+
+    Methods
+    -------
+    do
+        Awaits a coroutine function, or waits for the result of the identical call already running.
+
+    Notes
+    -----
+    Only calls running at the same time are coalesced; results are not kept once the call finishes. If the caller
+    running the call is cancelled, the callers waiting for it are cancelled too.
+
+    """
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, func):
+        r"""
+        Awaits a coroutine function, unless a call with the same key is already running, in which case the call's
+        result is waited for and returned instead.
+
+        Parameters
+        ----------
+        key : hashable
+            The key identifying the call.
+        func : callable
+            Coroutine function called without arguments.
+
+        Returns
+        -------
+        tuple
+            The value returned by the function and True if it was returned by a call started by another caller.
+            Exceptions raised by the function are raised in every caller.
+
+        """
+        import asyncio
+
+        future = self._calls.get(key)
+
+        if future is not None:
+            return await asyncio.shield(future), True
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marks the exception as retrieved so it is not logged when no other caller was waiting for it.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            del self._calls[key]
+
+        return result, False
+
+
+class _Call(object):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
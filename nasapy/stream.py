@@ -0,0 +1,186 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import codecs
+import json
+
+
+def iter_json_array(chunks, key=None, header=None):
+    r"""
+    Parses a JSON document incrementally from a stream of byte chunks and yields the items of one of its arrays as
+    they are read, so only a single item and the unparsed part of the last chunk are held in memory at a time.
+
+    Parameters
+    ----------
+    chunks : iterable
+        Iterable of bytes objects holding the UTF-8 encoded document, such as
+        :code:`requests.Response.iter_content()`.
+    key : str, default None
+        If None (default), the document must be an array and its items are yielded. Otherwise, the document must be an
+        object and the items of the array stored under :code:`key` are yielded.
+    header : dict, default None
+        If given, the members of the object preceding :code:`key` (for example, the 'fields' and 'count' members of a
+        JPL SSD response) are added to the dictionary as they are read.
+
+    Raises
+    ------
+    json.JSONDecodeError
+        Raised if the document is not valid JSON or does not have the expected structure.
+
+    Returns
+    -------
+    generator
+        The items of the array. Nothing is yielded if :code:`key` is not a member of the object.
+
+    Examples
+    --------
+    # Read the rows of a close approach query without loading the whole response.
+    >>> r = default_client().stream('https://ssd-api.jpl.nasa.gov/cad.api', params={'date-min': '1900-01-01'})
+    >>> header = {}
+    >>> for row in iter_json_array(r.iter_content(65536), key='data', header=header):
+    ...     print(dict(zip(header['fields'], row)))
+
+    """
+    reader = _Reader(chunks)
+
+    if key is None:
+        reader.expect('[')
+
+        yield from reader.items()
+        return
+
+    reader.expect('{')
+
+    if reader.peek() == '}':
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(':')
+
+        if name == key:
+            reader.expect('[')
+
+            yield from reader.items()
+            return
+
+        value = reader.value()
+
+        if header is not None:
+            header[name] = value
+
+        if reader.peek() == '}':
+            return
+
+        reader.expect(',')
+
+
+def batched(items, size):
+    r"""
+    Groups an iterable into lists of :code:`size` items. The last list holds the remaining items and may be shorter.
+
+    Parameters
+    ----------
+    items : iterable
+        The items to group.
+    size : int
+        The number of items in each list.
+
+    Returns
+    -------
+    generator
+        Lists of up to :code:`size` items.
+
+    """
+    batch = []
+
+    for item in items:
+        batch.append(item)
+
+        if len(batch) == size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+class _Reader(object):
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size=1):
+        # Reads chunks until at least `size` unparsed characters are buffered. Consumed characters are dropped first
+        # so the buffer only ever holds the unparsed end of the document.
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+
+        while not self.eof and len(self.buffer) < size:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self.buffer += self._text.decode(b'', final=True)
+                self.eof = True
+            else:
+                self.buffer += self._text.decode(chunk)
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\n\r':
+                self.pos += 1
+
+            if self.pos < len(self.buffer) or self.eof:
+                break
+
+            self.fill()
+
+        return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError('Expecting {char!r}'.format(char=char), self.buffer, self.pos)
+
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number or literal ending at the end of the buffer may continue in the next chunk.
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+
+            # The value is incomplete. The buffer is at least doubled before decoding again, so a value spanning many
+            # chunks is decoded a logarithmic number of times rather than once per chunk.
+            self.fill(2 * (len(self.buffer) - self.pos) + 1)
+
+    def items(self):
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            yield self.value()
+
+            if self.peek() == ']':
+                self.pos += 1
+                return
+
+            self.expect(',')
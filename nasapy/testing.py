@@ -0,0 +1,1084 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import base64
+import datetime
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from nasapy.transport import _request_key
+
+
+class MockServer(object):
+    r"""
+    Local HTTP server standing in for every API wrapped by nasapy, so pipelines can be load tested, and the client's
+    concurrency, throttling, retry and caching features benchmarked, on one machine without using any API quota.
+
+    The server answers requests for api.nasa.gov (APOD, InSight, NeoWs, DONKI, EPIC, Earth, Mars Rover Photos and
+    TechPort), ssd-api.jpl.nasa.gov (cad, fireball, mdesign, nhats, scout and sentry), the NASA Image and Video Library
+    (images-api.nasa.gov and images-assets.nasa.gov), the GeneLab search, the TLE API and the Exoplanet Archive. A
+    client is pointed at it by giving the transport returned by :meth:`transport` as the :code:`transport` parameter
+    of :class:`~nasapy.client.Client` or :class:`~nasapy.client.AsyncClient`; the transport sends requests for those
+    hosts to the server instead, so no code calling the API has to change.
+
+    Responses are taken from a file written by :class:`~nasapy.transport.RecordTransport` when it holds the request,
+    and are otherwise synthetic: bodies with the structure of the real API's, generated from the request so the same
+    request always receives the same response. Synthetic DONKI events are generated for each day, so overlapping date
+    ranges return the same events, and their :code:`linkedEvents` refer to other synthetic events.
+
+    Parameters
+    ----------
+    host : str, default '127.0.0.1'
+        The address the server listens on.
+    port : int, default 0
+        The port the server listens on. If 0, a free port is chosen.
+    recording : str, default None
+        Path of a file written by :class:`~nasapy.transport.RecordTransport` holding responses to serve. Requests
+        without a recorded response receive a synthetic one.
+    latency : int, float, tuple, default 0
+        Number of seconds each response is delayed by, or a (minimum, maximum) tuple the delay of each response is
+        drawn uniformly from.
+    error_rate : float, default 0
+        Fraction of requests, between 0 and 1, answered with an error instead of a response.
+    error_status : int, sequence, default 503
+        The status code of the injected errors, or a sequence of status codes each error's status is drawn from.
+    retry_after : int, float, default None
+        Value of the :code:`Retry-After` header sent with injected errors and rate limit errors. No header is sent if
+        None.
+    rate_limit : int, default 1000
+        The number of requests allowed for each API key per :code:`rate_limit_period`. Responses from api.nasa.gov
+        carry :code:`X-RateLimit-Limit` and :code:`X-RateLimit-Remaining` headers, as the real API's do, and
+        requests sent once a key's limit is reached are answered with a 429 (Too Many Requests) status. If None,
+        requests are not limited and no rate limit headers are sent.
+    rate_limit_period : int, float, default 3600
+        Number of seconds after a key's first request its limit is reset.
+    rows : int, default 100
+        The number of rows or items in synthetic responses holding a list of records, such as close approaches or
+        Sentry objects, before the request's own limit parameter is applied.
+    seed : int, default 0
+        Seed of the synthetic responses and of the injected latency and errors.
+
+    Raises
+    ------
+    ValueError
+        Raised if :code:`error_rate` is not between 0 and 1 or :code:`rows` is negative.
+
+    Attributes
+    ----------
+    url : str
+        The base URL of the server, set once it is started.
+    requests : list
+        The URLs, as sent by the client, of the requests received.
+
+    Methods
+    -------
+    start
+        Starts serving requests in a background thread.
+    stop
+        Stops the server.
+    transport
+        Returns a transport sending a client's requests to the server.
+    respond
+        Returns the response the server sends to a request.
+
+    Examples
+    --------
+    # Load test a pipeline against a server answering in 20 to 80 milliseconds and failing 1% of the requests.
+    >>> with MockServer(latency=(0.02, 0.08), error_rate=0.01, rate_limit=None) as server:
+    ...     client = Client(transport=server.transport(), pool_maxsize=32)
+    ...     r = batch([('sentry', {'des': '99942'})] * 1000, max_workers=32, client=client)
+    # Serve the responses of a recorded session, with synthetic responses for anything not recorded.
+    >>> server = MockServer(recording='session.jsonl').start()
+    >>> n = Nasa(key='DEMO_KEY', client=Client(transport=server.transport()))
+
+    Notes
+    -----
+    Requests are served by one thread each, so the server handles as many concurrent requests as the client sends. The
+    server can also be run on its own with :code:`python -m nasapy.testing`, and clients in other processes pointed at
+    it with :code:`Client(transport=MockTransport(url))`.
+
+    """
+    def __init__(self, host='127.0.0.1', port=0, recording=None, latency=0, error_rate=0, error_status=503,
+                 retry_after=None, rate_limit=1000, rate_limit_period=3600, rows=100, seed=0):
+
+        if not 0 <= error_rate <= 1:
+            raise ValueError('error_rate parameter must be between 0 and 1.')
+
+        if rows < 0:
+            raise ValueError('rows parameter must not be negative.')
+
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = (error_status,) if isinstance(error_status, int) else tuple(error_status)
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit
+        self.rate_limit_period = rate_limit_period
+        self.rows = rows
+        self.seed = seed
+        self.url = None
+        self.requests = []
+        self._recorded = {}
+        self._windows = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+        if recording is not None:
+            with open(recording, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        interaction = json.loads(line)
+                        self._recorded[_request_key(interaction['method'], interaction['url'])] = interaction
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        r"""
+        Starts serving requests in a background thread.
+
+        Returns
+        -------
+        MockServer
+            The server, so it can be started as it is created.
+
+        """
+        if self._httpd is not None:
+            return self
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self.url = 'http://{0}:{1}'.format(*self._httpd.server_address[:2])
+
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        r"""
+        Stops the server and waits for its thread to finish.
+
+        """
+        if self._httpd is None:
+            return
+
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+        self._httpd = None
+        self._thread = None
+
+    def transport(self):
+        r"""
+        Returns a transport sending a client's requests to the server.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the server has not been started.
+
+        Returns
+        -------
+        MockTransport
+            The transport, to give as the :code:`transport` parameter of a client.
+
+        """
+        if self.url is None:
+            raise RuntimeError('the server must be started before creating a transport.')
+
+        return MockTransport(self.url)
+
+    def respond(self, method, url, headers=None):
+        r"""
+        Returns the response the server sends to a request, after applying the injected errors and rate limits but
+        without the latency.
+
+        Parameters
+        ----------
+        method : str
+            The method of the request.
+        url : str
+            The URL of the request, as sent by the client, e.g. 'https://ssd-api.jpl.nasa.gov/cad.api?des=433'.
+        headers : dict, default None
+            The headers of the request. An :code:`If-None-Match` header matching the response's :code:`ETag` is
+            answered with a 304 (Not Modified) status.
+
+        Returns
+        -------
+        tuple
+            The status code, a dictionary of headers and the body as bytes.
+
+        """
+        headers = headers if headers is not None else {}
+
+        with self._lock:
+            self.requests.append(url)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            status = self._random.choice(self.error_status)
+
+        _, netloc, _, query, _ = urlsplit(url)
+        params = dict(parse_qsl(query, keep_blank_values=True))
+        limit_headers = {}
+
+        if self.rate_limit is not None and netloc == 'api.nasa.gov':
+            remaining = self._take(params.get('api_key', ''))
+            limit_headers = {'X-RateLimit-Limit': str(self.rate_limit), 'X-RateLimit-Remaining': str(max(remaining, 0))}
+
+            if remaining < 0:
+                return self._error(429, limit_headers, {'error': {
+                    'code': 'OVER_RATE_LIMIT',
+                    'message': 'You have exceeded your rate limit. Try again later.'
+                }})
+
+        if failed:
+            return self._error(status, limit_headers, {'error': {'code': status, 'message': 'Injected error'}})
+
+        interaction = self._recorded.get(_request_key(method, url))
+
+        if interaction is not None:
+            status, response_headers, body = _recorded_response(interaction)
+        else:
+            status, response_headers, body = self._synthetic(url)
+
+        response_headers.update(limit_headers)
+
+        if status == 200:
+            etag = '"{0}"'.format(hashlib.sha1(body).hexdigest()[:20])
+            response_headers['ETag'] = etag
+
+            if headers.get('If-None-Match') == etag:
+                return 304, response_headers, b''
+
+        return status, response_headers, body
+
+    def _delay(self):
+        if isinstance(self.latency, (tuple, list)):
+            with self._lock:
+                return self._random.uniform(*self.latency)
+
+        return self.latency
+
+    def _take(self, key):
+        # Fixed windows starting at a key's first request, as with the real API's hourly limits.
+        now = time.monotonic()
+
+        with self._lock:
+            start, count = self._windows.get(key, (now, 0))
+
+            if now - start >= self.rate_limit_period:
+                start, count = now, 0
+
+            self._windows[key] = (start, count + 1)
+
+        return self.rate_limit - count - 1
+
+    def _error(self, status, headers, body):
+        headers = dict(headers)
+        headers['Content-Type'] = 'application/json'
+
+        if self.retry_after is not None:
+            headers['Retry-After'] = str(self.retry_after)
+
+        return status, headers, json.dumps(body).encode('utf-8')
+
+    def _synthetic(self, url):
+        scheme, netloc, path, query, _ = urlsplit(url)
+        params = dict(parse_qsl(query, keep_blank_values=True))
+
+        for host, pattern, func in _ROUTES:
+            if host != netloc:
+                continue
+
+            match = re.fullmatch(pattern, path)
+
+            if match is None:
+                continue
+
+            # Seeded with the request so the same request always receives the same response.
+            rng = random.Random('{seed}:{key}'.format(seed=self.seed, key=_request_key('GET', url)))
+            body = func(_Request(url, params, match, rng, self.rows, self.seed))
+
+            if isinstance(body, bytes):
+                return 200, {'Content-Type': 'application/octet-stream'}, body
+
+            if isinstance(body, str):
+                content_type = 'application/xml' if body.startswith('<?xml') else 'text/plain; charset=utf-8'
+                return 200, {'Content-Type': content_type}, body.encode('utf-8')
+
+            return 200, {'Content-Type': 'application/json'}, json.dumps(body).encode('utf-8')
+
+        return 404, {'Content-Type': 'application/json'}, json.dumps({'error': {
+            'code': 'NOT_FOUND',
+            'message': 'No such endpoint: {url}'.format(url=urlunsplit((scheme, netloc, path, '', '')))
+        }}).encode('utf-8')
+
+
+class MockTransport(BaseAdapter):
+    r"""
+    Transport sending requests to a :class:`MockServer` instead of the hosts they are addressed to.
+
+    The host of each request is moved into the path of a URL on the server, so
+    'https://ssd-api.jpl.nasa.gov/cad.api?des=433' is sent as '{url}/ssd-api.jpl.nasa.gov/cad.api?des=433'. The
+    responses keep the URL the request was addressed to.
+
+    Parameters
+    ----------
+    url : str
+        The base URL of the server, such as 'http://127.0.0.1:8000'.
+    transport : requests.adapters.BaseAdapter, default None
+        The transport sending the requests to the server. If None, a :code:`requests.adapters.HTTPAdapter` is used.
+
+    """
+    def __init__(self, url, transport=None):
+        super(MockTransport, self).__init__()
+
+        if transport is None:
+            transport = HTTPAdapter()
+
+        self.url = url.rstrip('/')
+        self.transport = transport
+
+    def send(self, request, **kwargs):
+        url = request.url
+        _, netloc, path, query, _ = urlsplit(url)
+
+        request = request.copy()
+        request.url = '{base}/{netloc}{path}'.format(base=self.url, netloc=netloc, path=path)
+
+        if query:
+            request.url += '?' + query
+
+        r = self.transport.send(request, **kwargs)
+        r.url = url
+
+        return r
+
+    def close(self):
+        self.transport.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        mock = self.server.mock
+        netloc, _, path = self.path.lstrip('/').partition('/')
+        path, _, query = path.partition('?')
+
+        url = urlunsplit(('https', netloc, '/' + path, query, ''))
+        status, headers, body = mock.respond('GET', url, headers=self.headers)
+
+        delay = mock._delay()
+
+        if delay > 0:
+            time.sleep(delay)
+
+        self.send_response(status)
+
+        for name, value in headers.items():
+            self.send_header(name, value)
+
+        self.send_header('Content-Length', str(len(body)))
+
+        # Clients that timed out waiting for a slow response have closed the connection by now.
+        try:
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+class _Request(object):
+
+    def __init__(self, url, params, match, rng, rows, seed):
+        self.url = url
+        self.params = params
+        self.match = match
+        self.rng = rng
+        self.rows = rows
+        self.seed = seed
+
+    def limit(self, name='limit'):
+        try:
+            return min(self.rows, int(self.params[name]))
+        except (KeyError, ValueError):
+            return self.rows
+
+    def date(self, name, default):
+        try:
+            return datetime.datetime.strptime(self.params[name], '%Y-%m-%d').date()
+        except (KeyError, ValueError):
+            return default
+
+    def number(self, low, high, digits=4):
+        return round(self.rng.uniform(low, high), digits)
+
+    def designation(self):
+        return '{year} {letters}{number}'.format(year=self.rng.randint(1990, 2021),
+                                                 letters=''.join(self.rng.choice('ABCDEFGHJKLMNOPQRSTUVWXY')
+                                                                 for _ in range(2)),
+                                                 number=self.rng.randint(1, 99))
+
+
+def _recorded_response(interaction):
+    if interaction['encoding'] == 'base64':
+        body = base64.b64decode(interaction['body'])
+    else:
+        body = interaction['body'].encode('utf-8')
+
+    # The recorded body is already decoded and its length is sent again by the server.
+    headers = {name: value for name, value in interaction['headers'].items()
+               if name.lower() not in ('content-encoding', 'transfer-encoding', 'content-length', 'connection')}
+
+    return interaction['status_code'], headers, body
+
+
+def _today():
+    return datetime.date.today()
+
+
+def _days(start, end):
+    for n in range((end - start).days + 1):
+        yield start + datetime.timedelta(days=n)
+
+
+# Average number of synthetic DONKI events of each type per day, and the types each type's events are linked to.
+_DONKI_RATES = {'FLR': 1.0, 'CME': 1.2, 'IPS': 0.3, 'GST': 0.1, 'SEP': 0.1, 'HSS': 0.2, 'MPC': 0.05, 'RBE': 0.1}
+
+_DONKI_LINKS = {'CME': ('FLR',), 'IPS': ('CME',), 'GST': ('CME', 'IPS'), 'SEP': ('FLR', 'CME'), 'HSS': ('IPS',),
+                'MPC': ('HSS',), 'RBE': ('HSS',)}
+
+_DONKI_IDS = {'FLR': 'flrID', 'CME': 'activityID', 'IPS': 'activityID', 'GST': 'gstID', 'SEP': 'sepID',
+              'HSS': 'hssID', 'MPC': 'mpcID', 'RBE': 'rbeID'}
+
+_DONKI_INSTRUMENTS = {'FLR': 'GOES16: EXIS 1.0-8.0', 'CME': 'SOHO: LASCO/C2', 'IPS': 'DSCOVR: PLASMAG',
+                      'GST': 'NOAA: Kp', 'SEP': 'STEREO A: IMPACT 13-100 MeV', 'HSS': 'ACE: SWEPAM',
+                      'MPC': 'MODEL: SWMF', 'RBE': 'GOES16: SEISS >2 MeV'}
+
+
+def _donki_times(seed, kind, day):
+    # The events of a type on a day depend only on the type and the day, so every query covering the day returns them.
+    rng = random.Random('{seed}:{kind}:{day}'.format(seed=seed, kind=kind, day=day))
+    n = sum(rng.random() < _DONKI_RATES[kind] / 3 for _ in range(3))
+
+    times = sorted(rng.randrange(24 * 60) for _ in range(n))
+
+    return [datetime.datetime.combine(day, datetime.time(t // 60, t % 60)) for t in times]
+
+
+def _donki_id(kind, t):
+    return '{time}-{kind}-001'.format(time=t.strftime('%Y-%m-%dT%H:%M:%S'), kind=kind)
+
+
+def _donki_time(t):
+    return t.strftime('%Y-%m-%dT%H:%MZ')
+
+
+def _donki_event(seed, kind, t):
+    rng = random.Random('{seed}:{id}'.format(seed=seed, id=_donki_id(kind, t)))
+    linked = []
+
+    for other in _DONKI_LINKS.get(kind, ()):
+        candidates = [c for n in range(3) for c in _donki_times(seed, other, t.date() - datetime.timedelta(days=n))
+                      if c < t]
+
+        if candidates and rng.random() < 0.6:
+            linked.append({'activityID': _donki_id(other, max(candidates))})
+
+    event = {
+        _DONKI_IDS[kind]: _donki_id(kind, t),
+        'instruments': [{'displayName': _DONKI_INSTRUMENTS[kind]}],
+        'linkedEvents': linked or None,
+        'link': 'https://kauai.ccmc.gsfc.nasa.gov/DONKI/view/{kind}/{n}/-1'.format(kind=kind,
+                                                                                  n=rng.randint(10000, 99999))
+    }
+
+    if kind == 'FLR':
+        event.update({
+            'beginTime': _donki_time(t),
+            'peakTime': _donki_time(t + datetime.timedelta(minutes=rng.randint(3, 30))),
+            'endTime': _donki_time(t + datetime.timedelta(minutes=rng.randint(31, 90))),
+            'classType': '{0}{1:.1f}'.format(rng.choice('BCCCMMX'), rng.uniform(1, 9.9)),
+            'sourceLocation': '{0}{1:02d}{2}{3:02d}'.format(rng.choice('NS'), rng.randint(0, 40), rng.choice('EW'),
+                                                           rng.randint(0, 90)),
+            'activeRegionNum': rng.randint(12700, 13000)
+        })
+    elif kind == 'CME':
+        event.update({
+            'catalog': 'M2M_CATALOG',
+            'startTime': _donki_time(t),
+            'sourceLocation': '',
+            'activeRegionNum': None,
+            'note': '',
+            'cmeAnalyses': [_cme_analysis(rng, t, None)]
+        })
+    elif kind == 'IPS':
+        event.update({
+            'catalog': 'M2M_CATALOG',
+            'location': rng.choice(('Earth', 'Earth', 'STEREO A', 'MESSENGER')),
+            'eventTime': _donki_time(t)
+        })
+    elif kind == 'GST':
+        event.update({
+            'startTime': _donki_time(t),
+            'allKpIndex': [{'observedTime': _donki_time(t + datetime.timedelta(hours=3 * n)),
+                            'kpIndex': rng.choice((5, 5.33, 5.67, 6, 6.33, 7)), 'source': 'NOAA'} for n in range(2)]
+        })
+    else:
+        event['eventTime'] = _donki_time(t)
+
+    return event
+
+
+def _cme_analysis(rng, t, cme_id):
+    analysis = {
+        'time21_5': _donki_time(t + datetime.timedelta(hours=rng.randint(2, 12))),
+        'latitude': float(rng.randint(-40, 40)),
+        'longitude': float(rng.randint(-180, 180)),
+        'halfAngle': float(rng.randint(10, 60)),
+        'speed': float(rng.randint(200, 1500)),
+        'type': rng.choice('SSSCO'),
+        'isMostAccurate': True,
+        'note': '',
+        'catalog': 'M2M_CATALOG',
+        'link': 'https://kauai.ccmc.gsfc.nasa.gov/DONKI/view/CMEAnalysis/{n}/-1'.format(n=rng.randint(10000, 99999))
+    }
+
+    if cme_id is not None:
+        analysis['associatedCMEID'] = cme_id
+
+    return analysis
+
+
+def _donki_range(request):
+    end = request.date('endDate', _today())
+    start = request.date('startDate', end - datetime.timedelta(days=30))
+
+    return start, end
+
+
+def _donki(request):
+    kind = request.match.group(1)
+    start, end = _donki_range(request)
+    events = []
+
+    for day in _days(start, end):
+        for t in _donki_times(request.seed, 'CME' if kind in ('CMEAnalysis', 'WSAEnlilSimulations') else kind, day):
+            rng = random.Random('{seed}:{kind}:{t}'.format(seed=request.seed, kind=kind, t=t))
+
+            if kind == 'CMEAnalysis':
+                event = _cme_analysis(rng, t, _donki_id('CME', t))
+
+                if event['speed'] < float(request.params.get('speed', 0)) or \
+                        event['halfAngle'] < float(request.params.get('halfAngle', 0)):
+                    continue
+            elif kind == 'WSAEnlilSimulations':
+                event = {
+                    'simulationID': 'WSA-ENLIL/{n}/1'.format(n=rng.randint(10000, 99999)),
+                    'modelCompletionTime': _donki_time(t + datetime.timedelta(hours=rng.randint(6, 30))),
+                    'au': 2.0,
+                    'cmeInputs': [dict(_cme_analysis(rng, t, None), cmeStartTime=_donki_time(t),
+                                       cmeid=_donki_id('CME', t))],
+                    'estimatedShockArrivalTime': None,
+                    'estimatedDuration': None,
+                    'isEarthGB': rng.random() < 0.3,
+                    'impactList': None,
+                    'link': 'https://kauai.ccmc.gsfc.nasa.gov/DONKI/view/WSA-ENLIL/{n}/-1'
+                            .format(n=rng.randint(10000, 99999))
+                }
+            else:
+                event = _donki_event(request.seed, kind, t)
+
+                if kind == 'IPS' and request.params.get('location', 'ALL') not in ('ALL', event['location']):
+                    continue
+
+            events.append(event)
+
+    # The DONKI API returns an empty body rather than an empty array when no event matches.
+    return events or ''
+
+
+def _apod(request):
+    date = request.date('date', _today())
+    hd = request.params.get('hd', 'False').lower() == 'true'
+
+    result = {
+        'date': date.isoformat(),
+        'title': 'Synthetic Picture of the Day',
+        'explanation': 'A synthetic picture of the day served by nasapy.testing.MockServer.',
+        'media_type': 'image',
+        'service_version': 'v1',
+        'url': 'https://apod.nasa.gov/apod/image/{0:%y%m}/synthetic{0:%d}.jpg'.format(date)
+    }
+
+    if hd:
+        result['hdurl'] = result['url'].replace('.jpg', '_hd.jpg')
+
+    return result
+
+
+def _mars_weather(request):
+    return {'sol_keys': [], 'validity_checks': {'sols_checked': [], 'sol_hours_required': 18}}
+
+
+def _neo(request, neo_id=None, date=None):
+    rng = request.rng
+    neo_id = neo_id if neo_id is not None else str(rng.randint(2000000, 3999999))
+    h = request.number(15, 30, 2)
+    diameter = 1329 / 0.15 ** 0.5 * 10 ** (-h / 5)
+    date = date if date is not None else request.date('start_date', _today())
+
+    return {
+        'links': {'self': 'http://www.neowsapp.com/rest/v1/neo/{id}'.format(id=neo_id)},
+        'id': neo_id,
+        'neo_reference_id': neo_id,
+        'name': '({designation})'.format(designation=request.designation()),
+        'nasa_jpl_url': 'http://ssd.jpl.nasa.gov/sbdb.cgi?sstr={id}'.format(id=neo_id),
+        'absolute_magnitude_h': h,
+        'estimated_diameter': {'kilometers': {'estimated_diameter_min': round(diameter * 0.45, 6),
+                                              'estimated_diameter_max': round(diameter, 6)}},
+        'is_potentially_hazardous_asteroid': rng.random() < 0.1,
+        'close_approach_data': [{
+            'close_approach_date': date.isoformat(),
+            'relative_velocity': {'kilometers_per_second': str(request.number(2, 30))},
+            'miss_distance': {'astronomical': str(request.number(0.001, 0.5, 8))},
+            'orbiting_body': 'Earth'
+        }],
+        'is_sentry_object': rng.random() < 0.02
+    }
+
+
+def _neo_feed(request):
+    start = request.date('start_date', _today())
+    end = request.date('end_date', start + datetime.timedelta(days=7))
+    objects = {}
+
+    for day in _days(start, end):
+        objects[day.isoformat()] = [_neo(request, date=day) for _ in range(request.rng.randint(5, 20))]
+
+    return {
+        'links': {},
+        'element_count': sum(len(neos) for neos in objects.values()),
+        'near_earth_objects': objects
+    }
+
+
+def _neo_lookup(request):
+    return _neo(request, neo_id=request.match.group(1))
+
+
+def _neo_browse(request):
+    size = request.limit('size')
+
+    return {
+        'links': {},
+        'page': {'size': size, 'total_elements': 25000, 'total_pages': 25000 // max(size, 1),
+                 'number': int(request.params.get('page', 0))},
+        'near_earth_objects': [_neo(request) for _ in range(size)]
+    }
+
+
+def _epic_images(request):
+    color, date = request.match.group(1), request.match.group(2)
+
+    return [{
+        'identifier': '{date}{n:06d}'.format(date=date.replace('-', ''), n=n * 11000),
+        'caption': "This image was taken by NASA's EPIC camera onboard the NOAA DSCOVR spacecraft",
+        'image': 'epic_{kind}_{date}{n:06d}'.format(kind='RGB' if color == 'enhanced' else '1b',
+                                                    date=date.replace('-', ''), n=n * 11000),
+        'version': '03',
+        'centroid_coordinates': {'lat': request.number(-30, 30, 6), 'lon': request.number(-180, 180, 6)},
+        'date': '{date} {n:02d}:10:00'.format(date=date, n=n)
+    } for n in range(request.rng.randint(8, 13))]
+
+
+def _epic_dates(request):
+    end = _today()
+
+    return [(end - datetime.timedelta(days=n)).isoformat() for n in range(request.rows)]
+
+
+def _epic_all(request):
+    return [{'date': date} for date in _epic_dates(request)]
+
+
+def _earth_imagery(request):
+    return {
+        'date': request.date('date', _today()).isoformat() + 'T03:12:13.000000',
+        'id': 'LC8_L1T_TOA/LC81270592016{n:03d}LGN00'.format(n=request.rng.randint(1, 365)),
+        'resource': {'dataset': 'LC8_L1T_TOA', 'planet': 'earth'},
+        'service_version': 'v1',
+        'url': 'https://earthengine.googleapis.com/api/thumb?thumbid={id}'.format(id=request.rng.getrandbits(64))
+    }
+
+
+def _earth_assets(request):
+    start = request.date('begin_date', _today() - datetime.timedelta(days=30))
+    end = request.date('end_date', _today())
+    results = [{'date': day.isoformat() + 'T03:12:13', 'id': 'LC8_L1T_TOA/LC8127059{0:%Y%j}LGN00'.format(day)}
+               for day in _days(start, end) if day.toordinal() % 16 == 0]
+
+    return {'count': len(results), 'results': results, 'service_version': 'v1'}
+
+
+def _mars_photos(request):
+    rover = request.match.group(1)
+    sol = int(request.params.get('sol', request.rng.randint(0, 3000)))
+    earth_date = request.params.get('earth_date', _today().isoformat())
+    camera = request.params.get('camera', 'FHAZ').upper()
+
+    return {'photos': [{
+        'id': request.rng.randint(100000, 999999),
+        'sol': sol,
+        'camera': {'name': camera, 'full_name': camera},
+        'img_src': 'http://mars.jpl.nasa.gov/msl-raw-images/{rover}/{sol:05d}/{n}.JPG'.format(rover=rover, sol=sol,
+                                                                                            n=n),
+        'earth_date': earth_date,
+        'rover': {'name': rover.capitalize(), 'status': 'active'}
+    } for n in range(min(request.rows, 25))]}
+
+
+def _techport_projects(request):
+    return {'projects': {
+        'totalCount': request.rows,
+        'projects': [{'id': request.rng.randint(10000, 99999),
+                      'lastUpdated': request.params.get('updatedSince', _today().isoformat())}
+                     for _ in range(request.rows)]
+    }}
+
+
+def _techport_project(request):
+    project_id = request.match.group(1)
+
+    if request.match.group(2):
+        return ('<?xml version="1.0" encoding="UTF-8"?>\n<project><id>{id}</id><title>Synthetic project</title>'
+                '</project>'.format(id=project_id))
+
+    return {'project': {'id': int(project_id), 'title': 'Synthetic project', 'status': 'Active',
+                        'lastUpdated': _today().isoformat()}}
+
+
+def _genelab(request):
+    size = request.limit('size')
+
+    return {'hits': {'total': 261, 'hits': [{
+        '_id': 'GLDS-{n}'.format(n=request.rng.randint(1, 400)),
+        '_source': {'Study Title': 'Synthetic study', 'Project Identifier': request.params.get('term', '')}
+    } for _ in range(size)]}}
+
+
+def _images_search(request):
+    items = []
+
+    for _ in range(min(request.rows, 100)):
+        nasa_id = 'synthetic-{n}'.format(n=request.rng.randint(10000, 99999))
+
+        items.append({
+            'href': 'https://images-assets.nasa.gov/image/{id}/collection.json'.format(id=nasa_id),
+            'data': [{'nasa_id': nasa_id, 'title': request.params.get('q', 'Synthetic image'), 'media_type': 'image',
+                      'center': request.params.get('center', 'JSC'),
+                      'date_created': _today().isoformat() + 'T00:00:00Z'}],
+            'links': [{'href': 'https://images-assets.nasa.gov/image/{id}/{id}~thumb.jpg'.format(id=nasa_id),
+                       'rel': 'preview', 'render': 'image'}]
+        })
+
+    return {'collection': {'version': '1.0', 'href': request.url, 'items': items,
+                           'metadata': {'total_hits': len(items)}, 'links': []}}
+
+
+def _images_asset(request):
+    nasa_id = request.match.group(1)
+
+    return {'collection': {'version': '1.0', 'href': request.url, 'items': [
+        {'href': 'http://images-assets.nasa.gov/image/{id}/{id}~{size}.jpg'.format(id=nasa_id, size=size)}
+        for size in ('orig', 'large', 'medium', 'small', 'thumb')
+    ] + [{'href': 'http://images-assets.nasa.gov/image/{id}/metadata.json'.format(id=nasa_id)}]}}
+
+
+def _images_location(request):
+    endpoint, nasa_id = request.match.group(1), request.match.group(2)
+
+    if endpoint == 'metadata':
+        return {'location': 'https://images-assets.nasa.gov/image/{id}/metadata.json'.format(id=nasa_id)}
+
+    return {'location': 'https://images-assets.nasa.gov/video/{id}/{id}.srt'.format(id=nasa_id)}
+
+
+def _images_metadata(request):
+    return {'AVAIL:NASAID': request.match.group(1), 'AVAIL:Title': 'Synthetic image', 'File:FileType': 'JPEG'}
+
+
+def _images_captions(request):
+    return '1\n00:00:00,000 --> 00:00:05,000\nSynthetic captions.\n'
+
+
+def _tle_member(request, number=None):
+    number = number if number is not None else request.rng.randint(10000, 50000)
+
+    return {
+        '@id': 'https://data.ivanstanojevic.me/api/tle/{n}'.format(n=number),
+        '@type': 'TleModel',
+        'satelliteId': number,
+        'name': request.params.get('search', 'SYNTHETIC').upper() + ' {n}'.format(n=number),
+        'date': _today().isoformat() + 'T00:00:00+00:00',
+        'line1': '1 {n:05d}U 98067A   21203.50000000  .00001000  00000-0  20000-4 0  9991'.format(n=number % 100000),
+        'line2': '2 {n:05d}  51.6400 100.0000 0001000  90.0000 270.0000 15.49000000000000'.format(n=number % 100000)
+    }
+
+
+def _tle(request):
+    if request.match.group(1):
+        return _tle_member(request, int(request.match.group(1)))
+
+    members = [_tle_member(request) for _ in range(min(request.rows, 20))]
+
+    return {'@context': 'http://www.w3.org/ns/hydra/context.jsonld', '@id': request.url, '@type': 'Collection',
+            'totalItems': request.rows, 'member': members, 'parameters': {'search': request.params.get('search', '*')}}
+
+
+def _ssd(source, version, **members):
+    result = {'signature': {'source': source, 'version': version}}
+    result.update(members)
+
+    return result
+
+
+def _cad(request):
+    rows = []
+
+    for _ in range(request.limit()):
+        dist = request.number(0.0001, float(request.params.get('dist-max', 0.05)), 8)
+        jd = request.number(2415020, 2488070, 6)
+
+        rows.append([request.params.get('des', request.designation()), str(request.rng.randint(1, 200)), str(jd),
+                     '{0:%Y-%b-%d %H:%M}'.format(datetime.datetime(2000, 1, 1) +
+                                                 datetime.timedelta(days=jd - 2451544.5)),
+                     str(dist), str(round(dist * 0.99, 8)), str(round(dist * 1.01, 8)), str(request.number(1, 40)),
+                     str(request.number(1, 40)), '< 00:01', str(request.number(10, 32, 1))])
+
+    return _ssd('NASA/JPL SBDB Close Approach Data API', '1.3', count=str(len(rows)),
+                fields=['des', 'orbit_id', 'jd', 'cd', 'dist', 'dist_min', 'dist_max', 'v_rel', 'v_inf', 't_sigma_f',
+                        'h'],
+                data=rows)
+
+
+def _fireball(request):
+    rows = []
+
+    for _ in range(request.limit()):
+        located = request.rng.random() < 0.8
+        date = datetime.datetime(1988, 1, 1) + datetime.timedelta(seconds=request.rng.randrange(34 * 365 * 86400))
+
+        rows.append(['{0:%Y-%m-%d %H:%M:%S}'.format(date), str(request.rng.randint(20, 5000)),
+                     str(request.number(0.07, 20, 3)),
+                     str(request.number(0, 90, 1)) if located else None, request.rng.choice('NS') if located else None,
+                     str(request.number(0, 180, 1)) if located else None, request.rng.choice('EW') if located else None,
+                     str(request.number(20, 60, 1)) if located else None,
+                     str(request.number(11, 30, 1)) if located else None])
+
+    rows.sort(reverse=True)
+
+    return _ssd('NASA/JPL Fireball Data API', '1.0', count=str(len(rows)),
+                fields=['date', 'energy', 'impact-e', 'lat', 'lat-dir', 'lon', 'lon-dir', 'alt', 'vel'], data=rows)
+
+
+def _sentry_object(request, des=None):
+    des = des if des is not None else request.designation()
+
+    return {'des': des, 'fullname': '({des})'.format(des=des), 'ip': '{0:.4e}'.format(request.number(1e-9, 1e-3, 12)),
+            'ps_cum': str(request.number(-10, -1, 2)), 'ps_max': str(request.number(-10, -1, 2)), 'ts_max': '0',
+            'n_imp': str(request.rng.randint(1, 200)), 'range': '2050-2120', 'h': str(request.number(17, 30, 2)),
+            'diameter': str(request.number(0.005, 1, 3)), 'v_inf': str(request.number(1, 30)),
+            'last_obs': '2021-Jul-01', 'last_obs_jd': '2459396.5', 'id': 'bJ{0}'.format(request.rng.randint(10, 99))}
+
+
+def _sentry(request):
+    des = request.params.get('des', request.params.get('spk'))
+
+    if des is not None:
+        return _ssd('NASA/JPL Sentry Data API', '1.1', summary=_sentry_object(request, des), data=[
+            {'date': '{0}-{1:02d}-01.00'.format(2050 + n, request.rng.randint(1, 12)),
+             'ip': '{0:.4e}'.format(request.number(1e-9, 1e-4, 12)), 'ps': str(request.number(-10, -2, 2)),
+             'ts': '0', 'energy': '{0:.3e}'.format(request.number(1, 1000)), 'sigma_vi': str(request.number(-3, 3))}
+            for n in range(min(request.rows, 50))
+        ])
+
+    data = [_sentry_object(request) for _ in range(request.rows)]
+
+    return _ssd('NASA/JPL Sentry Data API', '1.1', count=str(len(data)), data=data)
+
+
+def _scout_object(request, name=None):
+    return {'objectName': name if name is not None else str(request.rng.randint(1000000, 9999999)),
+            'lastRun': '{0} 12:00'.format(_today().isoformat()), 'nObs': str(request.rng.randint(3, 40)),
+            'arc': str(request.number(0.1, 10, 2)), 'H': str(request.number(18, 30, 1)),
+            'rmsN': str(request.number(0.1, 1, 2)), 'neoScore': str(request.rng.randint(0, 100)),
+            'phaScore': str(request.rng.randint(0, 100)), 'ieoScore': '0', 'geocentricScore': '0',
+            'neo1kmScore': '0', 'tisserandScore': str(request.rng.randint(0, 100)), 'moid': str(request.number(0, 1, 3)),
+            'rating': None, 'ra': '18:37', 'dec': '-37', 'Vmag': str(request.number(18, 22, 1)),
+            'elong': str(request.rng.randint(1, 180)), 'rate': str(request.number(0.1, 10, 1)),
+            'unc': str(request.rng.randint(1, 200)), 'uncP1': str(request.rng.randint(1, 200)),
+            'tEphem': '{0} 18:15'.format(_today().isoformat()), 'caDist': None, 'vInf': None}
+
+
+def _scout(request):
+    if 'tdes' in request.params:
+        return dict(_scout_object(request, request.params['tdes']),
+                    signature={'source': 'NASA/JPL Scout API', 'version': '1.2'})
+
+    data = [_scout_object(request) for _ in range(request.rows)]
+
+    return _ssd('NASA/JPL Scout API', '1.2', count=str(len(data)), data=data)
+
+
+def _nhats_object(request, des=None):
+    des = des if des is not None else request.designation()
+
+    return {'des': des, 'fullname': '       ({des})'.format(des=des), 'orbit_id': str(request.rng.randint(1, 60)),
+            'h': str(request.number(20, 30, 1)), 'occ': str(request.rng.randint(0, 9)),
+            'min_size': str(request.rng.randint(5, 100)), 'max_size': str(request.rng.randint(100, 500)),
+            'n_via_traj': str(request.rng.randint(1, 20000)),
+            'min_dv': {'dv': str(request.number(4, 12, 3)), 'dur': str(request.rng.randint(100, 450))},
+            'min_dur': {'dv': str(request.number(4, 12, 3)), 'dur': str(request.rng.randint(60, 450))},
+            'obs_start': None, 'obs_end': None, 'obs_mag': None, 'obs_flag': ' ', 'radar_obs_a': None,
+            'radar_obs_g': None, 'radar_snr_a': None, 'radar_snr_g': None}
+
+
+def _nhats(request):
+    des = request.params.get('des', request.params.get('spk'))
+
+    if des is not None:
+        return dict(_nhats_object(request, des), signature={'source': 'NASA/JPL NHATS Data API', 'version': '1.3'})
+
+    data = [_nhats_object(request) for _ in range(request.rows)]
+
+    return _ssd('NASA/JPL NHATS Data API', '1.3', count=str(len(data)), data=data)
+
+
+def _mdesign(request):
+    des = request.params.get('des', request.params.get('sstr', request.params.get('spk', '1')))
+
+    if 'des' not in request.params and 'sstr' not in request.params and 'spk' not in request.params:
+        data = [[request.designation(), str(request.rng.randint(1, 60)), str(request.number(4, 12, 3)),
+                 str(request.rng.randint(100, 1000))] for _ in range(request.limit('lim'))]
+
+        return _ssd('NASA/JPL Small-Body Mission Design API', '1.1', count=str(len(data)),
+                    fields=['name', 'orbit_id', 'dv_total', 'tof'], data=data)
+
+    return _ssd('NASA/JPL Small-Body Mission Design API', '1.1', object={'des': des, 'fullname': des},
+                fields=['MJD0', 'MJDf', 'vinf_dep', 'vinf_arr', 'phase_ang', 'earth_dist', 'elong_arr', 'decl_dep',
+                        'approach_ang', 'tof'],
+                selectedMissions=[[request.rng.randint(60000, 70000) + n for n in (0, 200)] +
+                                  [request.number(1, 30) for _ in range(7)] + [200]
+                                  for _ in range(min(request.rows, 50))])
+
+
+def _exoplanets(request):
+    columns = [c.strip() for c in request.params.get('select', '').split(',') if c.strip()] or \
+              ['pl_hostname', 'pl_letter', 'pl_orbper', 'pl_bmassj', 'pl_radj', 'ra', 'dec', 'st_dist']
+    rows = []
+
+    for _ in range(request.rows):
+        row = {}
+
+        for column in columns:
+            if column == 'pl_hostname':
+                row[column] = 'Synthetic-{n}'.format(n=request.rng.randint(1, 5000))
+            elif column == 'pl_letter':
+                row[column] = request.rng.choice('bcdef')
+            else:
+                row[column] = request.number(0, 360, 6)
+
+        rows.append(row)
+
+    return rows
+
+
+_ROUTES = [
+    ('api.nasa.gov', r'/planetary/apod', _apod),
+    ('api.nasa.gov', r'/insight_weather/?', _mars_weather),
+    ('api.nasa.gov', r'/neo/rest/v1/feed', _neo_feed),
+    ('api.nasa.gov', r'/neo/rest/v1/neo/browse/?', _neo_browse),
+    ('api.nasa.gov', r'/neo/rest/v1/neo/(\w+)', _neo_lookup),
+    ('api.nasa.gov', r'/DONKI/(FLR|CME|IPS|GST|SEP|HSS|MPC|RBE|CMEAnalysis|WSAEnlilSimulations)', _donki),
+    ('api.nasa.gov', r'/EPIC/api/(natural|enhanced)/date/([0-9-]+)', _epic_images),
+    ('api.nasa.gov', r'/EPIC/api/(?:natural|enhanced)/available', _epic_dates),
+    ('api.nasa.gov', r'/EPIC/api/(?:natural|enhanced)/all', _epic_all),
+    ('api.nasa.gov', r'/planetary/earth/imagery/?', _earth_imagery),
+    ('api.nasa.gov', r'/planetary/earth/assets/?', _earth_assets),
+    ('api.nasa.gov', r'/mars-photos/api/v1/rovers/(\w+)/photos', _mars_photos),
+    ('api.nasa.gov', r'/techport/api/projects/?', _techport_projects),
+    ('api.nasa.gov', r'/techport/api/projects/(\d+)(\.xml)?', _techport_project),
+    ('genelab-data.ndc.nasa.gov', r'/genelab/data/search', _genelab),
+    ('images-api.nasa.gov', r'/search', _images_search),
+    ('images-api.nasa.gov', r'/asset/(.+)', _images_asset),
+    ('images-api.nasa.gov', r'/(metadata|captions)/(.+)', _images_location),
+    ('images-assets.nasa.gov', r'/image/(.+)/metadata\.json', _images_metadata),
+    ('images-assets.nasa.gov', r'/video/.+\.srt', _images_captions),
+    ('data.ivanstanojevic.me', r'/api/tle/?(\d+)?/?', _tle),
+    ('ssd-api.jpl.nasa.gov', r'/cad\.api', _cad),
+    ('ssd-api.jpl.nasa.gov', r'/fireball\.api', _fireball),
+    ('ssd-api.jpl.nasa.gov', r'/sentry\.api', _sentry),
+    ('ssd-api.jpl.nasa.gov', r'/scout\.api', _scout),
+    ('ssd-api.jpl.nasa.gov', r'/nhats\.api', _nhats),
+    ('ssd-api.jpl.nasa.gov', r'/mdesign\.api', _mdesign),
+    ('exoplanetarchive.ipac.caltech.edu', r'/cgi-bin/nstedAPI/nph-nstedAPI', _exoplanets),
+]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve synthetic or recorded responses for the APIs wrapped by '
+                                                 'nasapy. Point clients at the server with '
+                                                 'Client(transport=MockTransport(url)).')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--recording', help='file written by RecordTransport to serve responses from')
+    parser.add_argument('--latency', type=float, nargs='+', default=[0],
+                        help='seconds each response is delayed by, or a minimum and maximum')
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--error-status', type=int, nargs='+', default=[503])
+    parser.add_argument('--retry-after', type=float)
+    parser.add_argument('--rate-limit', type=int, default=1000, help='requests per key and hour; 0 disables it')
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockServer(host=args.host, port=args.port, recording=args.recording,
+                        latency=args.latency[0] if len(args.latency) == 1 else tuple(args.latency[:2]),
+                        error_rate=args.error_rate, error_status=args.error_status, retry_after=args.retry_after,
+                        rate_limit=args.rate_limit or None, rows=args.rows, seed=args.seed).start()
+
+    print('Serving on {url}'.format(url=server.url))
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
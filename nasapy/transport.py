@@ -0,0 +1,192 @@
+# encoding=utf-8
+
+"""
+
+"""
+
+
+import base64
+import datetime
+import json
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from nasapy.cache import _build_response, _drop_api_key
+
+
+class RecordTransport(BaseAdapter):
+    r"""
+    Transport sending requests through another transport and saving every request and response to a file, which can
+    later be served without a network connection by :class:`ReplayTransport`.
+
+    A transport is a requests transport adapter (a :code:`requests.adapters.BaseAdapter`) given as the
+    :code:`transport` parameter of :class:`~nasapy.client.Client` or :class:`~nasapy.client.AsyncClient`; every
+    request made by the client, whichever endpoint it is for, is sent through it.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file the requests and responses are appended to, one JSON object per line. The file is created if
+        it does not exist.
+    transport : requests.adapters.BaseAdapter, default None
+        The transport sending the requests. If None, a :code:`requests.adapters.HTTPAdapter` is used.
+
+    Examples
+    --------
+    # Record the responses of a session, then run it again offline.
+    >>> with Client(transport=RecordTransport('session.jsonl')) as client:
+    ...     close_approach(des=433, client=client)
+    >>> with Client(transport=ReplayTransport('session.jsonl')) as client:
+    ...     close_approach(des=433, client=client)
+
+    Notes
+    -----
+    The :code:`api_key` parameter is removed from the recorded URLs, so recordings can be shared as test fixtures or
+    benchmark inputs without exposing the key they were made with. Response bodies are read in full before being
+    saved, so streamed responses are not read incrementally while recording.
+
+    """
+    def __init__(self, path, transport=None):
+        super(RecordTransport, self).__init__()
+
+        if transport is None:
+            transport = HTTPAdapter()
+
+        self.path = path
+        self.transport = transport
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        r = self.transport.send(request, **kwargs)
+
+        line = json.dumps(_interaction(request, r))
+
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+        return r
+
+    def close(self):
+        self.transport.close()
+
+
+class ReplayTransport(BaseAdapter):
+    r"""
+    Transport answering requests with the responses saved by :class:`RecordTransport`, without a network connection.
+
+    Requests are matched on their method and URL. The :code:`api_key` parameter and the order of the query string
+    parameters are ignored, so responses recorded with one API key can be replayed with another. If a request was
+    recorded several times, the last response recorded is returned.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file written by :class:`RecordTransport`.
+
+    Raises
+    ------
+    FileNotFoundError
+        Raised if :code:`path` does not exist.
+
+    Attributes
+    ----------
+    requests : list
+        The requests sent through the transport.
+
+    Examples
+    --------
+    # Run a load test against recorded responses.
+    >>> client = Client(transport=ReplayTransport('session.jsonl'))
+    >>> r = batch([('sentry', {'des': '99942'})] * 1000, max_workers=32, client=client)
+
+    Notes
+    -----
+    A request that was not recorded raises a :code:`requests.exceptions.RequestException`, which is not retried.
+
+    """
+    def __init__(self, path):
+        super(ReplayTransport, self).__init__()
+
+        self.path = path
+        self.requests = []
+        self._interactions = {}
+        self._lock = threading.Lock()
+
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    interaction = json.loads(line)
+                    self._interactions[_request_key(interaction['method'], interaction['url'])] = interaction
+
+    def __len__(self):
+        return len(self._interactions)
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.requests.append(request)
+
+        interaction = self._interactions.get(_request_key(request.method, request.url))
+
+        if interaction is None:
+            raise requests.exceptions.RequestException('no recorded response for {method} {url}'
+                                                       .format(method=request.method, url=request.url),
+                                                       request=request)
+
+        return _replay(request, interaction, self)
+
+    def close(self):
+        pass
+
+
+def _request_key(method, url):
+    scheme, netloc, path, query, _ = urlsplit(url)
+    query = urlencode(sorted((name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+                             if name != 'api_key'))
+
+    return method.upper(), urlunsplit((scheme, netloc, path, query, ''))
+
+
+def _interaction(request, r):
+    content = r.content
+
+    try:
+        body, encoding = content.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        body, encoding = base64.b64encode(content).decode('ascii'), 'base64'
+
+    return {
+        'method': request.method,
+        'url': _drop_api_key(request.url),
+        'status_code': r.status_code,
+        'reason': r.reason,
+        'headers': dict(r.headers),
+        'body': body,
+        'encoding': encoding
+    }
+
+
+def _replay(request, interaction, transport):
+    if interaction['encoding'] == 'base64':
+        content = base64.b64decode(interaction['body'])
+    else:
+        content = interaction['body'].encode('utf-8')
+
+    r = _build_response(url=request.url,
+                        status_code=interaction['status_code'],
+                        reason=interaction['reason'],
+                        headers=interaction['headers'],
+                        content=content)
+    r._content_consumed = True
+    r.request = request
+    r.connection = transport
+    r.elapsed = datetime.timedelta(0)
+
+    # The recorded body is already decoded, so the headers describing its transfer no longer apply.
+    for name in ('Content-Encoding', 'Transfer-Encoding'):
+        r.headers.pop(name, None)
+
+    return r
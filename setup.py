@@ -12,7 +12,9 @@ setup(
     include_package_data=True,
     long_description=open('README.md').read(),
     long_description_content_type='text/markdown',
-    install_requires=['requests >= 2.18'],
+    python_requires='>=3.7',
+    install_requires=['requests >= 2.27'],
+    extras_require={'async': ['aiohttp >= 3.7'], 'orjson': ['orjson >= 3.0'], 'pandas': ['pandas >= 1.0']},
     home_page='',
     classifiers=[
         'Environment :: Console',
@@ -22,10 +24,8 @@ setup(
         'Operating System :: OS Independent',
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
         'Topic :: Software Development :: Libraries :: Python Modules'
     ]
 )
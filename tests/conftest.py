@@ -0,0 +1,124 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from nasapy.client import Client
+from nasapy.ratelimit import default_rate_limiter
+
+
+@pytest.fixture(autouse=True)
+def unthrottled(monkeypatch):
+    # The cassettes replay the rate limit headers of the DEMO_KEY they were recorded with, which would otherwise make
+    # the shared throttle wait for the key's quota to refill.
+    monkeypatch.setattr(default_rate_limiter(), 'reserve', lambda key: 0.0)
+
+
+class StubAdapter(BaseAdapter):
+
+    def __init__(self, body=None, status=200, headers=None, handler=None):
+        super(StubAdapter, self).__init__()
+
+        self.body = body if body is not None else {}
+        self.status = status
+        self.headers = headers if headers is not None else {'X-RateLimit-Remaining': '999'}
+        self.handler = handler
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self.lock:
+            self.requests.append((request, kwargs))
+
+        if self.handler is not None:
+            status, headers, body = self.handler(request)
+        else:
+            status, headers, body = self.status, self.headers, self.body
+
+        r = requests.Response()
+        r.status_code = status
+        r.reason = 'OK' if status == 200 else 'Error'
+        r.headers.update(headers)
+        r.encoding = requests.utils.get_encoding_from_headers(r.headers)
+        r._content = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        r._content_consumed = True
+        r.url = request.url
+        r.request = request
+
+        return r
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def stub_client():
+    def make(**kwargs):
+        adapter = StubAdapter(**kwargs)
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        return Client(session=session), adapter
+
+    return make
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        self.server.paths.append(self.path)
+
+        if path == '/DONKI/FLR':
+            body = [{'flrID': '2019-05-06T05:04:00-FLR-001', 'linkedEvents': None}]
+        elif path == '/DONKI/GST':
+            body = ''
+        elif path == '/cad.api':
+            body = {'count': '1', 'fields': ['des', 'dist'], 'data': [['433', '0.17']]}
+        elif path == '/metadata/as11-40-5874':
+            body = {'location': 'http://{0}:{1}/as11-40-5874/metadata.json'.format(*self.server.server_address)}
+        elif path == '/as11-40-5874/metadata.json':
+            body = {'AVAIL:NASAID': 'as11-40-5874'}
+        elif path == '/unavailable':
+            self.send_response(503, 'Service Unavailable')
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        else:
+            self.send_response(404, 'Not Found')
+            self.end_headers()
+            return
+
+        content = json.dumps(body).encode('utf-8') if body != '' else b''
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('X-RateLimit-Remaining', '998')
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.paths = []
+    httpd.base = 'http://{0}:{1}'.format(*httpd.server_address)
+
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    yield httpd
+
+    httpd.shutdown()
+    httpd.server_close()
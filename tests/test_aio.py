@@ -0,0 +1,75 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import pandas as pd
+import pytest
+from requests.exceptions import HTTPError
+
+from nasapy import aio
+from nasapy.aio import AsyncNasa
+from nasapy.client import AsyncClient
+
+
+class LocalAsyncClient(AsyncClient):
+
+    def __init__(self, base, **kwargs):
+        super(LocalAsyncClient, self).__init__(**kwargs)
+
+        self.base = base
+
+    async def get(self, url, params=None, callback=None):
+        if not url.startswith(self.base):
+            url = self.base + urlsplit(url).path
+
+        return await super(LocalAsyncClient, self).get(url, params=params, callback=callback)
+
+
+def test_async_nasa(server):
+    async def run():
+        async with AsyncNasa(client=AsyncClient(pool_maxsize=50)) as n:
+            n.host = server.base
+
+            flares, storms = await asyncio.gather(n.solar_flare(start_date='2019-05-01'), n.geomagnetic_storm())
+
+            assert flares[0]['flrID'] == '2019-05-06T05:04:00-FLR-001'
+            assert storms == {}
+            assert n.limit_remaining == '998'
+
+            results = await asyncio.gather(*[n.solar_flare() for _ in range(100)])
+
+            assert len(results) == 100
+
+            with pytest.raises(HTTPError):
+                await n.get_asteroids(asteroid_id=0)
+
+            with pytest.raises(TypeError):
+                n.solar_flare(start_date=1)
+
+    asyncio.run(run())
+
+    # The flares and storms are requested concurrently, so either may reach the server first.
+    assert '/DONKI/FLR?api_key=DEMO_KEY&startDate=2019-05-01' in server.paths[:2]
+
+
+def test_async_module_functions(server):
+    async def run():
+        async with LocalAsyncClient(server.base) as client:
+            cad = await aio.close_approach(des=433, client=client)
+            cad_df = await aio.close_approach(des=433, return_df=True, client=client)
+            metadata = await aio.media_asset_metadata(nasa_id='as11-40-5874', client=client)
+
+        assert cad['data'] == [['433', '0.17']]
+        assert isinstance(cad_df, pd.DataFrame)
+        assert metadata['AVAIL:NASAID'] == 'as11-40-5874'
+        assert metadata['location'].endswith('/as11-40-5874/metadata.json')
+
+        with pytest.raises(ValueError):
+            await aio.close_approach(limit=-1)
+
+    asyncio.run(run())
+
+
+def test_async_nasa_sync_context():
+    with pytest.raises(TypeError):
+        with AsyncNasa():
+            pass
@@ -118,7 +118,7 @@ def test_close_approach():
     assert isinstance(cad, dict)
     assert 'data' in cad.keys()
 
-    assert isinstance(cad_df, DataFrame)
+    assert isinstance(cad_df, pd.DataFrame)
 
     assert isinstance(cad_dt, dict)
     assert 'data' in cad_dt.keys()
@@ -161,10 +161,10 @@ def test_exoplanets():
     exo2_df = exoplanets(select='distinct pl_hostname', order='pl_hostname', return_df=True)
 
     assert isinstance(exo1, list)
-    assert isinstance(exo1_df, DataFrame)
+    assert isinstance(exo1_df, pd.DataFrame)
 
     assert isinstance(exo2,list)
-    assert isinstance(exo2_df, DataFrame)
+    assert isinstance(exo2_df, pd.DataFrame)
 
 
 @vcr.use_cassette('tests/cassettes/fireballs.yml')
@@ -669,12 +669,12 @@ def test_sentry():
     s5, sum5 = sentry(spk=2029075, return_df=True)
 
     assert isinstance(s, dict)
-    assert isinstance(s1, DataFrame)
+    assert isinstance(s1, pd.DataFrame)
     assert isinstance(s2, dict)
-    assert isinstance(s3, DataFrame)
+    assert isinstance(s3, pd.DataFrame)
     assert isinstance(sum3, dict)
     assert isinstance(s4, dict)
-    assert isinstance(s5, DataFrame)
+    assert isinstance(s5, pd.DataFrame)
     assert isinstance(sum5, dict)
 
     with pytest.raises(ValueError):
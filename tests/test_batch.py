@@ -0,0 +1,153 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from requests.exceptions import HTTPError
+
+from nasapy import aio
+from nasapy.aio import AsyncNasa
+from nasapy.api import Nasa, batch
+from nasapy.batch import resolve_jobs, run_batch
+from nasapy.client import AsyncClient
+from nasapy.deadline import DeadlineExceeded, time_remaining
+
+
+def test_run_batch():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def job(i):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+
+        time.sleep(0.01 * (5 - i % 5))
+
+        with lock:
+            active[0] -= 1
+
+        if i == 3:
+            raise ValueError(i)
+
+        return i
+
+    r = run_batch([(job, {'i': i}) for i in range(20)], max_workers=4)
+
+    assert r[:3] == [0, 1, 2]
+    assert isinstance(r[3], ValueError)
+    assert r[4:] == list(range(4, 20))
+    assert peak[0] <= 4
+
+    with pytest.raises(ValueError):
+        run_batch([(job, {'i': i}) for i in range(5)], return_exceptions=False)
+    with pytest.raises(ValueError):
+        run_batch([], max_workers=0)
+
+    assert run_batch([]) == []
+
+
+def test_resolve_jobs():
+    def endpoint(a=None, client=None):
+        return a, client
+
+    def no_client(a):
+        return a
+
+    calls = resolve_jobs([('endpoint', {'a': 1}), (endpoint, None), ('endpoint', {'a': 2, 'client': 'other'}),
+                          (no_client, {'a': 3})],
+                         namespace={'endpoint': endpoint}, client='client')
+
+    assert [func(**kwargs) for func, kwargs in calls] == [(1, 'client'), (None, 'client'), (2, 'other'), 3]
+
+    with pytest.raises(ValueError):
+        resolve_jobs([('missing', {})], namespace={'endpoint': endpoint})
+    with pytest.raises(TypeError):
+        resolve_jobs(['endpoint'], namespace={'endpoint': endpoint})
+    with pytest.raises(TypeError):
+        resolve_jobs([(1, {})], namespace={'endpoint': endpoint})
+
+
+def test_module_batch(stub_client):
+    def handler(request):
+        if 'des=0' in request.url:
+            return 400, {}, {'message': 'bad des'}
+
+        return 200, {}, {'data': [request.url.rsplit('=', 1)[-1]]}
+
+    client, adapter = stub_client(handler=handler)
+
+    r = batch([('sentry', {'des': str(des)}) for des in (99942, 0, 29075)] + [('sentry', {'h_max': 1000})],
+              client=client)
+
+    assert r[0] == {'data': ['99942']}
+    assert isinstance(r[1], HTTPError)
+    assert r[2] == {'data': ['29075']}
+    assert isinstance(r[3], ValueError)
+    assert len(adapter.requests) == 3
+
+
+def test_nasa_batch(stub_client):
+    client, adapter = stub_client(body={'id': '1'})
+
+    n = Nasa(client=client)
+
+    r = n.batch([('get_asteroids', {'asteroid_id': i}) for i in range(10)] + [('mission_design', {'des': 1})],
+                max_workers=3)
+
+    assert r == [{'id': '1'}] * 11
+    assert len(adapter.requests) == 11
+    assert any(request.url.startswith('https://ssd-api.jpl.nasa.gov/mdesign.api') for request, _ in adapter.requests)
+
+    with pytest.raises(ValueError):
+        n.batch([('missing', {})])
+
+
+def test_async_batch(server):
+    async def run():
+        async with AsyncNasa(client=AsyncClient()) as n:
+            n.host = server.base
+
+            r = await n.batch([('solar_flare', {})] * 5 + [('solar_flare', {'start_date': 1})], max_concurrency=2)
+
+            assert r[:5] == [[{'flrID': '2019-05-06T05:04:00-FLR-001', 'linkedEvents': None}]] * 5
+            assert isinstance(r[5], TypeError)
+
+            async def failing(i):
+                raise KeyError(i)
+
+            r = await aio.batch([(failing, {'i': 1})], client=n.client)
+
+            assert isinstance(r[0], KeyError)
+
+    asyncio.run(run())
+
+
+def test_batch_deadline():
+    def job(i):
+        assert time_remaining() is not None
+
+        time.sleep(0.2)
+
+        return i
+
+    start = time.monotonic()
+    r = run_batch([(job, {'i': i}) for i in range(6)], max_workers=2, deadline=0.3)
+
+    # Two jobs finish, two are in flight when the deadline passes, and the last two are never started.
+    assert r[:4] == [0, 1, 2, 3]
+    assert all(isinstance(e, DeadlineExceeded) for e in r[4:])
+    assert time.monotonic() - start < 0.6
+
+    with pytest.raises(TypeError):
+        run_batch([(job, {'i': 0})], deadline='1')
+
+    async def slow(i):
+        await asyncio.sleep(i)
+
+        return i
+
+    r = asyncio.run(aio.batch([(slow, {'i': i}) for i in (0, 0, 5)], deadline=0.1))
+
+    assert r[:2] == [0, 0]
+    assert isinstance(r[2], DeadlineExceeded)
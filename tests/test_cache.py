@@ -0,0 +1,282 @@
+import asyncio
+import datetime
+import threading
+
+import pytest
+import requests
+from requests.exceptions import HTTPError
+
+from nasapy.api import Nasa, batch, close_approach, sentry
+from nasapy.cache import ResponseCache, SQLiteCache, cache_key, conditional_headers
+from nasapy.client import AsyncClient, Client
+
+
+def test_cache_key():
+    assert cache_key('https://ssd-api.jpl.nasa.gov/cad.api', {'des': 433, 'dist-max': None, 'diameter': False}) == \
+        cache_key('https://ssd-api.jpl.nasa.gov/cad.api', {'diameter': 'False', 'des': '433'})
+    assert cache_key('https://api.nasa.gov/DONKI/FLR', {'api_key': 'a', 'startDate': datetime.date(2019, 1, 1)}) == \
+        cache_key('https://api.nasa.gov/DONKI/FLR', {'api_key': 'b', 'startDate': '2019-01-01'})
+    assert cache_key('https://api.nasa.gov/DONKI/FLR', {'startDate': datetime.datetime(2019, 1, 1, 12)}) == \
+        ('https://api.nasa.gov/DONKI/FLR', ('startDate', '2019-01-01'))
+    assert cache_key('https://api.nasa.gov/DONKI/FLR') == ('https://api.nasa.gov/DONKI/FLR',)
+
+
+def test_response_cache(stub_client, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('nasapy.cache.time.time', lambda: now[0])
+
+    cache = ResponseCache(maxsize=2, ttl=10, ttls={'/DONKI/': 60, '/DONKI/GST': 0})
+
+    assert cache.ttl_for('https://api.nasa.gov/DONKI/FLR') == 60
+    assert cache.ttl_for('https://api.nasa.gov/DONKI/GST') == 0
+    assert cache.ttl_for('https://ssd-api.jpl.nasa.gov/cad.api') == 10
+
+    client, adapter = stub_client(body={'data': []})
+    client.cache = cache
+
+    for _ in range(3):
+        assert sentry(des='99942', client=client) == {'data': []}
+
+    assert len(adapter.requests) == 1
+
+    now[0] = 11.0
+    sentry(des='99942', client=client)
+
+    assert len(adapter.requests) == 2
+
+    # The least recently used response is evicted once the cache is full.
+    close_approach(des=433, client=client)
+    close_approach(des=1, client=client)
+    sentry(des='99942', client=client)
+
+    assert len(cache) == 2
+    assert len(adapter.requests) == 5
+
+    cache.clear()
+
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        ResponseCache(maxsize=0)
+    with pytest.raises(ValueError):
+        ResponseCache(ttls={'/DONKI/': -1})
+
+
+def test_client_cache(stub_client):
+    client, adapter = stub_client(body={'title': 'test'})
+    client.cache = ResponseCache()
+
+    n = Nasa(key='key', client=client)
+
+    assert n.picture_of_the_day(date='2019-01-01') == {'title': 'test'}
+    assert n.picture_of_the_day(date=datetime.datetime(2019, 1, 1)) == {'title': 'test'}
+    assert len(adapter.requests) == 1
+
+    client, adapter = stub_client(status=500)
+    client.cache = ResponseCache()
+    client.retry = None
+
+    n.client = client
+
+    for _ in range(2):
+        with pytest.raises(HTTPError):
+            n.picture_of_the_day()
+
+    assert len(adapter.requests) == 2
+    assert len(client.cache) == 0
+
+    assert Client().cache is None
+    assert isinstance(Client(cache=True).cache, ResponseCache)
+
+    with pytest.raises(TypeError):
+        Client(cache=60)
+
+
+def test_async_client_cache(server):
+    async def run():
+        async with AsyncClient(cache=True) as client:
+            for _ in range(3):
+                r = await client.get(server.base + '/cad.api', params={'des': 433, 'api_key': None})
+
+                assert r.json()['data'] == [['433', '0.17']]
+
+    asyncio.run(run())
+
+    assert server.paths == ['/cad.api?des=433']
+
+
+
+def test_sqlite_cache(stub_client, tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('nasapy.cache.time.time', lambda: now[0])
+
+    path = str(tmp_path / 'cache.sqlite')
+    url = 'https://ssd-api.jpl.nasa.gov/cad.api'
+
+    client, adapter = stub_client(body={'data': [['433']]}, headers={'Content-Type': 'application/json'})
+    client.cache = SQLiteCache(path, maxsize=2, ttl=10)
+
+    assert client.get(url, params={'des': 433}).json() == {'data': [['433']]}
+    assert client.get(url, params={'des': 433}).json() == {'data': [['433']]}
+    assert len(adapter.requests) == 1
+
+    # A second cache opened on the same file, as in another process, sees the stored response. Every read updates the
+    # least recently used order.
+    other = SQLiteCache(path, maxsize=2, ttl=10, touch_interval=0)
+    r = other.get(url, {'des': '433'})
+
+    assert len(other) == 1
+    assert r.json() == {'data': [['433']]}
+    assert r.headers['content-type'] == 'application/json'
+
+    now[0] += 1
+    client.get(url, params={'des': 1})
+    now[0] += 1
+    other.get(url, {'des': 433})
+    now[0] += 1
+    client.get(url, params={'des': 2})
+
+    assert len(other) == 2
+    assert other.get(url, {'des': 1}) is None
+    assert other.get(url, {'des': 433}) is not None
+
+    now[0] += 10
+
+    assert other.get(url, {'des': 433}) is None
+
+    other.clear()
+
+    assert len(client.cache) == 0
+
+
+def test_sqlite_cache_touch_and_close(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('nasapy.cache.time.time', lambda: now[0])
+
+    url = 'https://ssd-api.jpl.nasa.gov/cad.api'
+    cache = SQLiteCache(str(tmp_path / 'cache.sqlite'), ttl=600, touch_interval=60)
+
+    r = requests.Response()
+    r.status_code, r._content, r.url = 200, b'{}', url
+    cache.set(url, {'des': 433}, r)
+
+    def accessed():
+        return cache._connect().execute('SELECT accessed FROM responses').fetchone()[0]
+
+    # Reads within the touch interval do not write to the database.
+    now[0] += 30
+    assert cache.get(url, {'des': 433}) is not None
+    assert accessed() == 1000.0
+
+    now[0] += 60
+    assert cache.get(url, {'des': 433}) is not None
+    assert accessed() == 1090.0
+
+    with cache:
+        thread = threading.Thread(target=cache.get, args=(url, {'des': 433}))
+        thread.start()
+        thread.join()
+
+        assert len(cache._db.connections) == 2
+
+    assert cache._db.connections == []
+
+    # A closed cache opens a new connection when used again.
+    assert len(cache) == 1
+
+    with pytest.raises(ValueError):
+        SQLiteCache(str(tmp_path / 'other.sqlite'), touch_interval=-1)
+
+
+def test_sqlite_cache_stale_rows_and_keys(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('nasapy.cache.time.time', lambda: now[0])
+
+    path = str(tmp_path / 'cache.sqlite')
+    url = 'https://api.nasa.gov/planetary/apod'
+    cache = SQLiteCache(path, ttl=10, max_stale=100)
+
+    def response(date):
+        r = requests.Response()
+        r.status_code, r._content = 200, b'{}'
+        r.url = url + '?api_key=secret-key&date=' + date
+
+        return r
+
+    def urls():
+        return [row[0] for row in cache._connect().execute('SELECT url FROM responses ORDER BY url')]
+
+    cache.set(url, {'api_key': 'secret-key', 'date': '2019-01-01'}, response('2019-01-01'))
+
+    # The key the response was requested with is not written to the database.
+    assert urls() == [url + '?date=2019-01-01']
+    assert cache.lookup(url, {'date': '2019-01-01'})[0].url == url + '?date=2019-01-01'
+
+    # An expired response is kept for revalidation until it is stale for longer than max_stale.
+    now[0] += 50
+    cache.set(url, {'date': '2019-01-02'}, response('2019-01-02'))
+
+    assert len(cache) == 2
+
+    now[0] += 100
+    cache.set(url, {'date': '2019-01-03'}, response('2019-01-03'))
+
+    assert urls() == [url + '?date=2019-01-02', url + '?date=2019-01-03']
+
+    # Stale responses are also removed when the cache is opened.
+    now[0] += 1000
+
+    assert len(SQLiteCache(path, max_stale=100)) == 0
+
+    with pytest.raises(ValueError):
+        SQLiteCache(path, max_stale=-1)
+
+
+def test_sqlite_cache_threads(stub_client, tmp_path):
+    client, adapter = stub_client(body={'data': []})
+    client.cache = SQLiteCache(str(tmp_path / 'cache.sqlite'))
+
+    r = batch([('sentry', {'des': str(i % 5)}) for i in range(50)], max_workers=8, client=client)
+
+    assert r == [{'data': []}] * 50
+    assert len(client.cache) == 5
+
+
+def test_conditional_request(stub_client, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('nasapy.cache.time.time', lambda: now[0])
+
+    def handler(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return 304, {'ETag': '"v1"', 'X-RateLimit-Remaining': '990', 'Content-Length': '0'}, b''
+
+        return 200, {'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT',
+                     'X-RateLimit-Remaining': '999'}, {'projects': [1, 2, 3]}
+
+    client, adapter = stub_client(handler=handler)
+    client.cache = ResponseCache(ttl=60)
+
+    n = Nasa(key='key', client=client)
+
+    assert n.techport() == {'projects': [1, 2, 3]}
+    assert 'If-None-Match' not in adapter.requests[0][0].headers
+
+    now[0] = 61.0
+
+    assert n.techport() == {'projects': [1, 2, 3]}
+    assert n.limit_remaining == '990'
+    assert adapter.requests[1][0].headers['If-None-Match'] == '"v1"'
+    assert adapter.requests[1][0].headers['If-Modified-Since'] == 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+    # The renewed response is fresh again for another TTL.
+    assert n.techport() == {'projects': [1, 2, 3]}
+    assert len(adapter.requests) == 2
+
+    r, fresh = client.cache.lookup('https://api.nasa.gov/techport/api/projects', {'api_key': 'key'})
+
+    assert fresh
+    assert r.status_code == 200
+    assert r.headers.get('Content-Length') != '0'
+
+    assert conditional_headers(None) is None
+    assert conditional_headers(r) == {'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'}
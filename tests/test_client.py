@@ -0,0 +1,135 @@
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+
+import pytest
+from requests.adapters import HTTPAdapter
+
+from nasapy.api import Nasa, close_approach, tle
+from nasapy.client import Client, _build_response, default_client, set_default_client
+from nasapy.metrics import MetricsRegistry
+from nasapy.testing import MockServer
+
+
+def test_client_pools():
+    client = Client(pool_connections=4, pool_maxsize=16, timeout=(3.05, 30))
+
+    adapter = client.session.get_adapter('https://api.nasa.gov')
+
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 16
+    assert client.timeout == (3.05, 30)
+    assert 'Connection' not in client.session.headers or client.session.headers['Connection'] != 'close'
+
+    no_keep_alive = Client(keep_alive=False)
+
+    assert no_keep_alive.session.headers['Connection'] == 'close'
+
+    with pytest.raises(TypeError):
+        Client(keep_alive='true')
+    with pytest.raises(ValueError):
+        Client(pool_maxsize=0)
+
+
+def test_client_get(stub_client):
+    client, adapter = stub_client(body={'data': []})
+    client.timeout = 5
+
+    r = client.get('https://api.nasa.gov/DONKI/FLR', params={'startDate': '2019-01-01', 'endDate': None})
+
+    assert r.json() == {'data': []}
+    assert adapter.requests[0][0].url == 'https://api.nasa.gov/DONKI/FLR?startDate=2019-01-01'
+    assert adapter.requests[0][1]['timeout'] == 5
+
+
+def test_default_client():
+    assert isinstance(default_client(), Client)
+    assert default_client() is default_client()
+
+
+def test_set_default_client():
+    client = Client(throttle=False)
+
+    set_default_client(client)
+
+    try:
+        assert default_client() is client
+    finally:
+        set_default_client(None)
+
+    assert default_client() is not client
+
+    with pytest.raises(TypeError):
+        set_default_client('client')
+
+
+def test_nasa_client(stub_client):
+    client, adapter = stub_client(body={'title': 'test'})
+
+    n = Nasa(client=client)
+
+    assert n.client is client
+    assert n.picture_of_the_day() == {'title': 'test'}
+    assert n.limit_remaining == '999'
+    assert len(adapter.requests) == 1
+
+    assert isinstance(Nasa().client, Client)
+    assert Nasa().client is not Nasa().client
+
+    with Nasa(client=client) as n2:
+        assert n2.client is client
+
+
+def test_module_function_client(stub_client):
+    client, adapter = stub_client(body={'fields': ['des'], 'data': [['433']], 'count': '1'})
+
+    cad = close_approach(des=433, client=client)
+    cad_df = close_approach(des=433, return_df=True, client=client)
+
+    assert cad['data'] == [['433']]
+    assert list(cad_df.columns) == ['des']
+    assert len(adapter.requests) == 2
+    assert adapter.requests[0][0].url.startswith('https://ssd-api.jpl.nasa.gov/cad.api')
+
+    tle(satellite_number=43553, client=client)
+
+    assert adapter.requests[-1][0].url == 'https://data.ivanstanojevic.me/api/tle/43553'
+
+
+def test_concurrent_nasa():
+    registry = MetricsRegistry()
+    workers, calls = 16, 200
+    dates = [(datetime.date(2019, 1, 1) + datetime.timedelta(days=i)).isoformat() for i in range(calls)]
+
+    with MockServer(latency=(0, 0.005), rate_limit=1000) as server:
+        n = Nasa(key='DEMO_KEY', client=Client(transport=server.transport(), pool_maxsize=4, hooks=[registry]))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda date: n.picture_of_the_day(date=date), dates))
+
+        assert [r['date'] for r in results] == dates
+        assert len(server.requests) == calls
+
+    assert registry.value('nasapy_calls_total', status=200) == calls
+    # At most workers - 1 responses counted by the server after the last one received can have been received before
+    # it, so the count kept is within that many of the server's final count.
+    assert 1000 - calls <= int(n.limit_remaining) < 1000 - calls + workers
+
+
+def test_limit_remaining_order():
+    n = Nasa(client=Client())
+
+    older, newer, cached = (_build_response('https://api.nasa.gov/planetary/apod', 200, 'OK',
+                                            {'X-RateLimit-Remaining': remaining}, b'{}')
+                            for remaining in ('10', '9', '20'))
+    older.nasapy_sequence, newer.nasapy_sequence = 1, 2
+
+    n._check_result(cached)
+
+    assert n.limit_remaining == '20'
+
+    n._check_result(newer)
+    n._check_result(older)
+    n._check_result(cached)
+
+    assert n.limit_remaining == '9'
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from nasapy.api import sentry
+from nasapy.client import AsyncClient, Client
+from nasapy.deadline import DeadlineExceeded, deadline, time_remaining
+from nasapy.retry import RetryPolicy
+from nasapy.testing import MockServer
+
+
+@pytest.fixture
+def slow_server():
+    with MockServer(latency=0.5) as server:
+        yield server
+
+
+def test_deadline(slow_server):
+    client = Client(transport=slow_server.transport(), retry=False)
+    start = time.monotonic()
+
+    with pytest.raises(requests.exceptions.Timeout):
+        with deadline(0.1):
+            assert 0 < time_remaining() <= 0.1
+
+            sentry(client=client)
+
+    assert time.monotonic() - start < 0.4
+    assert time_remaining() is None
+
+    # Nested deadlines cannot extend an outer one.
+    with deadline(1):
+        with deadline(10):
+            assert time_remaining() <= 1
+
+    with pytest.raises(ValueError):
+        with deadline(0):
+            pass
+
+
+def test_deadline_backoff():
+    client = Client(retry=RetryPolicy(max_attempts=3, backoff_factor=10, jitter=False))
+    start = time.monotonic()
+
+    # The backoff before the second attempt would outlast the deadline, so the call gives up at once.
+    with pytest.raises(DeadlineExceeded):
+        with deadline(1):
+            client.get('http://127.0.0.1:1/cad.api')
+
+    assert time.monotonic() - start < 0.5
+
+
+def test_call_timeout(slow_server):
+    client = Client(transport=slow_server.transport(), retry=False)
+
+    assert client.timeout == (10, 120)
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get('https://ssd-api.jpl.nasa.gov/sentry.api', timeout=0.1)
+
+    async def run():
+        async with AsyncClient(transport=slow_server.transport(), retry=False) as async_client:
+            with deadline(0.1):
+                await sentry(client=async_client)
+
+    with pytest.raises(requests.exceptions.Timeout):
+        asyncio.run(run())
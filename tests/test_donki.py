@@ -0,0 +1,379 @@
+import asyncio
+import datetime
+import itertools
+from urllib.parse import parse_qs, parse_qsl, urlsplit
+
+import pytest
+
+from nasapy.aio import AsyncNasa
+from nasapy.api import Nasa, _date_windows, _donki_request, _merge_donki_events
+from nasapy.client import AsyncClient, Client
+from nasapy.donki import DonkiGraph, DonkiSync
+from nasapy.testing import MockServer
+
+
+FLARES = [
+    {'flrID': '2019-01-05T06:10:00-FLR-001', 'beginTime': '2019-01-05T06:10Z', 'peakTime': '2019-01-05T06:25Z',
+     'endTime': '2019-01-05T06:40Z', 'classType': 'M1.0', 'activeRegionNum': 12733,
+     'instruments': [{'displayName': 'GOES15: SEM/XRS 1.0-8.0'}, {'displayName': 'SDO: AIA 131'}],
+     'linkedEvents': [{'activityID': '2019-01-07T11:35:00-IPS-001'}]},
+    {'flrID': '2019-03-20T10:02:00-FLR-001', 'beginTime': '2019-03-20T10:02Z', 'peakTime': '2019-03-20T10:09Z',
+     'endTime': '2019-03-20T10:15Z', 'classType': 'C4.8', 'activeRegionNum': None,
+     'instruments': [{'displayName': 'GOES15: SEM/XRS 1.0-8.0'}], 'linkedEvents': None},
+    {'flrID': '2019-05-06T05:04:00-FLR-001', 'beginTime': '2019-05-06T05:04Z', 'peakTime': '2019-05-06T05:10Z',
+     'endTime': '2019-05-06T05:17Z', 'classType': 'C9.9', 'activeRegionNum': 12740,
+     'instruments': [{'displayName': 'GOES15: SEM/XRS 1.0-8.0'}], 'linkedEvents': None}
+]
+
+STORMS = [
+    {'gstID': '2018-03-18T21:00:00-GST-001', 'startTime': '2018-03-18T21:00Z', 'linkedEvents': None,
+     'allKpIndex': [{'observedTime': '2018-03-18T21:00Z', 'kpIndex': 6, 'source': 'NOAA'}]},
+    {'gstID': '2018-08-26T00:00:00-GST-001', 'startTime': '2018-08-26T00:00Z', 'linkedEvents': None,
+     'allKpIndex': [{'observedTime': '2018-08-26T00:00Z', 'kpIndex': 6, 'source': 'NOAA'},
+                    {'observedTime': '2018-08-26T06:00Z', 'kpIndex': 7, 'source': 'NOAA'}]},
+    {'gstID': '2019-01-08T03:00:00-GST-001', 'startTime': '2019-01-08T03:00Z',
+     'linkedEvents': [{'activityID': '2019-01-07T11:35:00-IPS-001'}],
+     'allKpIndex': [{'observedTime': '2019-01-08T03:00Z', 'kpIndex': 5.33, 'source': 'NOAA'},
+                    {'observedTime': '2019-01-08T06:00Z', 'kpIndex': 6, 'source': 'SWPC'}]},
+    {'gstID': '2019-05-10T18:00:00-GST-001', 'startTime': '2019-05-10T18:00Z', 'linkedEvents': None,
+     'allKpIndex': [{'observedTime': '2019-05-10T18:00Z', 'kpIndex': 5, 'source': 'NOAA'},
+                    {'observedTime': '2019-05-10T21:00Z', 'kpIndex': 6, 'source': 'NOAA'},
+                    {'observedTime': '2019-05-11T00:00Z', 'kpIndex': 6.33, 'source': 'NOAA'}]},
+    {'gstID': '2019-08-05T12:00:00-GST-001', 'startTime': '2019-08-05T12:00Z', 'linkedEvents': None,
+     'allKpIndex': [{'observedTime': '2019-08-05T12:00Z', 'kpIndex': 5, 'source': 'NOAA'}]}
+]
+
+SHOCKS = [
+    {'activityID': '2019-01-07T11:35:00-IPS-001', 'eventTime': '2019-01-07T11:35Z', 'catalog': 'M2M_CATALOG',
+     'location': 'Earth', 'instruments': [{'displayName': 'DSCOVR: PLASMAG'}],
+     'linkedEvents': [{'activityID': '2019-01-05T06:10:00-FLR-001'}, {'activityID': '2019-01-08T03:00:00-GST-001'}]}
+]
+
+ANALYSES = [
+    {'time21_5': '2019-01-05T12:00Z', 'latitude': 5.0, 'longitude': -20.0, 'halfAngle': 30.0, 'speed': 450.0,
+     'type': 'C', 'isMostAccurate': True, 'associatedCMEID': '2019-01-05T09:00:00-CME-001',
+     'catalog': 'M2M_CATALOG'}
+]
+
+SIMULATIONS = [
+    {'simulationID': 'WSA-ENLIL/14325/1', 'modelCompletionTime': '2019-01-06T03:22Z', 'au': 2.0,
+     'estimatedShockArrivalTime': '2019-01-07T11:00Z', 'estimatedDuration': None, 'kp_18': 4, 'kp_90': 5,
+     'kp_135': None, 'kp_180': None,
+     'cmeInputs': [{'cmeStartTime': '2019-01-05T09:00Z', 'latitude': 5.0, 'longitude': -20.0, 'speed': 450.0,
+                    'halfAngle': 30.0, 'time21_5': '2019-01-05T12:00Z', 'cmeid': '2019-01-05T09:00:00-CME-001'},
+                   {'cmeStartTime': '2019-01-05T15:36Z', 'latitude': -10.0, 'longitude': 35.0, 'speed': 610.0,
+                    'halfAngle': 22.0, 'time21_5': '2019-01-05T18:50Z', 'cmeid': '2019-01-05T15:36:00-CME-001'}],
+     'impactList': [{'location': 'Earth', 'arrivalTime': '2019-01-07T11:00Z', 'isGlancingBlow': False}]}
+]
+
+# The events served for each DONKI endpoint, and the field their dates are compared with.
+DONKI = {
+    '/DONKI/FLR': (FLARES, 'beginTime'),
+    '/DONKI/GST': (STORMS, 'startTime'),
+    '/DONKI/IPS': (SHOCKS, 'eventTime'),
+    '/DONKI/CMEAnalysis': (ANALYSES, 'time21_5'),
+    '/DONKI/WSAEnlilSimulations': (SIMULATIONS, 'modelCompletionTime')
+}
+
+
+@pytest.fixture
+def donki(stub_client):
+    # Serves the events above in the requested date range, counting down the requests remaining as api.nasa.gov does.
+    count = itertools.count(1)
+
+    def handler(request):
+        url = urlsplit(request.url)
+        query = dict(parse_qsl(url.query))
+        events, field = DONKI.get(url.path, ([], None))
+        start, end = query.get('startDate', '0000-00-00'), query.get('endDate', '9999-99-99')
+
+        body = [event for event in events if start <= event[field][:10] <= end]
+
+        return 200, {'X-RateLimit-Limit': '1000', 'X-RateLimit-Remaining': str(1000 - next(count))}, body
+
+    client, adapter = stub_client(handler=handler)
+
+    return Nasa(key='DEMO_KEY', client=client), adapter
+
+
+def _async_call(adapter, method, **kwargs):
+    async def run():
+        async with AsyncNasa(key='DEMO_KEY', client=AsyncClient(transport=adapter)) as n:
+            return await getattr(n, method)(**kwargs)
+
+    return asyncio.run(run())
+
+
+def _start_dates(server):
+    return [parse_qs(urlsplit(url).query)['startDate'][0] for url in server.requests]
+
+
+def test_date_windows():
+    assert _date_windows('2019-01-01', '2019-01-10', 4) == [('2019-01-01', '2019-01-04'), ('2019-01-05', '2019-01-08'),
+                                                            ('2019-01-09', '2019-01-10')]
+    assert _date_windows('2019-01-01', '2019-01-01', 30) == [('2019-01-01', '2019-01-01')]
+    assert len(_date_windows(None, None, 10)) == 4
+
+    with pytest.raises(ValueError):
+        _date_windows('01/01/2019', None, 10)
+
+
+def test_merge_donki_events():
+    flare = {'flrID': '2019-01-01T00:00:00-FLR-001'}
+    analysis = {'associatedCMEID': '2019-01-01T00:00:00-CME-001', 'speed': 500}
+
+    assert _merge_donki_events([[flare], {}, [dict(flare), {'flrID': 'other'}]]) == [flare, {'flrID': 'other'}]
+    assert _merge_donki_events([[analysis], [dict(analysis)], [dict(analysis, speed=600)]]) == \
+        [analysis, dict(analysis, speed=600)]
+    assert _merge_donki_events([{}, {}]) == {}
+
+
+def test_donki_windows(donki):
+    n, adapter = donki
+
+    storms = n.geomagnetic_storm(start_date='2018-01-01', end_date='2019-12-31')
+    windowed = n.geomagnetic_storm(start_date='2018-01-01', end_date='2019-12-31', window=90)
+
+    assert storms == STORMS
+    assert windowed == storms
+    assert len(adapter.requests) == 1 + 9
+    # The windows are fetched four at a time, so the last response received may not be the last one counted.
+    assert 990 <= int(n.limit_remaining) < 994
+
+    limit, r = _donki_request(key='DEMO_KEY', url='https://api.nasa.gov/DONKI/GST', start_date='2018-01-01',
+                              end_date='2019-12-31', client=n.client, window=365)
+
+    assert r == storms
+    assert limit in ('988', '989')
+    assert _async_call(adapter, 'geomagnetic_storm', start_date='2018-01-01', end_date='2019-12-31',
+                       window=180) == storms
+
+    with pytest.raises(ValueError):
+        n.solar_flare(window=0)
+    with pytest.raises(TypeError):
+        n.solar_flare(window='30')
+
+
+def test_donki_timeline(donki):
+    n, adapter = donki
+
+    timeline = n.donki_timeline(start_date='2019-01-01', end_date='2019-01-31')
+
+    assert len(adapter.requests) == 9
+    assert [(row['time'], row['event_type']) for row in timeline] == [
+        ('2019-01-05T06:10Z', 'solar_flare'),
+        ('2019-01-05T12:00Z', 'coronal_mass_ejection'),
+        ('2019-01-06T03:22Z', 'wsa_enlil_simulation'),
+        ('2019-01-07T11:35Z', 'interplantary_shock'),
+        ('2019-01-08T03:00Z', 'geomagnetic_storm')
+    ]
+    assert [row['id'] for row in timeline][:2] == [FLARES[0]['flrID'], None]
+    assert timeline[0]['event'] == FLARES[0]
+
+    df = n.donki_timeline(start_date='2019-01-01', end_date='2019-06-30', event_types=['solar_flare'], return_df=True)
+
+    assert list(df.columns) == ['time', 'event_type', 'id', 'event']
+    assert list(df['id']) == [f['flrID'] for f in FLARES]
+
+    assert _async_call(adapter, 'donki_timeline', event_types=[]) == []
+    assert _async_call(adapter, 'donki_timeline', start_date='2019-01-01', end_date='2019-01-31') == timeline
+
+    with pytest.raises(ValueError):
+        n.donki_timeline(event_types=['solar_flares'])
+    with pytest.raises(TypeError):
+        n.donki_timeline(event_types='solar_flare')
+
+
+def test_donki_data_frame(donki):
+    n, adapter = donki
+
+    df = n.geomagnetic_storm(start_date='2019-01-01', end_date='2019-06-30', return_df=True)
+
+    # One row per Kp observation of each storm.
+    assert len(df) == 2 + 3
+    assert list(df['gstID']) == [STORMS[2]['gstID']] * 2 + [STORMS[3]['gstID']] * 3
+    assert str(df['startTime'].dtype).startswith('datetime64') and str(df['startTime'].dt.tz) == 'UTC'
+    assert df['startTime'].iloc[0].strftime('%Y-%m-%dT%H:%MZ') == STORMS[2]['startTime']
+    assert df['allKpIndex.kpIndex'].dtype == float
+    assert df['allKpIndex.source'].dtype == 'category'
+    assert df['linkedEvents'].iloc[0] == ['2019-01-07T11:35:00-IPS-001']
+    assert df['linkedEvents'].iloc[2] is None
+
+    flares = n.solar_flare(start_date='2019-01-01', end_date='2019-06-30', return_df=True)
+
+    assert n.solar_flare(start_date='2019-01-01', end_date='2019-06-30', return_df=True, window=30).equals(flares)
+    assert list(flares['flrID']) == [f['flrID'] for f in FLARES]
+    assert flares['instruments'].dtype == 'category'
+    assert flares['instruments'].iloc[0] == 'GOES15: SEM/XRS 1.0-8.0, SDO: AIA 131'
+    assert flares['activeRegionNum'].isna().iloc[1]
+
+    simulations = n.wsa_enlil_simulation(start_date='2019-01-01', end_date='2019-01-31', return_df=True)
+
+    # One row per CME input, with the impacts kept as a list on each.
+    assert len(simulations) == 2
+    assert list(simulations['cmeInputs.speed']) == [450.0, 610.0]
+    assert str(simulations['cmeInputs.cmeStartTime'].dtype).startswith('datetime64')
+    assert str(simulations['estimatedShockArrivalTime'].dtype).startswith('datetime64')
+    assert simulations['impactList'].iloc[1] == SIMULATIONS[0]['impactList']
+
+    assert _async_call(adapter, 'solar_flare', start_date='2019-01-01', end_date='2019-06-30',
+                       return_df=True).equals(flares)
+
+    with pytest.raises(TypeError):
+        n.solar_flare(return_df='yes')
+
+
+def test_donki_data_frame_nested_lists(stub_client):
+    simulation = {'simulationID': 'WSA-ENLIL/14325/1', 'modelCompletionTime': '2019-05-07T03:22Z', 'au': 2.0,
+                  'cmeInputs': [{'cmeStartTime': '2019-05-06T05:24Z', 'speed': 350.0,
+                                 'cmeid': '2019-05-06T05:24:00-CME-001'}],
+                  'impactList': [{'location': 'Earth', 'arrivalTime': '2019-05-10T12:00Z'},
+                                 {'location': 'STEREO A', 'arrivalTime': '2019-05-11T01:00Z'}],
+                  'estimatedShockArrivalTime': None, 'link': ''}
+    client, adapter = stub_client(body=[simulation])
+    n = Nasa(key='DEMO_KEY', client=client)
+
+    df = n.wsa_enlil_simulation(start_date='2019-05-06', end_date='2019-05-08', return_df=True)
+
+    # Only the CME inputs are spread over rows; the impacts stay together with the simulation they belong to.
+    assert len(df) == 1
+    assert df['impactList'].iloc[0] == simulation['impactList']
+    assert df['cmeInputs.speed'].iloc[0] == 350.0
+    assert df['cmeInputs.cmeid'].iloc[0] == '2019-05-06T05:24:00-CME-001'
+
+    adapter.body = [dict(simulation, modelCompletionTime='2019-05-07T03:22:30Z')]
+    df = n.wsa_enlil_simulation(start_date='2019-05-06', end_date='2019-05-08', return_df=True)
+
+    assert df['modelCompletionTime'].iloc[0].second == 30
+
+    adapter.body = [dict(simulation, modelCompletionTime='not a time')]
+
+    with pytest.raises(ValueError):
+        n.wsa_enlil_simulation(start_date='2019-05-06', end_date='2019-05-08', return_df=True)
+
+
+def test_donki_sync(tmp_path, monkeypatch):
+    today = [datetime.date(2019, 1, 31)]
+    monkeypatch.setattr('nasapy.testing._today', lambda: today[0])
+    monkeypatch.setattr('nasapy.donki._today', lambda: today[0])
+
+    path = str(tmp_path / 'donki.sqlite')
+
+    with MockServer() as server:
+        n = Nasa(key='DEMO_KEY', client=Client(transport=server.transport()))
+        events = DonkiSync(n, path, start_date='2019-01-01')
+
+        flares = events.sync('solar_flare')['solar_flare']
+        mark = events.high_water_mark('solar_flare')
+
+        assert flares == n.solar_flare(start_date='2019-01-01')
+        assert mark == max(f['beginTime'] for f in flares)
+
+        # Polling again only requests the last days, whose events have all been received already.
+        assert events.sync('solar_flare') == {'solar_flare': []}
+
+        today[0] = datetime.date(2019, 2, 10)
+        flares = DonkiSync(n, path).sync('solar_flare')['solar_flare']
+
+        assert flares == [f for f in n.solar_flare(start_date='2019-01-01') if f['beginTime'] > mark]
+
+        since = (datetime.datetime.strptime(mark[:10], '%Y-%m-%d') - datetime.timedelta(days=2)).strftime('%Y-%m-%d')
+
+        assert _start_dates(server) == ['2019-01-01', '2019-01-01', since, since, '2019-01-01']
+
+        events.reset()
+
+        assert events.high_water_mark('solar_flare') is None
+
+    with pytest.raises(ValueError):
+        events.sync('solar_flares')
+    with pytest.raises(ValueError):
+        DonkiSync(n, path, overlap=-1)
+
+
+def test_donki_sync_updates(tmp_path, stub_client, monkeypatch):
+    monkeypatch.setattr('nasapy.donki._today', lambda: datetime.date(2019, 5, 8))
+
+    flare = {'flrID': '2019-05-06T05:04:00-FLR-001', 'beginTime': '2019-05-06T05:04Z', 'linkedEvents': None}
+    client, adapter = stub_client(body=[flare])
+    events = DonkiSync(Nasa(key='DEMO_KEY', client=client), str(tmp_path / 'donki.sqlite'))
+
+    assert events.sync('solar_flare') == {'solar_flare': [flare]}
+    assert events.sync('solar_flare') == {'solar_flare': []}
+
+    # A revised event is returned again.
+    adapter.body = [dict(flare, linkedEvents=[{'activityID': '2019-05-06T07:00:00-CME-001'}])]
+
+    assert events.sync('solar_flare') == {'solar_flare': adapter.body}
+    assert 'startDate=2019-05-04' in adapter.requests[-1][0].url
+
+
+def test_donki_sync_pruning(tmp_path, stub_client, monkeypatch):
+    today = [datetime.date(2019, 5, 8)]
+    monkeypatch.setattr('nasapy.donki._today', lambda: today[0])
+
+    untimed = {'flrID': '2019-05-06T05:04:00-FLR-001', 'linkedEvents': None}
+    client, adapter = stub_client(body=[untimed])
+
+    with DonkiSync(Nasa(key='DEMO_KEY', client=client), str(tmp_path / 'donki.sqlite')) as events:
+        # An event without a time is remembered as of the day it was received.
+        assert events.sync('solar_flare') == {'solar_flare': [untimed]}
+        assert events.sync('solar_flare') == {'solar_flare': []}
+
+        def stored():
+            return events._connect().execute('SELECT COUNT(*) FROM events').fetchone()[0]
+
+        assert stored() == 1
+
+        # Once it is no longer returned, it is forgotten when its day falls out of the requested range.
+        adapter.body = []
+        today[0] = datetime.date(2019, 5, 20)
+        events.sync('solar_flare')
+
+        assert stored() == 0
+
+    assert events._db.connections == []
+
+    with pytest.raises(TypeError):
+        DonkiSync(AsyncNasa(key='DEMO_KEY'), str(tmp_path / 'donki.sqlite'))
+
+
+def test_donki_graph():
+    flare = {'flrID': '2019-05-06T05:04:00-FLR-001', 'beginTime': '2019-05-06T05:04Z',
+             'linkedEvents': [{'activityID': '2019-05-06T05:24:00-CME-001'}]}
+    shock = {'activityID': '2019-05-08T11:35:00-IPS-001', 'eventTime': '2019-05-08T11:35Z',
+             'linkedEvents': [{'activityID': '2019-05-06T05:24:00-CME-001'}]}
+    storm = {'gstID': '2019-05-10T15:00:00-GST-001', 'startTime': '2019-05-10T15:00Z',
+             'linkedEvents': [{'activityID': '2019-05-08T11:35:00-IPS-001'}]}
+    other = {'flrID': '2019-05-07T01:00:00-FLR-001', 'beginTime': '2019-05-07T01:00Z', 'linkedEvents': None}
+
+    graph = DonkiGraph([storm, flare])
+
+    assert graph.add([shock, other, {'time21_5': '2019-05-06T09:00Z'}]) == 2
+    assert len(graph) == 4 and '2019-05-06T05:24:00-CME-001' not in graph
+    assert graph.get(shock['activityID']) is shock
+
+    assert graph.linked('2019-05-06T05:24:00-CME-001') == [flare['flrID'], shock['activityID']]
+    assert graph.effects(flare['flrID']) == ['2019-05-06T05:24:00-CME-001', shock['activityID'], storm['gstID']]
+    assert graph.causes(storm['gstID']) == [flare['flrID'], '2019-05-06T05:24:00-CME-001', shock['activityID']]
+    assert graph.chain(shock['activityID']) == graph.chain(flare['flrID'])
+    assert graph.chain(other['flrID']) == [other['flrID']]
+
+    # A revised event replaces the links it no longer lists.
+    graph.add([dict(storm, linkedEvents=None)])
+
+    assert graph.effects(flare['flrID']) == ['2019-05-06T05:24:00-CME-001', shock['activityID']]
+
+
+def test_donki_graph_timeline(donki):
+    n, _ = donki
+    timeline = n.donki_timeline(start_date='2019-01-01', end_date='2019-03-31')
+
+    graph = DonkiGraph([row['event'] for row in timeline])
+
+    assert graph.chain(FLARES[0]['flrID']) == [FLARES[0]['flrID'], SHOCKS[0]['activityID'], STORMS[2]['gstID']]
+
+    for row in timeline:
+        for link in row['event'].get('linkedEvents') or ():
+            assert row['id'] in graph.linked(link['activityID'])
+            assert link['activityID'] in graph.causes(row['id']) or link['activityID'] in graph.effects(row['id'])
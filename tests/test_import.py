@@ -0,0 +1,12 @@
+import subprocess
+import sys
+
+
+def test_import_is_lazy():
+    # pandas, aiohttp and asyncio are only needed by return_df=True and the asynchronous client, so importing nasapy
+    # should not load them.
+    script = "import sys, nasapy; print(','.join(m for m in ('pandas', 'aiohttp', 'asyncio') if m in sys.modules))"
+
+    out = subprocess.run([sys.executable, '-c', script], check=True, capture_output=True, text=True).stdout
+
+    assert out.strip() == ''
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+import requests
+
+from nasapy.api import Nasa, _json, close_approach
+from nasapy.client import AsyncClient, Client
+from nasapy.instrument import endpoint_name
+from nasapy.retry import RetryPolicy
+from nasapy.testing import MockServer
+
+
+def test_call_event(server):
+    events = []
+    client = Client(hooks=[events.append])
+
+    r = client.get(server.base + '/cad.api', params={'des': 433, 'api_key': 'secret', 'body': None}, callback=_json)
+
+    assert r['data'] == [['433', '0.17']]
+
+    event, = events
+
+    assert event.endpoint == 'other'
+    assert event.host == server.base[len('http://'):]
+    assert event.url == server.base + '/cad.api'
+    assert event.params == {'des': '433'}
+    assert event.key == '...cret-2bb80d53'
+    assert event.status_code == 200
+    assert event.bytes == len(b'{"count": "1", "fields": ["des", "dist"], "data": [["433", "0.17"]]}')
+    assert event.attempts == 1 and event.retries == 0
+    assert event.cache is None and not event.coalesced and event.error is None
+    assert event.phases['connect'] > 0 and event.phases['ttfb'] > 0 and event.phases['decode'] > 0
+    assert event.duration >= sum(event.phases.values())
+
+
+def test_retries_and_errors(server):
+    events = []
+    client = Client(retry=RetryPolicy(max_attempts=3, backoff_factor=0), hooks=[events.append])
+
+    assert client.get(server.base + '/unavailable').status_code == 503
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get('http://127.0.0.1:1/cad.api')
+
+    assert events[0].attempts == 3 and events[0].retries == 2
+    assert events[0].status_code == 503
+    assert isinstance(events[1].error, requests.exceptions.ConnectionError)
+    assert events[1].status_code is None
+
+
+def test_cache_and_endpoints():
+    events = []
+
+    with MockServer(rows=5) as server:
+        client = Client(transport=server.transport(), cache=True, hooks=[events.append])
+
+        close_approach(des=433, return_df=True, client=client)
+        close_approach(des=433, client=client)
+        Nasa(key='DEMO_KEY', client=client).solar_flare(start_date='2019-01-01', end_date='2019-01-31')
+
+    assert [(e.endpoint, e.cache, e.attempts) for e in events] == [('close_approach', 'miss', 1),
+                                                                   ('close_approach', 'hit', 0),
+                                                                   ('solar_flare', 'miss', 1)]
+    assert events[0].params['des'] == '433'
+    assert events[0].phases['dataframe'] > 0
+    assert events[1].phases['dataframe'] == 0 and events[1].phases['decode'] > 0
+    assert 'api_key' not in events[2].params
+
+
+def test_async_client(server):
+    events = []
+
+    async def run():
+        async with AsyncClient(hooks=[events.append]) as client:
+            await asyncio.gather(*(client.get(server.base + '/cad.api', callback=_json) for _ in range(3)))
+
+    asyncio.run(run())
+
+    assert len(events) == 3
+    assert sum(e.attempts for e in events) == 1
+    assert sum(e.coalesced for e in events) == 2
+    assert all(e.status_code == 200 and e.phases['decode'] > 0 for e in events)
+
+
+def test_hooks_validation():
+    with pytest.raises(TypeError):
+        Client(hooks=print)
+
+    with pytest.raises(TypeError):
+        Client(hooks=['print'])
+
+
+def test_endpoint_name():
+    assert endpoint_name('https://api.nasa.gov/neo/rest/v1/neo/3542519') == 'get_asteroids'
+    assert endpoint_name('https://api.nasa.gov/DONKI/WSAEnlilSimulations') == 'wsa_enlil_simulation'
+    assert endpoint_name('https://images-assets.nasa.gov/image/as11-40-5874/metadata.json') == 'media_asset_metadata'
+    assert endpoint_name('https://ssd-api.jpl.nasa.gov/sentry.api') == 'sentry'
+    assert endpoint_name('http://localhost:8000/cad.api') == 'other'
+    assert endpoint_name('https://images-assets.nasa.gov/image/as11-40-5874/as11-40-5874~orig.jpg') == 'other'
@@ -0,0 +1,82 @@
+import json
+import sys
+
+import pytest
+import requests
+
+from nasapy.api import close_approach
+from nasapy.jsonlib import get_json_decoder, loads, set_json_decoder
+
+
+@pytest.fixture(autouse=True)
+def restore_decoder():
+    decoder = get_json_decoder()
+
+    yield
+
+    set_json_decoder(decoder)
+
+
+def test_set_json_decoder(monkeypatch):
+    assert get_json_decoder() is json.loads
+
+    orjson = pytest.importorskip('orjson')
+
+    set_json_decoder('orjson')
+
+    assert get_json_decoder() is orjson.loads
+    assert loads(b'{"count": "1"}') == {'count': '1'}
+
+    with pytest.raises(json.JSONDecodeError):
+        loads(b'{')
+
+    set_json_decoder('json')
+
+    assert get_json_decoder() is json.loads
+
+    monkeypatch.setitem(sys.modules, 'orjson', None)
+
+    set_json_decoder('auto')
+
+    assert get_json_decoder() is json.loads
+
+    with pytest.raises(ImportError):
+        set_json_decoder('orjson')
+    with pytest.raises(ValueError):
+        set_json_decoder('ujson')
+
+
+def test_decoder_used_by_endpoints(stub_client):
+    decoded = []
+
+    def decoder(content):
+        decoded.append(content)
+
+        return json.loads(content)
+
+    set_json_decoder(decoder)
+
+    client, _ = stub_client(body={'count': '1', 'fields': ['des'], 'data': [['433']]})
+
+    assert close_approach(des=433, client=client)['data'] == [['433']]
+    assert decoded == [b'{"count": "1", "fields": ["des"], "data": [["433"]]}']
+
+
+def test_decode_errors_and_encodings(stub_client):
+    client, adapter = stub_client(body=b'<html>Service Unavailable</html>', headers={'Content-Type': 'text/html'})
+
+    # A body that is not JSON raises the same error as r.json(), which callers can catch as a RequestException.
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        close_approach(des=433, client=client)
+
+    adapter.body = b'\x1f\x8b\x08\x00'
+    adapter.headers = {'Content-Type': 'application/json'}
+
+    with pytest.raises(requests.RequestException):
+        close_approach(des=433, client=client)
+
+    # Bodies are decoded from the encoding given by the response headers.
+    adapter.body = '{"count": "1", "fields": ["des"], "data": [["Hermès"]]}'.encode('iso-8859-1')
+    adapter.headers = {'Content-Type': 'application/json; charset=iso-8859-1'}
+
+    assert close_approach(des=433, client=client)['data'] == [['Hermès']]
@@ -0,0 +1,86 @@
+import pytest
+import requests
+
+from nasapy.api import Nasa, close_approach
+from nasapy.client import Client
+from nasapy.metrics import MetricsRegistry
+from nasapy.retry import RetryPolicy
+from nasapy.testing import MockServer
+
+
+def test_registry():
+    registry = MetricsRegistry()
+
+    with MockServer(rows=5) as server:
+        client = Client(transport=server.transport(), cache=True, hooks=[registry])
+
+        close_approach(des=433, client=client)
+        close_approach(des=433, client=client)
+        Nasa(key='abcdefgh1234', client=client).picture_of_the_day(date='2019-01-01')
+        Nasa(key='DEMO_KEY', client=client).picture_of_the_day(date='2019-01-01')
+
+    assert registry.value('nasapy_calls_total') == 4
+    assert registry.value('nasapy_calls_total', endpoint='close_approach', status=200) == 2
+    assert registry.value('nasapy_cache_total', result='miss') == 2
+    assert registry.cache_hit_ratio() == 0.5
+    assert registry.value('nasapy_response_bytes_total', endpoint='picture_of_the_day') > 0
+
+    # The second picture_of_the_day call was taken from the cache, so only the first key has a rate limit.
+    assert registry.limit_remaining() == {'...1234-3c186ff3': 999}
+    assert registry.value('nasapy_rate_limit_limit', key='...1234-3c186ff3') == 1000
+
+    registry.reset()
+
+    assert registry.value('nasapy_calls_total') == 0
+    assert registry.cache_hit_ratio() is None
+
+
+def test_errors_and_retries(server):
+    registry = MetricsRegistry()
+    client = Client(retry=RetryPolicy(max_attempts=3, backoff_factor=0), hooks=[registry])
+
+    client.get(server.base + '/unavailable')
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get('http://127.0.0.1:1/cad.api')
+
+    assert registry.value('nasapy_calls_total', status=503) == 1
+    assert registry.value('nasapy_calls_total', status='error') == 1
+    assert registry.value('nasapy_call_errors_total', error='ConnectionError') == 1
+    assert registry.value('nasapy_retries_total') == 4
+
+
+def test_exposition():
+    registry = MetricsRegistry(buckets=(0.1, 1))
+
+    with MockServer(rows=5) as server:
+        close_approach(client=Client(transport=server.transport(), hooks=[registry]))
+
+    lines = registry.exposition().splitlines()
+
+    assert '# TYPE nasapy_calls_total counter' in lines
+    assert 'nasapy_calls_total{endpoint="close_approach",host="ssd-api.jpl.nasa.gov",status="200"} 1' in lines
+    assert '# TYPE nasapy_call_duration_seconds histogram' in lines
+    assert 'nasapy_call_duration_seconds_bucket{endpoint="close_approach",host="ssd-api.jpl.nasa.gov",le="+Inf"} 1' \
+        in lines
+    assert 'nasapy_call_duration_seconds_count{endpoint="close_approach",host="ssd-api.jpl.nasa.gov"} 1' in lines
+    assert not any(line.startswith('nasapy_cache_hit_ratio') for line in lines)
+
+    with pytest.raises(ValueError):
+        MetricsRegistry(buckets=(1, 0.1))
+
+
+def test_key_labels():
+    registry = MetricsRegistry()
+
+    with MockServer(rows=5) as server:
+        client = Client(transport=server.transport(), hooks=[registry])
+
+        # Keys ending with the same characters are kept in separate series.
+        Nasa(key='first-key-1234', client=client).picture_of_the_day(date='2019-01-01')
+        Nasa(key='other-key-1234', client=client).picture_of_the_day(date='2019-01-01')
+
+    remaining = registry.limit_remaining()
+
+    assert len(remaining) == 2
+    assert all(label.startswith('...1234-') for label in remaining)
@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+import requests
+
+from nasapy.aio import AsyncNasa
+from nasapy.api import Nasa
+from nasapy.client import AsyncClient, Client
+from nasapy.metrics import MetricsRegistry
+from nasapy.ratelimit import KeyPool, RateLimiter, default_rate_limiter
+from nasapy.testing import MockServer
+
+
+def test_rate_limiter(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('nasapy.ratelimit.time.monotonic', lambda: now[0])
+
+    limiter = RateLimiter(period=3600)
+
+    assert limiter.reserve('key') == 0
+    assert limiter.remaining('key') is None
+
+    limiter.update('key', {'X-RateLimit-Limit': '3600', 'X-RateLimit-Remaining': '2'})
+
+    assert limiter.remaining('key') == 2
+    assert limiter.reserve('key') == 0
+    assert limiter.reserve('key') == 0
+    # The bucket is empty and refills at one token per second, so queued requests are spaced a second apart.
+    assert limiter.reserve('key') == pytest.approx(1)
+    assert limiter.reserve('key') == pytest.approx(2)
+
+    now[0] = 10.0
+
+    assert limiter.remaining('key') == 8
+
+    # The server's count leaves out the three requests still in flight.
+    limiter.update('key', {'X-RateLimit-Remaining': '5'})
+
+    assert limiter.remaining('key') == 2
+
+    limiter.release('key')
+    limiter.release('key')
+
+    # Once the server's window resets, its higher count replaces the local estimate.
+    limiter.update('key', {'X-RateLimit-Remaining': '3000'})
+
+    assert limiter.remaining('key') == 3000
+
+    limiter.update('key', {}, status_code=429)
+
+    assert limiter.remaining('key') == 0
+    assert limiter.reserve('other') == 0
+
+    with pytest.raises(ValueError):
+        RateLimiter(period=0)
+
+
+def test_client_throttle(stub_client, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr('nasapy.client.time.sleep', sleeps.append)
+
+    client, adapter = stub_client(body={'title': 'test'}, headers={'X-RateLimit-Limit': '1000',
+                                                                   'X-RateLimit-Remaining': '1'})
+    client.throttle = RateLimiter()
+
+    n = Nasa(key='key', client=client)
+
+    n.picture_of_the_day()
+    adapter.headers = {'X-RateLimit-Limit': '1000', 'X-RateLimit-Remaining': '0'}
+    n.picture_of_the_day()
+    n.picture_of_the_day()
+
+    assert len(sleeps) == 1
+    assert sleeps[0] == pytest.approx(3.6, rel=0.01)
+    assert len(adapter.requests) == 3
+
+    assert Client().throttle is None
+    assert Client(throttle=True).throttle is default_rate_limiter()
+
+    with pytest.raises(TypeError):
+        Client(throttle='yes')
+
+
+def test_throttle_failed_requests(stub_client):
+    def fail(request):
+        raise requests.exceptions.ConnectionError('connection refused')
+
+    client, adapter = stub_client(handler=fail)
+    client.throttle = RateLimiter()
+    client.retry = None
+    client.throttle.update('key', {'X-RateLimit-Limit': '1000', 'X-RateLimit-Remaining': '10'})
+
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            Nasa(key='key', client=client).picture_of_the_day()
+
+    # The failed requests are no longer in flight, so the server's count is taken as is.
+    client.throttle.update('key', {'X-RateLimit-Remaining': '10'})
+
+    assert client.throttle.remaining('key') == 10
+
+
+def test_missing_rate_limit_header(stub_client):
+    client, _ = stub_client(body={'title': 'test'}, headers={})
+
+    n = Nasa(client=client)
+
+    assert n.picture_of_the_day() == {'title': 'test'}
+    assert n.limit_remaining == 'n/a'
+
+
+def test_key_pool(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('nasapy.ratelimit.time.monotonic', lambda: now[0])
+
+    pool = KeyPool(['a', 'b'], period=3600)
+
+    # Unused keys are tried in order, then each request goes to the key with the most requests remaining.
+    assert [pool.acquire(), pool.acquire()] == ['a', 'b']
+    assert pool.remaining('a') == 999
+
+    pool.update('a', {'X-RateLimit-Limit': '3600', 'X-RateLimit-Remaining': '10'})
+    pool.update('b', {'X-RateLimit-Limit': '3600', 'X-RateLimit-Remaining': '5'})
+
+    assert pool.acquire() == 'a'
+
+    pool.update('a', {}, status_code=429)
+
+    assert pool.acquire() == 'b'
+    assert pool.acquire(exclude=['b']) == 'a'
+    assert pool.acquire(exclude=['a', 'b']) == 'b'
+
+    now[0] = 10.0
+
+    # Keys refill at their hourly limit spread over the hour.
+    assert pool.remaining('a') == 9
+
+    with pytest.raises(TypeError):
+        KeyPool('a')
+
+    with pytest.raises(ValueError):
+        KeyPool(['a', 'a'])
+
+
+def test_key_rotation():
+    registry = MetricsRegistry()
+
+    with MockServer(rate_limit=2, retry_after=0) as server:
+        n = Nasa(key=['key-1', 'key-2'], client=Client(transport=server.transport(), retry=False, hooks=[registry]))
+
+        for _ in range(4):
+            n.picture_of_the_day()
+
+        assert registry.value('nasapy_calls_total', status=200) == 4
+        assert registry.limit_remaining() == {'...ey-1-be297454': 0, '...ey-2-7c36b0a9': 0}
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            n.picture_of_the_day()
+
+        # The last call was sent with each key once before giving up.
+        assert len(server.requests) == 6
+        assert n.api_key.remaining('key-1') == 0
+
+
+def test_key_failover():
+    with MockServer(rate_limit=1, retry_after=0) as server:
+        client = Client(transport=server.transport(), retry=False)
+
+        # Another client used up the first key.
+        Nasa(key='key-1', client=client).picture_of_the_day()
+
+        n = Nasa(key=['key-1', 'key-2'], client=client)
+
+        assert n.picture_of_the_day()
+        assert n.limit_remaining == '0'
+        assert [url.split('api_key=')[1][:5] for url in server.requests] == ['key-1', 'key-1', 'key-2']
+
+    async def run():
+        with MockServer(rate_limit=1, retry_after=0) as server:
+            async with AsyncNasa(key=('key-1', 'key-2'), client=AsyncClient(transport=server.transport())) as n:
+                return await asyncio.gather(n.picture_of_the_day(), n.picture_of_the_day())
+
+    assert len(asyncio.run(run())) == 2
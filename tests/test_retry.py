@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+import requests
+from requests.exceptions import HTTPError
+
+from nasapy.api import Nasa, sentry
+from nasapy.client import AsyncClient, Client
+from nasapy.retry import RetryPolicy
+
+
+def test_retry_policy(monkeypatch):
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+    assert policy.backoff(1, {'Retry-After': '3'}) == 3
+    assert policy.backoff(1, {'Retry-After': '30'}) == 5
+    assert policy.backoff(1, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}) == 1
+    assert policy.backoff(1, {'Retry-After': 'soon'}) == 1
+    assert policy.retry_status(503)
+    assert not policy.retry_status(404)
+    assert policy.retry_status(429, {'Retry-After': '5'})
+    assert not policy.retry_status(429, {'Retry-After': '3600'})
+    assert RetryPolicy(respect_retry_after=False).retry_status(429, {'Retry-After': '3600'})
+    assert not policy.retry_status(429, {'X-RateLimit-Remaining': '0'})
+    assert policy.retry_status(429, {'X-RateLimit-Remaining': '0', 'Retry-After': '1'})
+
+    monkeypatch.setattr('nasapy.retry.random.uniform', lambda a, b: b / 2)
+
+    assert RetryPolicy(backoff_factor=1).backoff(3) == 2
+    assert RetryPolicy(respect_retry_after=False, jitter=False).backoff(1, {'Retry-After': '30'}) == 0.5
+
+    assert Client().retry.max_attempts == 3
+    assert Client(retry=False).retry is None
+
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+    with pytest.raises(TypeError):
+        RetryPolicy(jitter='yes')
+    with pytest.raises(TypeError):
+        Client(retry=3)
+
+
+def test_client_retry(stub_client, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr('nasapy.client.time.sleep', sleeps.append)
+
+    responses = [(503, {'Retry-After': '2'}, {}), (502, {}, {}), (200, {}, {'data': []})]
+
+    client, adapter = stub_client(handler=lambda request: responses.pop(0))
+    client.retry = RetryPolicy(jitter=False)
+
+    assert sentry(des='99942', client=client) == {'data': []}
+    assert len(adapter.requests) == 3
+    assert sleeps == [2, 1]
+
+    client, adapter = stub_client(status=500)
+    client.retry = RetryPolicy(max_attempts=4, jitter=False)
+
+    with pytest.raises(HTTPError):
+        Nasa(client=client).picture_of_the_day()
+
+    assert len(adapter.requests) == 4
+
+    # A rate limited response asking for a wait longer than max_backoff fails at once instead of sleeping.
+    sleeps.clear()
+    client, adapter = stub_client(status=429, headers={'Retry-After': '3600'})
+
+    with pytest.raises(HTTPError):
+        sentry(des='99942', client=client)
+
+    assert len(adapter.requests) == 1
+    assert sleeps == []
+
+    client, adapter = stub_client(status=404)
+
+    with pytest.raises(HTTPError):
+        sentry(des='99942', client=client)
+
+    assert len(adapter.requests) == 1
+
+
+def test_client_retry_connection_error(stub_client, monkeypatch):
+    monkeypatch.setattr('nasapy.client.time.sleep', lambda delay: None)
+
+    def handler(request):
+        raise requests.exceptions.ConnectionError('connection reset')
+
+    client, adapter = stub_client(handler=handler)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        sentry(des='99942', client=client)
+
+    assert len(adapter.requests) == 3
+
+    client, adapter = stub_client(handler=handler)
+    client.retry = None
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        sentry(des='99942', client=client)
+
+    assert len(adapter.requests) == 1
+
+
+def test_async_client_retry(server):
+    async def run():
+        async with AsyncClient(retry=RetryPolicy(max_attempts=2, backoff_factor=0)) as client:
+            r = await client.get(server.base + '/unavailable')
+
+        assert r.status_code == 503
+
+    asyncio.run(run())
+
+    assert server.paths == ['/unavailable'] * 2
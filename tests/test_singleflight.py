@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from nasapy.api import sentry
+from nasapy.aio import AsyncNasa
+from nasapy.client import AsyncClient
+from nasapy.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_single_flight():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def func():
+        calls.append(1)
+        release.wait()
+
+        return 'result'
+
+    threads = [threading.Thread(target=lambda: results.append(flights.do('key', func))) for _ in range(5)]
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(0.1)
+    release.set()
+
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [('result', False)] + [('result', True)] * 4
+
+    def failing():
+        raise KeyError('key')
+
+    with pytest.raises(KeyError):
+        flights.do('key', failing)
+
+    assert flights.do('key', lambda: 1) == (1, False)
+
+
+def test_client_coalesce(stub_client):
+    release = threading.Event()
+
+    def handler(request):
+        release.wait()
+
+        return 200, {}, {'data': [request.url.rsplit('=', 1)[-1]]}
+
+    client, adapter = stub_client(handler=handler)
+    results = []
+
+    threads = [threading.Thread(target=lambda des=des: results.append(sentry(des=des, client=client)))
+               for des in ['99942'] * 8 + ['29075'] * 2]
+
+    for thread in threads:
+        thread.start()
+
+    time.sleep(0.1)
+    release.set()
+
+    for thread in threads:
+        thread.join()
+
+    assert len(adapter.requests) == 2
+    assert sorted(r['data'][0] for r in results) == ['29075'] * 2 + ['99942'] * 8
+
+    # Every caller receives its own copy of the response.
+    assert len(set(id(r) for r in results)) == 10
+
+
+def test_async_coalesce(server):
+    async def run():
+        flights = AsyncSingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise KeyError('key')
+
+        r = await asyncio.gather(*[flights.do('key', failing) for _ in range(3)], return_exceptions=True)
+
+        assert all(isinstance(e, KeyError) for e in r)
+
+        async with AsyncNasa(client=AsyncClient()) as n:
+            n.host = server.base
+
+            results = await asyncio.gather(*[n.solar_flare(start_date='2019-05-01') for _ in range(20)])
+
+            assert len(results) == 20
+            assert results[0][0]['flrID'] == '2019-05-06T05:04:00-FLR-001'
+
+        async with AsyncNasa(client=AsyncClient(coalesce=False)) as n:
+            n.host = server.base
+
+            await asyncio.gather(*[n.solar_flare(start_date='2019-05-01') for _ in range(5)])
+
+    asyncio.run(run())
+
+    assert len(server.paths) == 6
@@ -0,0 +1,85 @@
+import json
+
+import pandas as pd
+import pytest
+from requests.exceptions import HTTPError
+
+from nasapy.api import close_approach, exoplanets, sentry
+from nasapy.client import AsyncClient
+from nasapy.stream import batched, iter_json_array
+
+
+def _chunks(document, size):
+    data = json.dumps(document, ensure_ascii=False).encode('utf-8')
+
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 1000])
+def test_iter_json_array(size):
+    document = {
+        'signature': {'source': 'NASA/JPL SBDB Close Approach Data API', 'version': '1.1'},
+        'count': '3',
+        'fields': ['des', 'dist', 'name'],
+        'data': [['433', 0.17, 'Éros'], ['99942', 1234567.125, None], ['2019 OK', -1e-05, 'ok']]
+    }
+
+    header = {}
+
+    assert list(iter_json_array(_chunks(document, size), key='data', header=header)) == document['data']
+    assert header == {'signature': document['signature'], 'count': '3', 'fields': ['des', 'dist', 'name']}
+
+    records = [{'pl_name': 'Kepler-{0}'.format(i), 'pl_orbper': i * 1.5} for i in range(20)]
+
+    assert list(iter_json_array(_chunks(records, size))) == records
+    assert list(iter_json_array(_chunks([], size))) == []
+    assert list(iter_json_array(_chunks({'count': '0'}, size), key='data')) == []
+    assert list(iter_json_array(_chunks({'data': [1, 22, 333]}, size), key='data')) == [1, 22, 333]
+
+
+def test_iter_json_array_invalid():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([b'{"data": [1, 2'], key='data'))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([b'{"data": 1}']))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([b'[1 2]']))
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(batched([], 2)) == []
+
+
+def test_chunksize(stub_client):
+    rows = [[str(i), str(i / 100)] for i in range(25)]
+
+    client, adapter = stub_client(body={'count': '25', 'fields': ['des', 'dist'], 'data': rows})
+
+    chunks = close_approach(des=433, chunksize=10, client=client)
+
+    assert len(adapter.requests) == 0
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert adapter.requests[0][1]['stream']
+
+    dfs = list(close_approach(des=433, chunksize=10, return_df=True, client=client))
+
+    assert all(isinstance(df, pd.DataFrame) for df in dfs)
+    assert list(dfs[0].columns) == ['des', 'dist']
+    assert pd.concat(dfs).values.tolist() == rows
+
+    client, _ = stub_client(body=[{'pl_name': 'a'}, {'pl_name': 'b'}])
+
+    assert list(exoplanets(chunksize=1, client=client)) == [[{'pl_name': 'a'}], [{'pl_name': 'b'}]]
+
+    client, _ = stub_client(status=400)
+
+    with pytest.raises(HTTPError):
+        list(sentry(chunksize=10, client=client))
+
+    with pytest.raises(ValueError):
+        close_approach(chunksize=0)
+    with pytest.raises(TypeError):
+        close_approach(chunksize='10')
+    with pytest.raises(TypeError):
+        sentry(chunksize=10, client=AsyncClient())
@@ -0,0 +1,130 @@
+import asyncio
+
+import pandas as pd
+import pytest
+import requests
+
+from nasapy.api import (Nasa, close_approach, exoplanets, fireballs, media_asset_captions, media_asset_manifest,
+                        media_asset_metadata, media_search, mission_design, nhats, scout, sentry, tle)
+from nasapy.client import AsyncClient, Client
+from nasapy.retry import RetryPolicy
+from nasapy.testing import MockServer
+from nasapy.transport import RecordTransport
+
+
+@pytest.fixture
+def mock_server():
+    with MockServer(rows=10) as server:
+        yield server
+
+
+def test_module_endpoints(mock_server):
+    client = Client(transport=mock_server.transport())
+
+    r = close_approach(return_df=True, client=client)
+
+    assert isinstance(r, pd.DataFrame)
+    assert len(r) == 10
+    assert list(r.columns[:2]) == ['des', 'orbit_id']
+
+    assert len(fireballs(limit=3, client=client)['data']) == 3
+    assert len(sentry(return_df=True, client=client)) == 10
+
+    r, summary = sentry(des='99942', return_df=True, client=client)
+
+    assert summary['des'] == '99942'
+    assert int(scout(client=client)['count']) == 10
+    assert len(nhats(return_df=True, client=client)) == 10
+    assert mission_design(des='1', client=client)['object']['des'] == '1'
+    assert len(exoplanets(select='pl_hostname,ra', return_df=True, client=client).columns) == 2
+    assert len(tle(search_satellite='ISS', client=client)['member']) == 10
+    assert tle(satellite_number=43553, client=client)['satelliteId'] == 43553
+    assert len(media_search(query='apollo', client=client)['items']) == 10
+    assert len(media_asset_manifest('as11-40-5874', client=client)) == 6
+    assert media_asset_metadata('as11-40-5874', client=client)['AVAIL:NASAID'] == 'as11-40-5874'
+    assert media_asset_captions('172_ISS-Slosh', client=client)['captions'].startswith('1\n')
+
+    # The same request always receives the same response.
+    assert sentry(client=client) == sentry(client=client)
+
+
+def test_nasa_endpoints(mock_server):
+    n = Nasa(key='DEMO_KEY', client=Client(transport=mock_server.transport()))
+
+    assert n.picture_of_the_day(date='2019-01-01')['date'] == '2019-01-01'
+    assert n.limit_remaining == '999'
+    assert len(n.asteroid_feed(start_date='2019-01-01', end_date='2019-01-02')['near_earth_objects']) == 2
+    assert n.get_asteroids(asteroid_id=3542519)['id'] == '3542519'
+    assert n.epic(date='2019-01-01')[0]['date'].startswith('2019-01-01')
+    assert n.mars_rover(earth_date='2015-06-03')[0]['earth_date'] == '2015-06-03'
+    assert n.techport(project_id=17792)['project']['id'] == 17792
+    assert n.earth_imagery(lat=1.5, lon=100.75)['resource']['dataset'] == 'LC8_L1T_TOA'
+
+    flares = n.solar_flare(start_date='2019-01-01', end_date='2019-01-31')
+    storms = n.geomagnetic_storm(start_date='2019-01-01', end_date='2019-12-31')
+
+    assert flares and all(f['flrID'].endswith('-FLR-001') for f in flares)
+    assert all(link['activityID'].split('-')[-2] in ('CME', 'IPS')
+               for storm in storms for link in storm['linkedEvents'] or [])
+
+    # Events are generated per day, so overlapping date ranges return the same events.
+    january = n.solar_flare(start_date='2019-01-01', end_date='2019-01-15')
+
+    assert january == [f for f in flares if f['beginTime'] < '2019-01-16']
+    assert len(mock_server.requests) == 10
+
+
+def test_rate_limit():
+    with MockServer(rate_limit=2, retry_after=0) as server:
+        n = Nasa(key='DEMO_KEY', client=Client(transport=server.transport(), retry=False))
+
+        n.picture_of_the_day()
+
+        assert n.limit_remaining == '1'
+
+        n.picture_of_the_day()
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            n.picture_of_the_day()
+
+        # Limits are counted for each key, and only for api.nasa.gov.
+        assert Nasa(key='other-key', client=n.client).picture_of_the_day()
+        assert sentry(client=n.client)
+
+
+def test_error_injection():
+    with MockServer(error_rate=1, error_status=(502, 503), retry_after=0) as server:
+        client = Client(transport=server.transport(), retry=RetryPolicy(max_attempts=3, backoff_factor=0))
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            sentry(client=client)
+
+        assert len(server.requests) == 3
+
+    with pytest.raises(ValueError):
+        MockServer(error_rate=2)
+
+
+def test_recording(stub_client, tmp_path):
+    path = str(tmp_path / 'session.jsonl')
+
+    _, adapter = stub_client(body={'data': [{'des': 'recorded'}]})
+
+    with Client(transport=RecordTransport(path, transport=adapter)) as client:
+        sentry(des='99942', client=client)
+
+    with MockServer(recording=path, latency=(0, 0.01)) as server:
+        client = Client(transport=server.transport())
+
+        assert sentry(des='99942', client=client) == {'data': [{'des': 'recorded'}]}
+        assert sentry(des='29075', client=client)['summary']['des'] == '29075'
+
+
+def test_async_client(mock_server):
+    async def run():
+        async with AsyncClient(transport=mock_server.transport()) as client:
+            return await asyncio.gather(*(sentry(des=des, client=client) for des in ('99942', '29075')))
+
+    r = asyncio.run(run())
+
+    assert [result['summary']['des'] for result in r] == ['99942', '29075']
@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import pytest
+import requests
+
+from nasapy.api import Nasa, sentry
+from nasapy.client import AsyncClient, Client
+from nasapy.transport import RecordTransport, ReplayTransport
+
+
+def test_record_replay(stub_client, tmp_path):
+    path = str(tmp_path / 'session.jsonl')
+
+    _, adapter = stub_client(body={'data': [{'des': '99942'}]}, headers={'X-RateLimit-Remaining': '999',
+                                                                         'Content-Encoding': 'gzip'})
+
+    with Client(transport=RecordTransport(path, transport=adapter)) as client:
+        assert sentry(des='99942', client=client) == {'data': [{'des': '99942'}]}
+
+        Nasa(key='recorded-key', client=client).picture_of_the_day(date='2019-01-01')
+
+    with open(path) as f:
+        recording = f.read()
+
+    lines = [json.loads(line) for line in recording.splitlines()]
+
+    # The key the requests were sent with is not written to the recording.
+    assert 'recorded-key' not in recording
+    assert lines[1]['url'] == 'https://api.nasa.gov/planetary/apod?date=2019-01-01&hd=False'
+
+    assert [line['url'].split('?')[0] for line in lines] == ['https://ssd-api.jpl.nasa.gov/sentry.api',
+                                                             'https://api.nasa.gov/planetary/apod']
+
+    replay = ReplayTransport(path)
+    client = Client(transport=replay, throttle=False)
+
+    assert len(replay) == 2
+    assert sentry(des='99942', client=client) == {'data': [{'des': '99942'}]}
+
+    # The API key and the order of the parameters are not used to match requests.
+    n = Nasa(key='other-key', client=client)
+
+    assert n.picture_of_the_day(date='2019-01-01') == {'data': [{'des': '99942'}]}
+    assert n.limit_remaining == '999'
+    assert len(adapter.requests) == 2
+    assert len(replay.requests) == 2
+
+    with pytest.raises(requests.exceptions.RequestException):
+        sentry(des='29075', client=client)
+
+    assert len(replay.requests) == 3
+
+
+def test_async_replay(server, tmp_path):
+    path = str(tmp_path / 'session.jsonl')
+
+    with Client(transport=RecordTransport(path)) as client:
+        client.get(server.base + '/cad.api', params={'des': 433})
+
+    async def run():
+        async with AsyncClient(transport=ReplayTransport(path)) as client:
+            r = await client.get(server.base + '/cad.api', params={'des': 433})
+
+            assert r.status_code == 200
+            assert r.json()['data'] == [['433', '0.17']]
+
+    asyncio.run(run())
+
+    assert server.paths == ['/cad.api?des=433']
+